@@ -0,0 +1,107 @@
+"""Cold-start import cost of the backend.
+
+Imports a module (default: `server`) in fresh interpreters and reports the
+median wall time, the slowest imports from `python -X importtime`, and which
+heavy analysis libraries were loaded as a side effect.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 10 --max-seconds 1.5 --json import_time.json
+
+Exits with status 1 when --max-seconds is given and the median exceeds it.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ['pandas', 'numpy', 'sklearn', 'matplotlib', 'reportlab', 'pyarrow']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    # server.py reads these at import time; nothing connects until a request arrives.
+    env.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+    env.setdefault('DB_NAME', 'import_time_benchmark')
+    return env
+
+
+def measure(module: str, runs: int):
+    samples = []
+    loaded = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        samples.append(result['seconds'])
+        loaded = result['loaded']
+    return samples, loaded
+
+
+def slowest_imports(module: str, top: int):
+    out = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, self_us, cumulative_us, name = line.replace('import time:', '|').split('|')
+        # Each nesting level adds two spaces; only direct imports of `module`
+        # are kept so that no time is counted twice.
+        if len(name) - len(name.lstrip()) != 3:
+            continue
+        rows.append({"module": name.strip(), "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    return sorted(rows, key=lambda row: row["cumulative_ms"], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='server')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--max-seconds', type=float, default=None)
+    parser.add_argument('--json', dest='json_path', default=None)
+    args = parser.parse_args()
+
+    samples, loaded = measure(args.module, args.runs)
+    result = {
+        "module": args.module,
+        "runs": args.runs,
+        "median_seconds": round(statistics.median(samples), 4),
+        "min_seconds": round(min(samples), 4),
+        "max_seconds": round(max(samples), 4),
+        "heavy_modules_loaded": loaded,
+        "slowest_imports": slowest_imports(args.module, args.top),
+    }
+
+    print(f"import {args.module}: median {result['median_seconds']:.3f}s "
+          f"(min {result['min_seconds']:.3f}s, max {result['max_seconds']:.3f}s, {args.runs} runs)")
+    print(f"heavy modules loaded: {', '.join(loaded) or 'none'}")
+    for row in result["slowest_imports"]:
+        print(f"  {row['cumulative_ms']:9.1f} ms  {row['module']}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(result, indent=2))
+
+    if args.max_seconds is not None and result["median_seconds"] > args.max_seconds:
+        print(f"median import time exceeds {args.max_seconds}s", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
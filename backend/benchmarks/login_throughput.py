@@ -0,0 +1,99 @@
+"""Login throughput and event-loop stalls from password verification.
+
+Runs a burst of concurrent password checks the way the login handler does,
+once calling bcrypt directly on the event loop ("inline", the old handler)
+and once through PasswordHasher's thread pool ("pool"). For each it reports
+logins per second, login latency percentiles, and the longest time a 10 ms
+heartbeat task was kept waiting, i.e. how long other requests would stall.
+
+    python benchmarks/login_throughput.py
+    python benchmarks/login_throughput.py --logins 64 --concurrency 32 --rounds 12 --workers 4 --json login.json
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.passwords import PasswordHasher  # noqa: E402
+
+PASSWORD = "correct horse battery staple"
+HEARTBEAT_SECONDS = 0.01
+
+
+async def _heartbeat(stop: asyncio.Event, stalls: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        stalls.append(time.perf_counter() - start - HEARTBEAT_SECONDS)
+
+
+async def run_burst(hasher: PasswordHasher, hashed: str, mode: str, logins: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def login():
+        async with semaphore:
+            start = time.perf_counter()
+            if mode == "inline":
+                ok = hasher.verify_sync(PASSWORD, hashed)
+            else:
+                ok = await hasher.verify(PASSWORD, hashed)
+            assert ok
+            latencies.append(time.perf_counter() - start)
+
+    stop = asyncio.Event()
+    stalls = []
+    heartbeat = asyncio.create_task(_heartbeat(stop, stalls))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await heartbeat
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "logins": logins,
+        "seconds": round(elapsed, 4),
+        "logins_per_second": round(logins / elapsed, 2),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+        "max_loop_stall_ms": round(max(stalls, default=0) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logins', type=int, default=32)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--rounds', type=int, default=12)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--json', dest='json_path', default=None)
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(rounds=args.rounds, max_workers=args.workers)
+    hashed = hasher.hash_sync(PASSWORD)
+    results = [
+        asyncio.run(run_burst(hasher, hashed, mode, args.logins, args.concurrency))
+        for mode in ("inline", "pool")
+    ]
+    hasher.shutdown()
+
+    print(f"{args.logins} logins, concurrency {args.concurrency}, bcrypt rounds {args.rounds}, {args.workers} hash threads")
+    for result in results:
+        print(f"  {result['mode']:6}  {result['logins_per_second']:8.1f} logins/s  "
+              f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+              f"max loop stall {result['max_loop_stall_ms']:7.1f} ms")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps({"rounds": args.rounds, "workers": args.workers, "results": results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+"""Timings of the analysis, PDF and upload/analyze pipelines on synthetic data.
+
+Every combination of the --rows, --columns, --text-share, --null-density and
+--duplicate-rate values is a scenario (see benchmarks/synthetic.py). For each
+scenario it times:
+
+  read_csv              parsing the file as written by an upload
+  profile               the shared column profile the checks read from
+  check:<method>        each report section, in report order, on a warm profile
+  full_report           generate_full_report on a fresh analyzer
+  pdf                   rendering the report to PDF
+  endpoint:<step>       upload, analyze (cold and cached) and PDF download
+                        through the API, against an in-memory mongomock
+                        database; skipped when mongomock-motor is missing
+
+Seconds are the median of --repeat runs; peak_mb is the peak of the memory
+allocated by the stage, measured with tracemalloc in a separate run (off with
+--no-memory; endpoint stages run in other processes and have none).
+
+    python benchmarks/pipeline.py
+    python benchmarks/pipeline.py --rows 10000,100000 --columns 20,80 --text-share 0,0.5 --json pipeline.json
+    python benchmarks/pipeline.py --budgets budgets.json --compare pipeline.json
+
+--json writes the results for later --compare runs. A budgets file maps stage
+patterns to limits, e.g. {"full_report": {"seconds": 5, "peak_mb": 500},
+"r100000_*/endpoint:analyze": {"seconds": 10}}; a pattern without "/"
+applies to that stage in every scenario. Exits with status 1 when a stage
+exceeds its budget.
+"""
+import argparse
+import contextlib
+import fnmatch
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pandas as pd  # noqa: E402
+
+from synthetic import make_dataset  # noqa: E402
+from utils.data_analyzer import DataQualityAnalyzer  # noqa: E402
+from utils.tasks import DUPLICATE_SAMPLE_LIMIT, read_source, render_pdf  # noqa: E402
+
+try:
+    import mongomock_motor
+except ImportError:
+    mongomock_motor = None
+
+FILENAME = "synthetic.csv"
+
+
+def _floats(value: str):
+    return [float(v) for v in value.split(',')]
+
+
+def _ints(value: str):
+    return [int(v) for v in value.split(',')]
+
+
+def scenario_name(params) -> str:
+    return (f"r{params['rows']}_c{params['columns']}_t{params['text_share']:g}"
+            f"_n{params['null_density']:g}_d{params['duplicate_rate']:g}")
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = {}
+        self.trace = False
+
+    def __call__(self, name: str, fn):
+        stage = self.stages.setdefault(name, {"runs": []})
+        if self.trace:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            result = fn()
+            peak = (tracemalloc.get_traced_memory()[1] - baseline) / (1024 * 1024)
+            stage["peak_mb"] = round(max(stage.get("peak_mb", 0), peak), 2)
+            return result
+        start = time.perf_counter()
+        result = fn()
+        stage["runs"].append(round(time.perf_counter() - start, 6))
+        return result
+
+    def results(self):
+        for stage in self.stages.values():
+            stage["seconds"] = round(statistics.median(stage["runs"]), 6) if stage["runs"] else None
+        return self.stages
+
+
+def analysis_pass(timer: StageTimer, csv_path: Path, args):
+    df = timer("read_csv", lambda: read_source(csv_path, FILENAME))
+
+    def analyzer():
+        return DataQualityAnalyzer(df, duplicate_sample_limit=DUPLICATE_SAMPLE_LIMIT,
+                                   profile_workers=args.profile_workers, profile_mode=args.profile_mode)
+
+    checks = analyzer()
+    timer("profile", lambda: checks.profile)
+    for _, method in DataQualityAnalyzer.REPORT_SECTIONS:
+        timer(f"check:{method}", getattr(checks, method))
+
+    report = timer("full_report", lambda: analyzer().generate_full_report())
+    timer("pdf", lambda: render_pdf(report, FILENAME))
+
+
+class EndpointBench:
+    """The API on a TestClient, with Mongo replaced by mongomock."""
+
+    def __init__(self, stack: contextlib.ExitStack):
+        import motor.motor_asyncio
+        motor.motor_asyncio.AsyncIOMotorClient = mongomock_motor.AsyncMongoMockClient
+        os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+        os.environ.setdefault('DB_NAME', 'pipeline_benchmark')
+        os.environ.setdefault('JOB_WORKER_ENABLED', 'false')
+        os.environ.setdefault('BCRYPT_ROUNDS', '4')
+        os.environ.setdefault('REPORT_DIR', stack.enter_context(tempfile.TemporaryDirectory()))
+
+        import server
+        from fastapi.testclient import TestClient
+
+        self.client = stack.enter_context(TestClient(server.app))
+        response = self.client.post('/api/auth/signup', json={
+            'name': 'Benchmark', 'email': 'benchmark@example.com', 'password': 'benchmark'})
+        response.raise_for_status()
+        self.headers = {'Authorization': f"Bearer {response.json()['token']}"}
+        # Start the analysis workers before anything is timed.
+        warm_up = make_dataset(100, 4).to_csv(index=False).encode('utf-8')
+        self.run(StageTimer(), warm_up)
+
+    def _call(self, method: str, url: str, **kwargs):
+        response = self.client.request(method, url, headers=self.headers, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def run(self, timer: StageTimer, data: bytes):
+        upload = timer("endpoint:upload", lambda: self._call(
+            'POST', '/api/datasets/upload', files={'file': (FILENAME, data, 'text/csv')}))
+        dataset_id = upload.json()['dataset']['id']
+        try:
+            analyze = timer("endpoint:analyze", lambda: self._call('GET', f'/api/datasets/{dataset_id}/analyze'))
+            timer("endpoint:analyze_cached", lambda: self._call('GET', f'/api/datasets/{dataset_id}/analyze'))
+            report_id = analyze.json()['report_id']
+            timer("endpoint:download", lambda: self._call('GET', f'/api/reports/{report_id}/download'))
+        finally:
+            self._call('DELETE', f'/api/datasets/{dataset_id}')
+
+
+def run_scenario(params, args, endpoints, workdir: Path):
+    df = make_dataset(**params, seed=args.seed)
+    csv_path = workdir / f"{scenario_name(params)}.csv"
+    df.to_csv(csv_path, index=False)
+    del df
+
+    timer = StageTimer()
+    for _ in range(args.repeat):
+        analysis_pass(timer, csv_path, args)
+    if args.memory:
+        timer.trace = True
+        tracemalloc.start()
+        try:
+            analysis_pass(timer, csv_path, args)
+        finally:
+            tracemalloc.stop()
+            timer.trace = False
+
+    if endpoints:
+        data = csv_path.read_bytes()
+        for run in range(args.repeat):
+            # Trailing blank lines parse to the same rows but change the
+            # content hash, so every run misses the report cache.
+            endpoints.run(timer, data + b"\n" * run)
+
+    return {
+        "name": scenario_name(params),
+        "params": params,
+        "file_bytes": csv_path.stat().st_size,
+        "stages": timer.results(),
+    }
+
+
+def check_budgets(scenarios, budgets):
+    failures = []
+    for scenario in scenarios:
+        for stage, result in scenario["stages"].items():
+            key = f"{scenario['name']}/{stage}"
+            for pattern, limits in budgets.items():
+                if not fnmatch.fnmatchcase(key if '/' in pattern else stage, pattern):
+                    continue
+                for metric, limit in limits.items():
+                    value = result.get(metric)
+                    if value is not None and value > limit:
+                        failures.append(f"{key} {metric} {value} > {limit} ({pattern})")
+    return failures
+
+
+def compare(scenarios, previous):
+    before = {(s["name"], stage): r for s in previous.get("scenarios", []) for stage, r in s["stages"].items()}
+    print("\ncompared with previous run (seconds):")
+    for scenario in scenarios:
+        for stage, result in scenario["stages"].items():
+            old = before.get((scenario["name"], stage), {}).get("seconds")
+            new = result["seconds"]
+            if old and new is not None:
+                print(f"  {scenario['name']}/{stage:32} {old:9.4f} -> {new:9.4f}  x{new / old:5.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=_ints, default=[10_000])
+    parser.add_argument('--columns', type=_ints, default=[20])
+    parser.add_argument('--text-share', type=_floats, default=[0.3])
+    parser.add_argument('--null-density', type=_floats, default=[0.05])
+    parser.add_argument('--duplicate-rate', type=_floats, default=[0.01])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--profile-workers', type=int, default=1)
+    parser.add_argument('--profile-mode', default='process')
+    parser.add_argument('--no-memory', dest='memory', action='store_false')
+    parser.add_argument('--no-endpoints', dest='endpoints', action='store_false')
+    parser.add_argument('--json', dest='json_path', default=None)
+    parser.add_argument('--compare', default=None, help="results of an earlier run (--json) to compare against")
+    parser.add_argument('--budgets', default=None, help="JSON file of stage patterns to time/memory limits")
+    args = parser.parse_args()
+
+    grid = [
+        {"rows": rows, "columns": columns, "text_share": text_share,
+         "null_density": null_density, "duplicate_rate": duplicate_rate}
+        for rows, columns, text_share, null_density, duplicate_rate in itertools.product(
+            args.rows, args.columns, args.text_share, args.null_density, args.duplicate_rate)
+    ]
+
+    scenarios = []
+    with contextlib.ExitStack() as stack:
+        endpoints = None
+        if args.endpoints and mongomock_motor is None:
+            print("mongomock-motor is not installed, skipping the endpoint stages", file=sys.stderr)
+        elif args.endpoints:
+            endpoints = EndpointBench(stack)
+        workdir = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        # Untimed, so that imports (ReportLab, the date parsers) are not charged to the first scenario.
+        warm_up = workdir / "warm_up.csv"
+        make_dataset(100, 4).to_csv(warm_up, index=False)
+        analysis_pass(StageTimer(), warm_up, args)
+
+        for params in grid:
+            scenario = run_scenario(params, args, endpoints, workdir)
+            scenarios.append(scenario)
+            print(f"{scenario['name']}  ({scenario['file_bytes'] / (1024 * 1024):.1f} MB csv)")
+            for stage, result in scenario["stages"].items():
+                peak = f"{result['peak_mb']:9.1f} MB" if "peak_mb" in result else ""
+                print(f"  {stage:40} {result['seconds']:9.4f} s {peak}")
+
+    results = {
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "profile_workers": args.profile_workers,
+        "profile_mode": args.profile_mode,
+        "scenarios": scenarios,
+    }
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+    if args.compare:
+        compare(scenarios, json.loads(Path(args.compare).read_text()))
+    if args.budgets:
+        failures = check_budgets(scenarios, json.loads(Path(args.budgets).read_text()))
+        for failure in failures:
+            print(f"over budget: {failure}")
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
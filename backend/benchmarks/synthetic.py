@@ -0,0 +1,107 @@
+"""Synthetic datasets for the analysis benchmarks.
+
+Generates a DataFrame along five axes: rows, columns, the share of text
+columns, the null density and the duplicate row rate. Text columns rotate
+through the kinds the checks treat differently (low-cardinality categories
+with inconsistent spelling, free text, numbers stored as text and dates in
+mixed formats); numeric columns mix normal, skewed and integer data with a
+few planted outliers. The same arguments and seed always give the same frame.
+
+    python benchmarks/synthetic.py --rows 100000 --columns 40 --text-share 0.5 --out synthetic.csv
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CATEGORIES = ["North", "South", "East", "West", "north", "SOUTH", " East", "Central"]
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"]
+DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%m-%d-%Y"]
+TEXT_KINDS = ("category", "text", "numeric_text", "date")
+NUMERIC_KINDS = ("normal", "skewed", "integer")
+
+
+def _text_column(kind: str, rows: int, rng: np.random.Generator) -> np.ndarray:
+    if kind == "category":
+        # Skewed frequencies, so the target-like columns are imbalanced.
+        weights = rng.dirichlet(np.full(len(CATEGORIES), 0.5))
+        return rng.choice(np.array(CATEGORIES, dtype=object), size=rows, p=weights)
+    if kind == "text":
+        first = rng.choice(WORDS, size=rows)
+        second = rng.choice(WORDS, size=rows)
+        numbers = rng.integers(0, 10_000, size=rows).astype(str)
+        return np.char.add(np.char.add(np.char.add(first, " "), second), numbers).astype(object)
+    if kind == "numeric_text":
+        return np.round(rng.normal(100, 15, size=rows), 2).astype(str).astype(object)
+    days = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1500, size=rows), unit="D")
+    formats = rng.choice(len(DATE_FORMATS), size=rows, p=[0.8, 0.15, 0.05])
+    values = np.empty(rows, dtype=object)
+    for i, fmt in enumerate(DATE_FORMATS):
+        mask = formats == i
+        values[mask] = days[mask].strftime(fmt)
+    return values
+
+
+def _numeric_column(kind: str, rows: int, rng: np.random.Generator) -> np.ndarray:
+    if kind == "normal":
+        values = rng.normal(50, 10, size=rows)
+    elif kind == "skewed":
+        values = rng.lognormal(3, 1, size=rows)
+    else:
+        return rng.integers(0, 1000, size=rows).astype('float64')
+    outliers = rng.random(rows) < 0.005
+    values[outliers] *= 10
+    return values
+
+
+def make_dataset(rows: int, columns: int, text_share: float = 0.3, null_density: float = 0.05,
+                 duplicate_rate: float = 0.01, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    text_columns = int(round(columns * text_share))
+    duplicates = int(rows * duplicate_rate) if rows > 1 else 0
+    targets = rng.choice(rows, size=duplicates, replace=False)
+    sources = rng.integers(0, rows, size=duplicates)
+    data = {}
+    for i in range(columns):
+        if i < text_columns:
+            kind = TEXT_KINDS[i % len(TEXT_KINDS)]
+            name = f"{kind}_{i}"
+            values = _text_column(kind, rows, rng)
+        else:
+            kind = NUMERIC_KINDS[i % len(NUMERIC_KINDS)]
+            name = f"{kind}_{i}"
+            values = _numeric_column(kind, rows, rng)
+        if null_density > 0:
+            values[rng.random(rows) < null_density] = None if values.dtype == object else np.nan
+        # Overwrite `targets` with copies of whole `sources` rows.
+        values[targets] = values[sources]
+        data[name] = values
+    return pd.DataFrame(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--columns', type=int, default=20)
+    parser.add_argument('--text-share', type=float, default=0.3)
+    parser.add_argument('--null-density', type=float, default=0.05)
+    parser.add_argument('--duplicate-rate', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', required=True)
+    args = parser.parse_args()
+
+    df = make_dataset(args.rows, args.columns, args.text_share, args.null_density, args.duplicate_rate, args.seed)
+    out = Path(args.out)
+    if out.suffix == '.json':
+        df.to_json(out, orient='records')
+    elif out.suffix in ('.xlsx', '.xls'):
+        df.to_excel(out, index=False)
+    else:
+        df.to_csv(out, index=False)
+    print(f"wrote {len(df)} rows x {len(df.columns)} columns to {out}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,25 +1,41 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, status
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Header, Query, Response, status
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
+import importlib
 import os
-from fastapi.responses import StreamingResponse
-import io
 import logging
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
 from typing import List, Optional, Dict, Any
 import uuid
 from datetime import datetime, timezone, timedelta
-import bcrypt
 import jwt
-import pandas as pd
-import json
-import io
-from utils.data_analyzer import DataQualityAnalyzer
-from utils.pdf_generator import generate_pdf_report
+from functools import partial
+from utils.executor import AnalysisExecutor, ExecutorBusyError, JobTimeoutError
+from utils.tasks import SUPPORTED_EXTENSIONS, ANALYZER_VERSION, PDF_SECTIONS, REPORT_FIELDS, analysis_config, profile_upload, profile_append, analyze_file, analyze_versions, analyze_sample, render_pdf_timed, split_workbook, warm_up
+from utils.sampling import SamplingError
+from utils.loader import ColumnSelectionError
+from utils.outliers import OutlierSettingsError, outlier_settings, parse_column_thresholds
+from utils.uploads import MULTIPART_OVERHEAD_BYTES, RequestBodyLimitMiddleware, UploadTooLargeError, extract_zip_member, stream_upload_to_disk, file_sha256
+from utils.batch import BatchError, archive_members, batch_summary, is_archive, run_bounded, sheet_content_hash
+from utils.report_cache import ReportCache, cache_key
+from utils.report_payloads import ReportPayloadStore, report_summary, with_detached
+from utils.serialization import dumps, json_stream_response, select_fields
+from utils.columnar import columnar_path, move_columnar, skip_marker_path
+from utils.dataset_state import combined_hash, dataset_versions, state_path
+from utils.artifacts import PdfArtifactStore
+from utils.jobs import JobWorker, JOB_COMPLETED, JOB_FAILED, new_job_doc, job_status
+from utils.indexes import ensure_indexes
+from utils.pagination import InvalidCursorError, paginate
+from utils.user_cache import UserCache
+from utils.passwords import PasswordHasher
+from utils.instrumentation import StageTimings
+from utils.metrics import AppMetrics, RequestMetricsMiddleware, CONTENT_TYPE as METRICS_CONTENT_TYPE
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -39,6 +55,38 @@ security = HTTPBearer()
 BASE_DIR = Path(__file__).resolve().parent
 UPLOAD_DIR = BASE_DIR / "uploads"
 UPLOAD_DIR.mkdir(exist_ok=True)
+UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', str(1024 * 1024)))
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', str(1024 * 1024 * 1024)))
+
+analysis_executor = AnalysisExecutor.from_env()
+JOB_WORKER_ENABLED = os.environ.get('JOB_WORKER_ENABLED', 'true').lower() == 'true'
+ANALYSIS_WARMUP = os.environ.get('ANALYSIS_WARMUP', 'false').lower() == 'true'
+MONGO_CREATE_INDEXES = os.environ.get('MONGO_CREATE_INDEXES', 'true').lower() == 'true'
+JOB_TIMEOUT_SECONDS = float(os.environ.get('JOB_TIMEOUT_SECONDS', '3600'))
+USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', '60'))
+USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', '10000'))
+# Read-only endpoints trust the signed token without a user lookup, so a
+# deleted user keeps read access until the token expires (JWT_EXPIRATION_HOURS).
+AUTH_TRUST_TOKEN_CLAIMS = os.environ.get('AUTH_TRUST_TOKEN_CLAIMS', 'false').lower() == 'true'
+user_cache = UserCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS)
+password_hasher = PasswordHasher.from_env()
+report_payloads = ReportPayloadStore(db)
+report_cache = ReportCache(db, report_payloads)
+REPORT_DIR = Path(os.environ.get('REPORT_DIR', str(BASE_DIR / "reports")))
+PDF_STORE_MAX_BYTES = int(os.environ.get('PDF_STORE_MAX_BYTES', str(1024 * 1024 * 1024)))
+pdf_store = PdfArtifactStore(REPORT_DIR, PDF_STORE_MAX_BYTES)
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+# Batch uploads: files (archive members and workbook files count one each) per
+# request, and items analyzed at once (0 = the analysis worker count).
+BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', '1000'))
+BATCH_CONCURRENCY = int(os.environ.get('BATCH_CONCURRENCY', '0'))
+# Zip archives: total decompressed size of all members, and the highest
+# compression ratio of a member, so that a small archive cannot fill the disk.
+BATCH_MAX_ARCHIVE_BYTES = int(os.environ.get('BATCH_MAX_ARCHIVE_BYTES', str(2 * 1024 * 1024 * 1024)))
+BATCH_MAX_COMPRESSION_RATIO = float(os.environ.get('BATCH_MAX_COMPRESSION_RATIO', '200'))
+# Whole request body of a batch upload; other requests may carry one file of MAX_UPLOAD_BYTES.
+BATCH_MAX_REQUEST_BYTES = int(os.environ.get('BATCH_MAX_REQUEST_BYTES', str(4 * 1024 * 1024 * 1024)))
+metrics = AppMetrics()
 
 class UserSignup(BaseModel):
     name: str
@@ -70,6 +118,15 @@ class DatasetResponse(BaseModel):
     file_size: int
     health_score: float
     file_path: str
+    version: int = 1
+
+class ReportSummary(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    dataset_id: str
+    created_at: str
+    health_score: Optional[float] = None
+    approximate: bool = False
 
 class ReportResponse(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -80,12 +137,6 @@ class ReportResponse(BaseModel):
     pdf_path: str
     created_at: str
 
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
-
 def create_token(user_id: str, email: str) -> str:
     payload = {
         'user_id': user_id,
@@ -102,14 +153,40 @@ def decode_token(token: str) -> dict:
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+def public_user(user: dict) -> dict:
+    return {k: v for k, v in user.items() if k not in ('_id', 'password_hash')}
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
     payload = decode_token(token)
-    user = await db.users.find_one({"id": payload['user_id']}, {"_id": 0})
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
+    user = user_cache.get(payload['user_id'])
+    if user is None:
+        user = await db.users.find_one({"id": payload['user_id']}, {"_id": 0, "password_hash": 0})
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        user_cache.put(user)
     return user
 
+async def get_token_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Caller identity for read-only endpoints, which only need the user id.
+
+    With AUTH_TRUST_TOKEN_CLAIMS the signed token is trusted as is and no
+    user lookup happens, so a deleted user keeps read access until the
+    token expires.
+    """
+    if not AUTH_TRUST_TOKEN_CLAIMS:
+        return await get_current_user(credentials)
+    payload = decode_token(credentials.credentials)
+    return {"id": payload['user_id'], "email": payload['email']}
+
+async def run_analysis_task(fn, *args):
+    try:
+        return await analysis_executor.run(fn, *args)
+    except ExecutorBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except JobTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+
 @api_router.post("/auth/signup", response_model=TokenResponse)
 async def signup(user_data: UserSignup):
     existing_user = await db.users.find_one({"email": user_data.email})
@@ -121,11 +198,12 @@ async def signup(user_data: UserSignup):
         "id": user_id,
         "name": user_data.name,
         "email": user_data.email,
-        "password_hash": hash_password(user_data.password),
+        "password_hash": await password_hasher.hash(user_data.password),
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     
     await db.users.insert_one(user_doc)
+    user_cache.put(public_user(user_doc))
     token = create_token(user_id, user_data.email)
     
     return {
@@ -141,9 +219,18 @@ async def signup(user_data: UserSignup):
 @api_router.post("/auth/login", response_model=TokenResponse)
 async def login(credentials: UserLogin):
     user = await db.users.find_one({"email": credentials.email}, {"_id": 0})
-    if not user or not verify_password(credentials.password, user['password_hash']):
+    if not user or not await password_hasher.verify(credentials.password, user['password_hash']):
         raise HTTPException(status_code=401, detail="Invalid email or password")
-    
+
+    # Upgrade hashes made with a different BCRYPT_ROUNDS while the password is at hand.
+    if password_hasher.needs_rehash(user['password_hash']):
+        try:
+            password_hash = await password_hasher.hash(credentials.password)
+            await db.users.update_one({"id": user['id']}, {"$set": {"password_hash": password_hash}})
+        except Exception as e:
+            logging.error(f"Could not rehash password for user {user['id']}: {str(e)}")
+
+    user_cache.put(public_user(user))
     token = create_token(user['id'], user['email'])
     
     return {
@@ -165,139 +252,518 @@ async def get_me(current_user: dict = Depends(get_current_user)):
         "created_at": current_user['created_at']
     }
 
+def remove_dataset_files(file_path: Path):
+    file_path.unlink(missing_ok=True)
+    columnar_path(file_path).unlink(missing_ok=True)
+    skip_marker_path(file_path).unlink(missing_ok=True)
+    state_path(file_path).unlink(missing_ok=True)
+
+async def append_dataset_version(dataset_id: str, file: UploadFile, user_id: str) -> dict:
+    dataset = await db.datasets.find_one({"id": dataset_id, "user_id": user_id}, {"_id": 0})
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    await ensure_content_hash(dataset)
+    versions = dataset_versions(dataset)
+    version = len(versions) + 1
+
+    # Unique per upload: a concurrent append of the same file gets the same
+    # version number, and whichever loses deletes only its own file below.
+    file_path = UPLOAD_DIR / f"{dataset_id}_v{version}_{uuid.uuid4().hex}_{Path(file.filename).name}"
+    try:
+        file_size, content_hash = await stream_upload_to_disk(file, file_path, UPLOAD_CHUNK_SIZE, MAX_UPLOAD_BYTES)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    new_version = {
+        "version": version,
+        "filename": file.filename,
+        "file_path": str(file_path),
+        "file_size": file_size,
+        "content_hash": content_hash,
+        "uploaded_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    try:
+        # Reads only the new file, merging it into the saved statistics of the earlier versions.
+        stats = await run_analysis_task(profile_append, versions + [new_version])
+    except Exception:
+        remove_dataset_files(file_path)
+        raise
+    new_version["rows"] = stats['rows'] - dataset['rows']
+    versions = versions + [new_version]
+
+    # Only applies if no other append to this dataset got in first.
+    result = await db.datasets.update_one(
+        {"id": dataset_id, "version": dataset.get('version')},
+        {"$set": {
+            "versions": versions,
+            "version": version,
+            "rows": stats['rows'],
+            "columns": stats['columns'],
+            "file_size": sum(v['file_size'] or 0 for v in versions),
+            "content_hash": combined_hash([v['content_hash'] for v in versions]),
+            "health_score": stats['health_score'],
+            "updated_at": new_version['uploaded_at'],
+        }})
+    if result.matched_count == 0:
+        remove_dataset_files(file_path)
+        raise HTTPException(status_code=409, detail="Dataset was changed by another upload, please retry")
+
+    return {
+        "message": "File appended successfully",
+        "dataset": {
+            "id": dataset_id,
+            "filename": dataset['filename'],
+            "version": version,
+            "rows": stats['rows'],
+            "columns": stats['columns'],
+            "health_score": stats['health_score']
+        }
+    }
+
+async def create_dataset(dataset_id: str, user_id: str, filename: str, file_path: Path, file_size: int,
+                         content_hash: str, **fields) -> dict:
+    # Profiles a file saved to UPLOAD_DIR and stores its dataset; the file is removed if that fails.
+    try:
+        stats = await run_analysis_task(profile_upload, str(file_path), filename)
+    except BaseException:
+        remove_dataset_files(file_path)
+        raise
+
+    dataset_doc = {
+        "id": dataset_id,
+        "user_id": user_id,
+        "filename": filename,
+        "upload_date": datetime.now(timezone.utc).isoformat(),
+        "rows": stats['rows'],
+        "columns": stats['columns'],
+        "file_size": file_size,
+        "content_hash": content_hash,
+        "health_score": stats['health_score'],
+        "file_path": str(file_path),
+        "version": 1,
+        **fields
+    }
+    await db.datasets.insert_one(dataset_doc)
+
+    return {
+        "id": dataset_id,
+        "filename": filename,
+        "rows": stats['rows'],
+        "columns": stats['columns'],
+        "health_score": stats['health_score'],
+        "memory": stats['memory']
+    }
+
 @api_router.post("/datasets/upload")
-async def upload_dataset(file: UploadFile = File(...), current_user: dict = Depends(get_current_user)):
+async def upload_dataset(file: UploadFile = File(...), append_to: Optional[str] = None,
+                         current_user: dict = Depends(get_current_user)):
     try:
-        content = await file.read()
-        file_size = len(content)
-        
-        if file.filename.endswith('.csv'):
-            df = pd.read_csv(io.BytesIO(content))
-        elif file.filename.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(io.BytesIO(content))
-        elif file.filename.endswith('.json'):
-            df = pd.read_json(io.BytesIO(content))
-        else:
+        if not file.filename.endswith(SUPPORTED_EXTENSIONS):
             raise HTTPException(status_code=400, detail="Unsupported file format. Use CSV, Excel or JSON")
-        
+        if append_to:
+            return await append_dataset_version(append_to, file, current_user['id'])
+
         dataset_id = str(uuid.uuid4())
-        file_path = UPLOAD_DIR / f"{dataset_id}_{file.filename}"
-        with open(file_path, 'wb') as f:
-            f.write(content)
-        
-        analyzer = DataQualityAnalyzer(df)
-        health_score = analyzer.calculate_health_score()
-        
-        dataset_doc = {
-            "id": dataset_id,
-            "user_id": current_user['id'],
-            "filename": file.filename,
-            "upload_date": datetime.now(timezone.utc).isoformat(),
-            "rows": len(df),
-            "columns": len(df.columns),
-            "file_size": file_size,
-            "health_score": health_score,
-            "file_path": str(file_path)
-        }
-        
-        await db.datasets.insert_one(dataset_doc)
-        
+        file_path = UPLOAD_DIR / f"{dataset_id}_{Path(file.filename).name}"
+        try:
+            file_size, content_hash = await stream_upload_to_disk(file, file_path, UPLOAD_CHUNK_SIZE, MAX_UPLOAD_BYTES)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+
+        dataset = await create_dataset(dataset_id, current_user['id'], file.filename, file_path, file_size, content_hash)
         return {
             "message": "File uploaded successfully",
-            "dataset": {
-                "id": dataset_id,
-                "filename": file.filename,
-                "rows": len(df),
-                "columns": len(df.columns),
-                "health_score": health_score
-            }
+            "dataset": dataset
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Upload error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
+def batch_error(result: dict, e: Exception) -> dict:
+    if isinstance(e, HTTPException):
+        return {**result, "status": "error", "error": e.detail}
+    logging.error(f"Batch item error ({result['source']}): {str(e)}")
+    return {**result, "status": "error", "error": f"Error processing file: {str(e)}"}
+
+async def create_batch_dataset(result: dict, dataset_id: str, user_id: str, filename: str, file_path: Path,
+                               file_size: int, content_hash: str, batch_id: str) -> dict:
+    try:
+        dataset = await create_dataset(dataset_id, user_id, filename, file_path, file_size, content_hash,
+                                       batch_id=batch_id)
+    except Exception as e:
+        return batch_error(result, e)
+    return {**result, "status": "ok", "dataset": dataset}
+
+async def process_batch_item(batch_id: str, user_id: str, index: int, item: dict) -> List[dict]:
+    # One uploaded file or archive member; a multi-sheet workbook gives a dataset per sheet.
+    result = {"index": index, "source": item['source'], "sheet": None}
+    if 'error' in item:
+        return [{**result, "status": "error", "error": item['error']}]
+    filename = item['filename']
+    if not filename.endswith(SUPPORTED_EXTENSIONS):
+        return [{**result, "status": "error", "error": "Unsupported file format. Use CSV, Excel or JSON"}]
+
+    dataset_id = str(uuid.uuid4())
+    file_path = UPLOAD_DIR / f"{dataset_id}_{filename}"
+    try:
+        if 'member' in item:
+            file_size, content_hash = await run_in_threadpool(
+                extract_zip_member, item['archive'], item['member'], file_path, UPLOAD_CHUNK_SIZE, MAX_UPLOAD_BYTES)
+        else:
+            os.replace(item['path'], file_path)
+            file_size, content_hash = item['file_size'], item['content_hash']
+        sheets = await run_analysis_task(split_workbook, str(file_path)) if filename.endswith(('.xlsx', '.xls')) else []
+    except Exception as e:
+        remove_dataset_files(file_path)
+        return [batch_error(result, e)]
+    if not sheets:
+        return [await create_batch_dataset(
+            result, dataset_id, user_id, filename, file_path, file_size, content_hash, batch_id)]
+
+    remove_dataset_files(file_path)
+    results = []
+    try:
+        for sheet in sheets:
+            sheet_id = str(uuid.uuid4())
+            sheet_filename = f"{Path(filename).stem} [{sheet['sheet']}].xlsx"
+            sheet_path = UPLOAD_DIR / f"{sheet_id}_{sheet_filename}"
+            os.replace(sheet['file_path'], sheet_path)
+            move_columnar(sheet['file_path'], sheet_path)
+            results.append(await create_batch_dataset(
+                {**result, "sheet": sheet['sheet']}, sheet_id, user_id, sheet_filename, sheet_path,
+                sheet_path.stat().st_size, sheet_content_hash(content_hash, sheet['sheet']), batch_id))
+    finally:
+        for sheet in sheets:
+            remove_dataset_files(Path(sheet['file_path']))
+    return results
+
+async def batch_results(batch_id: str, user_id: str, items: List[dict], staged: List[Path]):
+    results = []
+    try:
+        process = partial(process_batch_item, batch_id, user_id)
+        async for result in run_bounded(items, process, BATCH_CONCURRENCY or analysis_executor.max_workers):
+            results.append(result)
+            yield dumps({"type": "item", **result}) + b"\n"
+        yield dumps(batch_summary(batch_id, results)) + b"\n"
+    finally:
+        for path in staged:
+            path.unlink(missing_ok=True)
+
+@api_router.post("/datasets/batch")
+async def upload_batch(files: List[UploadFile] = File(...), current_user: dict = Depends(get_current_user)):
+    """Create a dataset from every file, zip archive member and workbook sheet.
+
+    The uploads are saved first; the response then streams one NDJSON line
+    per dataset as its analysis finishes, and a summary line last.
+    """
+    batch_id = str(uuid.uuid4())
+    items: List[dict] = []
+    staged: List[Path] = []
+    try:
+        for file in files:
+            name = Path(file.filename).name
+            path = UPLOAD_DIR / f"{batch_id}_{len(staged)}_{name}"
+            try:
+                file_size, content_hash = await stream_upload_to_disk(file, path, UPLOAD_CHUNK_SIZE, MAX_UPLOAD_BYTES)
+            except UploadTooLargeError as e:
+                items.append({"source": file.filename, "error": str(e)})
+                continue
+            staged.append(path)
+            if not is_archive(name):
+                items.append({"source": file.filename, "filename": name, "path": path,
+                              "file_size": file_size, "content_hash": content_hash})
+                continue
+            try:
+                members = await run_in_threadpool(archive_members, path, file.filename,
+                                                  BATCH_MAX_ARCHIVE_BYTES, BATCH_MAX_COMPRESSION_RATIO)
+            except BatchError as e:
+                items.append({"source": file.filename, "error": str(e)})
+                continue
+            items.extend({"source": f"{file.filename}/{member}", "filename": PurePosixPath(member).name,
+                          "archive": path, "member": member} for member in members)
+        if len(items) > BATCH_MAX_ITEMS:
+            raise HTTPException(status_code=400, detail=f"Batch has {len(items)} files, the limit is {BATCH_MAX_ITEMS}")
+    except BaseException:
+        for path in staged:
+            path.unlink(missing_ok=True)
+        raise
+
+    return StreamingResponse(batch_results(batch_id, current_user['id'], items, staged),
+                             media_type="application/x-ndjson")
+
 @api_router.get("/datasets", response_model=List[DatasetResponse])
-async def get_datasets(current_user: dict = Depends(get_current_user)):
-    datasets = await db.datasets.find({"user_id": current_user['id']}, {"_id": 0}).sort("upload_date", -1).to_list(100)
+async def get_datasets(response: Response,
+                       limit: int = Query(100, ge=1, le=500),
+                       cursor: Optional[str] = None,
+                       current_user: dict = Depends(get_token_user)):
+    try:
+        datasets, next_cursor = await paginate(
+            db.datasets, {"user_id": current_user['id']}, "upload_date", limit, cursor,
+            {field: 1 for field in DatasetResponse.model_fields})
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return datasets
 
-
+@api_router.get("/reports", response_model=List[ReportSummary])
+async def get_reports(response: Response,
+                      dataset_id: Optional[str] = None,
+                      limit: int = Query(100, ge=1, le=500),
+                      cursor: Optional[str] = None,
+                      current_user: dict = Depends(get_token_user)):
+    query = {"user_id": current_user['id']}
+    if dataset_id:
+        query["dataset_id"] = dataset_id
+    try:
+        reports, next_cursor = await paginate(
+            db.reports, query, "created_at", limit, cursor,
+            {"dataset_id": 1, "summary": 1, "report_data.health_score": 1, "report_data.approximate": 1})
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    for report in reports:
+        report.update(report.pop("summary", None) or report.pop("report_data", {}))
+    return reports
+
+
+
+async def save_report(dataset: dict, user_id: str, report_data: Dict[str, Any], report_cache_key: str) -> str:
+    # The payload itself is stored once per cache key by report_cache.
+    report_id = str(uuid.uuid4())
+    report_doc = {
+        "id": report_id,
+        "dataset_id": dataset['id'],
+        "user_id": user_id,
+        "summary": report_summary(report_data),
+        "cache_key": report_cache_key,
+        "payload_id": report_cache_key,
+        "created_at": datetime.now(timezone.utc).isoformat()
+    }
+    await db.reports.insert_one(report_doc)
+    return report_id
+
+async def load_report_data(report_doc: dict, sections=None) -> Optional[Dict[str, Any]]:
+    # Reports saved before payloads were split out keep report_data inline.
+    if 'report_data' in report_doc:
+        return report_doc['report_data']
+    return await report_payloads.get(report_doc['payload_id'], sections)
+
+async def ensure_content_hash(dataset: dict) -> str:
+    # Datasets uploaded before content hashing get theirs on first analysis.
+    if not dataset.get('content_hash'):
+        content_hash = await run_in_threadpool(file_sha256, Path(dataset['file_path']))
+        await db.datasets.update_one({"id": dataset['id']}, {"$set": {"content_hash": content_hash}})
+        dataset['content_hash'] = content_hash
+    return dataset['content_hash']
+
+async def build_report(dataset: dict, user_id: str, run=None, job_id: Optional[str] = None,
+                       sample: Optional[dict] = None, outliers: Optional[dict] = None,
+                       columns: Optional[List[str]] = None, sections: Optional[List[str]] = None):
+    """Return (report_id, report_data, cached) for a dataset.
+
+    Reuses this dataset's report when one exists for the same cache key, then
+    the shared report cache, and only runs the analyzer on a miss. With
+    `sample` ({"size", "stratify_by", "seed"}) an approximate report is built
+    from a random sample of rows instead. `outliers` are the outlier detection
+    settings from utils.outliers.outlier_settings(). With `columns` only
+    those columns are loaded and analyzed. With `sections` (see
+    payload_sections) a stored report may be loaded partially; callers
+    select the fields they need from a computed one.
+    """
+    run = run or run_analysis_task
+    config = analysis_config(outliers)
+    if sample:
+        config["sample"] = sample
+    if columns:
+        config["columns"] = sorted(set(columns))
+    content_hash = await ensure_content_hash(dataset)
+    key = cache_key(content_hash, ANALYZER_VERSION, config)
+
+    existing = await db.reports.find_one(
+        {"dataset_id": dataset['id'], "user_id": user_id, "cache_key": key},
+        {"_id": 0, "id": 1, "payload_id": 1, "report_data": 1})
+    if existing:
+        report_data = await load_report_data(existing, sections)
+        if report_data is not None:
+            return existing['id'], report_data, True
+
+    versions = dataset_versions(dataset)
+    if columns and len(versions) > 1 and not sample:
+        raise ColumnSelectionError("columns cannot be selected for appended datasets without sample")
+
+    async def compute():
+        if sample:
+            return await run(analyze_sample, versions, sample['size'], sample['stratify_by'], sample['seed'],
+                             config['outliers'], columns)
+        if len(versions) > 1:
+            return await run(analyze_versions, versions, job_id, config['outliers'])
+        return await run(analyze_file, dataset['file_path'], dataset['filename'], job_id, config['outliers'], columns)
+
+    timings = StageTimings()
+    report_data, cached = await report_cache.get_or_compute(
+        key, compute, {"content_hash": content_hash, "analyzer_version": ANALYZER_VERSION, "config": config},
+        timings, sections)
+    with timings.stage("mongo_insert", resources=False):
+        report_id = await save_report(dataset, user_id, report_data, key)
+    if not cached:
+        # The stored report has the analysis stages; the writes are only known after storing it.
+        report_data = {**report_data, "timings": {**report_data.get("timings", {}), **timings.as_dict()}}
+        metrics.observe_timings(report_data["timings"])
+    return report_id, report_data, cached
+
+def outlier_options(outlier_method: Optional[str] = None,
+                    outlier_threshold: Optional[float] = None,
+                    outlier_thresholds: Optional[str] = None) -> dict:
+    # outlier_thresholds is a JSON object of per-column thresholds, e.g. {"price": 3}.
+    try:
+        return outlier_settings(outlier_method, outlier_threshold, parse_column_thresholds(outlier_thresholds))
+    except OutlierSettingsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def column_selection(columns: Optional[str] = None) -> Optional[List[str]]:
+    # A comma-separated list of the columns to load, e.g. ?columns=price,region.
+    if columns is None:
+        return None
+    selected = [col.strip() for col in columns.split(',') if col.strip()]
+    if not selected:
+        raise HTTPException(status_code=400, detail="columns must name at least one column")
+    return selected
+
+def field_selection(fields: Optional[str] = None) -> Optional[List[str]]:
+    # Top-level report sections to return, e.g. ?fields=summary,health_score.
+    if fields is None:
+        return None
+    selected = [field.strip() for field in fields.split(',') if field.strip()]
+    if not selected:
+        raise HTTPException(status_code=400, detail="fields must name at least one report section")
+    unknown = [field for field in selected if field not in REPORT_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown report fields: {', '.join(unknown)}")
+    return selected
+
+def payload_sections(fields: Optional[List[str]]) -> Optional[List[str]]:
+    # The stored sections to load for a field selection. Every report has a
+    # health_score, so a payload is found even if it has none of the fields.
+    if fields is None:
+        return None
+    return with_detached(dict.fromkeys([*fields, "health_score", "approximate"]))
 
 @api_router.get("/datasets/{dataset_id}/analyze")
-async def analyze_dataset(dataset_id: str, current_user: dict = Depends(get_current_user)):
+async def analyze_dataset(dataset_id: str,
+                          sample: Optional[int] = Query(None, ge=1),
+                          stratify_by: Optional[str] = None,
+                          seed: int = 0,
+                          outliers: dict = Depends(outlier_options),
+                          columns: Optional[List[str]] = Depends(column_selection),
+                          fields: Optional[List[str]] = Depends(field_selection),
+                          current_user: dict = Depends(get_current_user)):
     dataset = await db.datasets.find_one({"id": dataset_id, "user_id": current_user['id']}, {"_id": 0})
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
+    if stratify_by and not sample:
+        raise HTTPException(status_code=400, detail="stratify_by requires sample")
 
+    sample_settings = {"size": sample, "stratify_by": stratify_by, "seed": seed} if sample else None
     try:
-        file_path = Path(dataset['file_path'])
-        if dataset['filename'].endswith('.csv'):
-            df = pd.read_csv(file_path)
-        elif dataset['filename'].endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(file_path)
-        else:
-            df = pd.read_json(file_path)
-
-        analyzer = DataQualityAnalyzer(df)
-        report_data = analyzer.generate_full_report()
-
-        report_id = str(uuid.uuid4())
-        report_doc = {
-            "id": report_id,
-            "dataset_id": dataset_id,
-            "user_id": current_user['id'],
-            "report_data": report_data,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        }
-        def stringify_keys(obj):
-            if isinstance(obj, dict):
-                return {str(k): stringify_keys(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [stringify_keys(i) for i in obj]
-            else:
-                return obj
-
-        report_doc["report_data"] = stringify_keys(report_data)
-
-        await db.reports.insert_one(report_doc)
-
-        pdf_buffer = io.BytesIO()
-        generate_pdf_report(report_data, dataset['filename'], pdf_buffer)
-        pdf_buffer.seek(0)
-        return {
+        report_id, report_data, cached = await build_report(
+            dataset, current_user['id'], sample=sample_settings, outliers=outliers, columns=columns,
+            sections=payload_sections(fields))
+        return json_stream_response({
             "report_id": report_id,
             "dataset_name": dataset['filename'],
-            "report_data": report_data,
+            "report_data": select_fields(report_data, fields),
+            "cached": cached,
+            "approximate": report_data.get("approximate", False),
             "pdf_download_url": f"/api/reports/{report_id}/download",
-            "message": "Analysis completed successfully"}
-
-        # # REPORT_DIR = Path(__file__).resolve().parent / "reports"
-        # # REPORT_DIR.mkdir(exist_ok=True)
-        # # pdf_path = REPORT_DIR / f"{report_id}.pdf"
-        # # with open(pdf_path, "wb") as f:
-        # #     f.write(pdf_buffer.read())
-        # # await db.reports.update_one({"id": report_id}, {"$set": {"pdf_path": str(pdf_path)}})
-
-        # return {
-        #     "report_id": report_id,
-        #     "dataset_name": dataset['filename'],
-        #     "report_data": report_data,
-        #     "pdf_download_url": f"/api/reports/{report_id}/download",
-        #     "message": "Analysis completed successfully"
-        # }
+            "message": "Analysis completed successfully"})
 
+    except HTTPException:
+        raise
+    except (SamplingError, ColumnSelectionError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"Analysis error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error analyzing dataset: {str(e)}")
 
+async def run_analysis_job(job: dict) -> str:
+    dataset = await db.datasets.find_one({"id": job['dataset_id'], "user_id": job['user_id']}, {"_id": 0})
+    if not dataset:
+        raise ValueError("Dataset not found")
+
+    run = partial(analysis_executor.run, timeout=JOB_TIMEOUT_SECONDS)
+    options = job.get('options', {})
+    report_id, _, _ = await build_report(dataset, job['user_id'], run=run, job_id=job['id'],
+                                         outliers=options.get('outliers'), columns=options.get('columns'))
+    return report_id
+
+job_worker = JobWorker.from_env(db, run_analysis_job, default_concurrency=analysis_executor.max_workers)
+
+@api_router.post("/datasets/{dataset_id}/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_analysis_job(dataset_id: str, outliers: dict = Depends(outlier_options),
+                              columns: Optional[List[str]] = Depends(column_selection),
+                              current_user: dict = Depends(get_current_user)):
+    dataset = await db.datasets.find_one({"id": dataset_id, "user_id": current_user['id']}, {"_id": 0, "id": 1})
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    job = new_job_doc(dataset_id, current_user['id'], {"outliers": outliers, "columns": columns})
+    await db.jobs.insert_one(job)
+
+    return {
+        **job_status(job),
+        "status_url": f"/api/jobs/{job['id']}",
+        "result_url": f"/api/jobs/{job['id']}/result"
+    }
+
+@api_router.get("/jobs/{job_id}")
+async def get_analysis_job(job_id: str, current_user: dict = Depends(get_token_user)):
+    job = await db.jobs.find_one({"id": job_id, "user_id": current_user['id']}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+@api_router.get("/jobs/{job_id}/result")
+async def get_analysis_job_result(job_id: str, fields: Optional[List[str]] = Depends(field_selection),
+                                  current_user: dict = Depends(get_token_user)):
+    job = await db.jobs.find_one({"id": job_id, "user_id": current_user['id']}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job['status'] == JOB_FAILED:
+        raise HTTPException(status_code=500, detail=f"Error analyzing dataset: {job['error']}")
+    if job['status'] != JOB_COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+
+    report_doc = await db.reports.find_one({"id": job['report_id'], "user_id": current_user['id']}, {"_id": 0})
+    dataset = await db.datasets.find_one({"id": job['dataset_id']}, {"_id": 0, "filename": 1})
+    report_data = await load_report_data(report_doc, payload_sections(fields)) if report_doc else None
+    if report_data is None or not dataset:
+        raise HTTPException(status_code=404, detail="Report not found")
+
+    return json_stream_response({
+        "report_id": report_doc['id'],
+        "dataset_name": dataset['filename'],
+        "report_data": select_fields(report_data, fields),
+        "pdf_download_url": f"/api/reports/{report_doc['id']}/download",
+        "message": "Analysis completed successfully"})
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or any(tag.removeprefix('W/') == etag for tag in tags)
+
 @api_router.get("/reports/{report_id}/download")
-async def download_report(report_id: str, current_user: dict = Depends(get_current_user)):
-    report_doc = await db.reports.find_one({"id": report_id, "user_id": current_user['id']}, {"_id": 0})
+async def download_report(report_id: str, if_none_match: Optional[str] = Header(None),
+                          current_user: dict = Depends(get_token_user)):
+    report_doc = await db.reports.find_one({"id": report_id, "user_id": current_user['id']}, {"_id": 0, "id": 1, "dataset_id": 1})
     if not report_doc:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    pdf_buffer = io.BytesIO()
     dataset = await db.datasets.find_one(
     {"id": report_doc["dataset_id"], "user_id": current_user["id"]},
     {"_id": 0, "filename": 1})
@@ -306,12 +772,21 @@ async def download_report(report_id: str, current_user: dict = Depends(get_curre
         raise HTTPException(status_code=404, detail="Related dataset not found")
 
     dataset_name = dataset["filename"]
-    generate_pdf_report(report_doc["report_data"], dataset_name, pdf_buffer)
-    pdf_buffer.seek(0)
-    download_filename = f"Quality of {Path(dataset_name).stem}.pdf"
 
-    headers = {"Content-Disposition": f'attachment; filename="{download_filename}"'}
-    return StreamingResponse(pdf_buffer, media_type="application/pdf", headers=headers)
+    async def render():
+        report = await db.reports.find_one({"id": report_id}, {"_id": 0, "payload_id": 1, "report_data": 1})
+        report_data = await load_report_data(report, PDF_SECTIONS)
+        pdf, timings = await run_analysis_task(render_pdf_timed, report_data, dataset_name)
+        metrics.observe_timings(timings)
+        return pdf
+
+    pdf_path, etag = await pdf_store.get_or_render(report_id, render)
+    etag = f'"{etag}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    download_filename = f"Quality of {Path(dataset_name).stem}.pdf"
+    return FileResponse(pdf_path, media_type="application/pdf", filename=download_filename, headers={"ETag": etag})
 
 
 @api_router.delete("/datasets/{dataset_id}")
@@ -320,23 +795,50 @@ async def delete_dataset(dataset_id: str, current_user: dict = Depends(get_curre
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
     
-    file_path = Path(dataset['file_path'])
-    if file_path.exists():
-        file_path.unlink()
+    for version in dataset_versions(dataset):
+        remove_dataset_files(Path(version['file_path']))
     
+    cache_keys = set()
+    async for report in db.reports.find({"dataset_id": dataset_id}, {"_id": 0, "id": 1, "cache_key": 1}):
+        pdf_store.delete(report['id'])
+        if report.get('cache_key'):
+            cache_keys.add(report['cache_key'])
+
     await db.datasets.delete_one({"id": dataset_id})
     await db.reports.delete_many({"dataset_id": dataset_id})
+    await db.jobs.delete_many({"dataset_id": dataset_id})
+    # Cached reports contain rows of the data (duplicate samples); drop the
+    # ones no other dataset's report uses.
+    for key in cache_keys:
+        if not await db.reports.find_one({"cache_key": key}, {"_id": 1}):
+            await report_cache.delete(key)
     
     return {"message": "Dataset deleted successfully"}
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
 app.include_router(api_router)
 
+app.add_middleware(
+    RequestBodyLimitMiddleware,
+    max_bytes=MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES if MAX_UPLOAD_BYTES else 0,
+    path_limits={"/api/datasets/batch": BATCH_MAX_REQUEST_BYTES},
+)
+
+if METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware, metrics=metrics)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 logging.basicConfig(
@@ -345,6 +847,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_indexes():
+    if MONGO_CREATE_INDEXES:
+        await ensure_indexes(db)
+
+@app.on_event("startup")
+async def start_job_worker():
+    if JOB_WORKER_ENABLED:
+        job_worker.start()
+
+warm_up_task = None
+
+async def warm_up_analysis():
+    try:
+        await analysis_executor.warm_up(warm_up)
+        # Reports coming back from the pool may carry pandas objects.
+        await run_in_threadpool(importlib.import_module, 'pandas')
+        logger.info("Analysis stack warmed up")
+    except Exception as e:
+        logger.error(f"Analysis warm-up failed: {str(e)}")
+
+@app.on_event("startup")
+async def start_warm_up():
+    # Runs in the background so the server accepts traffic while workers load pandas and friends.
+    global warm_up_task
+    if ANALYSIS_WARMUP:
+        warm_up_task = asyncio.create_task(warm_up_analysis())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    await job_worker.stop()
+    client.close()
+    analysis_executor.shutdown()
+    password_hasher.shutdown()
\ No newline at end of file
@@ -0,0 +1,51 @@
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def db():
+    from mongomock_motor import AsyncMongoMockClient
+    return AsyncMongoMockClient()["test"]
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    """A small frame with the column kinds the checks treat differently."""
+    rng = np.random.default_rng(0)
+    rows = 200
+    df = pd.DataFrame({
+        "id": np.arange(rows),
+        "amount": rng.normal(100, 15, rows),
+        "count": rng.integers(0, 10, rows),
+        "region": rng.choice(["North", "north", " South", "South", "East"], rows),
+        "signup_date": rng.choice(["2021-01-05", "2021-02-11", "not a date"], rows),
+        "label": rng.choice(["yes", "no"], rows, p=[0.9, 0.1]),
+    })
+    df.loc[::17, "amount"] = np.nan
+    df.loc[::23, "region"] = None
+    df.loc[5, "amount"] = 1000.0
+    # Full-row duplicates, apart from the id.
+    df.iloc[150:160, 1:] = df.iloc[0:10, 1:].to_numpy()
+    return df
+
+
+@pytest.fixture
+def server(monkeypatch):
+    # The API module; it needs a database URL but does not connect until used.
+    monkeypatch.setenv("MONGO_URL", os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    monkeypatch.setenv("DB_NAME", os.environ.get("DB_NAME", "test"))
+    import server
+    return server
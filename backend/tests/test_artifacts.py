@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from utils.artifacts import PdfArtifactStore
+
+pytestmark = pytest.mark.anyio
+
+PDF = b"%PDF-1.4 report"
+
+
+def test_put_and_get(tmp_path):
+    store = PdfArtifactStore(tmp_path)
+    path, etag = store.put("r1", PDF)
+
+    assert path.read_bytes() == PDF
+    assert store.get("r1") == (path, etag)
+    assert store.get("r2") is None
+
+
+def test_index_is_rebuilt_from_disk(tmp_path):
+    path, etag = PdfArtifactStore(tmp_path).put("r1", PDF)
+
+    restarted = PdfArtifactStore(tmp_path)
+    assert restarted.get("r1") == (path, etag)
+    assert restarted.total_bytes == len(PDF)
+
+
+def test_evicts_least_recently_used(tmp_path):
+    store = PdfArtifactStore(tmp_path, max_bytes=2 * len(PDF))
+    store.put("r1", PDF)
+    store.put("r2", PDF)
+    store.get("r1")
+    store.put("r3", PDF)
+
+    assert store.get("r2") is None
+    assert store.get("r1") is not None and store.get("r3") is not None
+    assert len(list(tmp_path.glob("*.pdf"))) == 2
+
+
+def test_replacing_and_deleting(tmp_path):
+    store = PdfArtifactStore(tmp_path)
+    store.put("r1", PDF)
+    path, _ = store.put("r1", PDF + b" v2")
+
+    assert list(tmp_path.glob("*.pdf")) == [path]
+    store.delete("r1")
+    assert store.get("r1") is None and not path.exists()
+
+
+async def test_concurrent_misses_render_once(tmp_path):
+    store = PdfArtifactStore(tmp_path)
+    renders = []
+
+    async def render():
+        renders.append(1)
+        await asyncio.sleep(0.05)
+        return PDF
+
+    results = await asyncio.gather(*(store.get_or_render("r1", render) for _ in range(4)))
+
+    assert len(renders) == 1
+    assert len(set(results)) == 1
+    assert await store.get_or_render("r1", render) == results[0] and len(renders) == 1
@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import json
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from utils.batch import BatchError, archive_members, batch_summary, run_bounded, sheet_content_hash
+from utils.columnar import columnar_path, move_columnar
+from utils.tasks import read_dataset, split_workbook
+from utils.uploads import UploadTooLargeError, extract_zip_member
+
+pytestmark = pytest.mark.anyio
+
+
+def make_archive(path, members):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return path
+
+
+def test_archive_members_skips_directories_and_hidden_files(tmp_path):
+    archive = make_archive(tmp_path / "a.zip", {
+        "a.csv": "x\n1\n", "dir/": "", "dir/b.json": "[]", ".hidden.csv": "x", "__MACOSX/._a.csv": "junk",
+    })
+
+    assert archive_members(archive, "a.zip", max_bytes=1000, max_ratio=200) == ["a.csv", "dir/b.json"]
+
+
+def test_archive_members_limits(tmp_path):
+    archive = make_archive(tmp_path / "a.zip", {"a.csv": "1,2,3\n" * 100, "b.csv": "x" * 10})
+
+    with pytest.raises(BatchError, match="expands to more than the limit of 500 bytes"):
+        archive_members(archive, "a.zip", max_bytes=500, max_ratio=1000)
+    with pytest.raises(BatchError, match="a.csv is compressed more than 10 times"):
+        archive_members(archive, "a.zip", max_bytes=10_000, max_ratio=10)
+
+
+def test_archive_members_rejects_other_files(tmp_path):
+    (tmp_path / "a.zip").write_text("not a zip")
+
+    with pytest.raises(BatchError, match="a.zip is not a valid zip archive"):
+        archive_members(tmp_path / "a.zip", "a.zip", max_bytes=10_000, max_ratio=10)
+
+
+def test_extract_zip_member(tmp_path):
+    data = b"a,b\n1,2\n" * 1000
+    archive = make_archive(tmp_path / "a.zip", {"dir/a.csv": data})
+
+    size, digest = extract_zip_member(archive, "dir/a.csv", tmp_path / "a.csv", chunk_size=1024)
+
+    assert (size, digest) == (len(data), hashlib.sha256(data).hexdigest())
+    assert (tmp_path / "a.csv").read_bytes() == data
+
+    with pytest.raises(UploadTooLargeError):
+        extract_zip_member(archive, "dir/a.csv", tmp_path / "b.csv", chunk_size=1024, max_bytes=4096)
+    assert not (tmp_path / "b.csv").exists()
+
+
+async def test_run_bounded_limits_concurrency_and_yields_as_finished():
+    running = 0
+    peak = 0
+
+    async def process(index, delay):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(delay)
+        running -= 1
+        return [{"index": index}, {"index": index, "part": 2}] if index == 0 else [{"index": index}]
+
+    results = [result async for result in run_bounded([0.05, 0.01, 0.03, 0.0], process, concurrency=2)]
+
+    assert peak == 2
+    assert sorted(r["index"] for r in results) == [0, 0, 1, 2, 3]
+    assert [r["index"] for r in results][:2] == [1, 2]
+
+
+async def test_closing_run_bounded_cancels_the_rest():
+    cancelled = []
+
+    async def process(index, delay):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        return [{"index": index}]
+
+    results = run_bounded([0.0, 10, 10], process, concurrency=3)
+    assert await results.__anext__() == {"index": 0}
+    await results.aclose()
+
+    assert sorted(cancelled) == [1, 2]
+
+
+def ok(index, rows, score, sheet=None):
+    return {"index": index, "source": f"file{index}", "sheet": sheet, "status": "ok",
+            "dataset": {"id": f"d{index}{sheet or ''}", "rows": rows, "health_score": score}}
+
+
+def test_batch_summary():
+    results = [
+        ok(2, 300, 60.0),
+        {"index": 1, "source": "file1", "sheet": None, "status": "error", "error": "Unsupported file format"},
+        ok(0, 100, 90.0, sheet="B"),
+        ok(0, 100, 80.0, sheet="A"),
+    ]
+
+    summary = batch_summary("b1", results)
+
+    assert {key: summary[key] for key in summary if key != "health_scores"} == {
+        "type": "summary", "batch_id": "b1", "items": 4, "succeeded": 3, "failed": 1,
+        "total_rows": 500, "mean_health_score": 76.67, "row_weighted_health_score": 70.0,
+    }
+    assert [(s["source"], s["sheet"], s["health_score"]) for s in summary["health_scores"]] == [
+        ("file0", "A", 80.0), ("file0", "B", 90.0), ("file1", None, None), ("file2", None, 60.0)]
+
+
+def test_batch_summary_without_datasets():
+    summary = batch_summary("b1", [{"index": 0, "source": "x", "status": "error", "error": "bad"}])
+
+    assert summary["mean_health_score"] is None and summary["row_weighted_health_score"] is None
+
+
+def test_sheet_content_hash():
+    assert sheet_content_hash("abc", "First") == sheet_content_hash("abc", "First")
+    assert sheet_content_hash("abc", "First") != sheet_content_hash("abc", "Second")
+    assert sheet_content_hash("abc", "First") != sheet_content_hash("abd", "First")
+
+
+def test_split_workbook_caches_each_sheet(tmp_path, frame):
+    pytest.importorskip("pyarrow")
+    pytest.importorskip("openpyxl")
+    book = tmp_path / "book.xlsx"
+    parts = {"First": frame.iloc[:50], "Second": frame.iloc[50:80, :3]}
+    with pd.ExcelWriter(book) as writer:
+        for name, part in parts.items():
+            part.to_excel(writer, sheet_name=name, index=False)
+
+    sheets = split_workbook(str(book))
+
+    assert [sheet["sheet"] for sheet in sheets] == ["First", "Second"]
+    for sheet, part in zip(sheets, parts.values()):
+        renamed = tmp_path / f"{sheet['sheet']}.xlsx"
+        Path(sheet["file_path"]).replace(renamed)
+        move_columnar(sheet["file_path"], renamed)
+        assert not columnar_path(sheet["file_path"]).exists()
+        # Read from the columnar cache, not the Excel file.
+        renamed.write_bytes(b"not a workbook")
+        loaded = read_dataset(renamed, renamed.name)
+        assert list(loaded.columns) == list(part.columns) and len(loaded) == len(part)
+
+
+def test_split_workbook_leaves_single_sheets_alone(tmp_path, frame):
+    pytest.importorskip("openpyxl")
+    book = tmp_path / "book.xlsx"
+    frame.to_excel(book, index=False)
+
+    assert split_workbook(str(book)) == []
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["book.xlsx"]
+
+
+async def test_batch_results_stream_items_errors_and_summary(server, monkeypatch, tmp_path):
+    staged = tmp_path / "staged.zip"
+    staged.write_bytes(b"zip")
+    items = [
+        {"source": "big.csv", "error": "File exceeds the maximum upload size of 10 bytes"},
+        {"source": "notes.txt", "filename": "notes.txt"},
+        {"source": "data.csv", "filename": "data.csv"},
+        {"source": "broken.csv", "filename": "broken.csv"},
+    ]
+
+    async def create_dataset(dataset_id, user_id, filename, file_path, file_size, content_hash, batch_id):
+        if filename == "broken.csv":
+            raise ValueError("no columns to parse")
+        return {"id": dataset_id, "rows": 10, "health_score": 75.0}
+
+    monkeypatch.setattr(server, "create_dataset", create_dataset)
+    monkeypatch.setattr(server, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(server, "BATCH_CONCURRENCY", 2)
+    for item in items[2:]:
+        item.update(path=tmp_path / item["filename"], file_size=3, content_hash="h")
+        item["path"].write_text("a\n1")
+
+    lines = [json.loads(line) async for line in server.batch_results("b1", "u1", items, [staged])]
+
+    *item_lines, summary = lines
+    outcome = {line["source"]: (line["type"], line["status"], line.get("error")) for line in item_lines}
+    assert outcome == {
+        "big.csv": ("item", "error", "File exceeds the maximum upload size of 10 bytes"),
+        "notes.txt": ("item", "error", "Unsupported file format. Use CSV, Excel or JSON"),
+        "data.csv": ("item", "ok", None),
+        "broken.csv": ("item", "error", "Error processing file: no columns to parse"),
+    }
+    assert summary["type"] == "summary"
+    assert (summary["items"], summary["succeeded"], summary["failed"]) == (4, 1, 3)
+    assert not staged.exists()
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from pipeline import check_budgets  # noqa: E402
+from synthetic import make_dataset  # noqa: E402
+
+
+def test_synthetic_data_is_deterministic():
+    first = make_dataset(500, 10, seed=4)
+
+    pd.testing.assert_frame_equal(first, make_dataset(500, 10, seed=4))
+    assert not first.equals(make_dataset(500, 10, seed=5))
+
+
+def test_synthetic_data_follows_its_axes():
+    df = make_dataset(5000, 10, text_share=0.4, null_density=0.1, duplicate_rate=0.05)
+
+    assert df.shape == (5000, 10)
+    assert (df.dtypes == object).sum() == 4
+    assert df.isnull().to_numpy().mean() == pytest.approx(0.1, abs=0.02)
+    # At most the 250 planted copies: a target can also be another copy's source.
+    assert 200 < df.duplicated().sum() <= 250
+    assert make_dataset(1, 3).shape == (1, 3)
+
+
+def test_budgets_match_stages_and_scenarios():
+    scenarios = [
+        {"name": "r1000", "stages": {"profile": {"seconds": 2.0, "peak_mb": 10}, "pdf": {"seconds": 0.5}}},
+        {"name": "r9000", "stages": {"profile": {"seconds": 9.0, "peak_mb": 90}}},
+    ]
+    budgets = {"profile": {"seconds": 5}, "r1000/*": {"peak_mb": 5}, "pdf": {"peak_mb": 1}}
+
+    assert check_budgets(scenarios, budgets) == [
+        "r1000/profile peak_mb 10 > 5 (r1000/*)",
+        "r9000/profile seconds 9.0 > 5 (profile)",
+    ]
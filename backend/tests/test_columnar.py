@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+from utils.columnar import columnar_columns, columnar_path, read_columnar, skip_marker_path, write_columnar
+from utils.tasks import read_dataset
+
+pytest.importorskip("pyarrow")
+
+
+def test_round_trip(tmp_path, frame):
+    source = tmp_path / "data.csv"
+
+    assert write_columnar(frame, source) == columnar_path(source)
+    pd.testing.assert_frame_equal(read_columnar(source), frame)
+    assert columnar_columns(source) == list(frame.columns)
+    pd.testing.assert_frame_equal(read_columnar(source, ["region", "amount"]), frame[["region", "amount"]])
+
+
+def test_missing_cache(tmp_path):
+    assert read_columnar(tmp_path / "data.csv") is None
+    assert columnar_columns(tmp_path / "data.csv") is None
+
+
+def test_unwritable_frame_is_not_retried(tmp_path, caplog):
+    source = tmp_path / "people.json"
+    mixed = pd.DataFrame({"name": ["a", "b"], "age": [31, "thirty"]})
+
+    assert write_columnar(mixed, source) is None
+    assert write_columnar(mixed, source) is None
+    assert skip_marker_path(source).exists() and not columnar_path(source).exists()
+    assert len([r for r in caplog.records if "columnar cache" in r.getMessage()]) == 1
+
+
+def test_read_dataset_writes_the_cache_once(tmp_path, frame):
+    source = tmp_path / "data.csv"
+    frame.to_csv(source, index=False)
+
+    first = read_dataset(source, "data.csv")
+    source.write_text("not the original any more")
+    second = read_dataset(source, "data.csv", columns=["amount"])
+
+    pd.testing.assert_frame_equal(second, first[["amount"]])
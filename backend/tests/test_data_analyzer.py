@@ -0,0 +1,66 @@
+import pandas as pd
+
+from utils.data_analyzer import DataQualityAnalyzer, row_fingerprints
+
+
+def test_full_report_has_every_section(frame):
+    report = DataQualityAnalyzer(frame).generate_full_report()
+
+    assert list(report) == [section for section, _ in DataQualityAnalyzer.REPORT_SECTIONS]
+    assert 0 <= report["health_score"] <= 100
+
+
+def test_profile_matches_pandas(frame):
+    profile = DataQualityAnalyzer(frame).profile
+
+    for col in frame.columns:
+        series = frame[col]
+        assert profile[col]["null_count"] == series.isnull().sum()
+        assert profile[col]["unique_count"] == series.nunique()
+        assert profile[col]["duplicate_count"] == series.duplicated().sum()
+    assert profile["amount"]["is_numeric"] and not profile["region"]["is_numeric"]
+    assert profile["region"]["cleaned_unique_count"] == 3
+
+
+def test_missing_values_counts_every_null(frame):
+    missing = DataQualityAnalyzer(frame).check_missing_values()
+
+    by_column = {item["column"]: item["count"] for item in missing["details"]}
+    assert missing["total_missing"] == frame.isnull().sum().sum()
+    assert by_column == {"amount": frame["amount"].isnull().sum(), "region": frame["region"].isnull().sum()}
+
+
+def test_single_row_frame():
+    report = DataQualityAnalyzer(pd.DataFrame({"a": [1], "b": ["x"]})).generate_full_report()
+
+    assert report["summary"]["total_rows"] == 1
+    assert report["duplicates"]["full_row_duplicates"] == 0
+
+
+def test_duplicates_ignore_ids_case_and_whitespace():
+    df = pd.DataFrame({
+        "id": [1, 2, 3, 4, 5],
+        "name": ["Ann", " ann", "Bob", "BOB ", "Cy"],
+        "score": [1.0, 1.0, 2.0, 2.0, None],
+    })
+
+    duplicates = DataQualityAnalyzer(df).check_duplicates()
+    assert duplicates["full_row_duplicates"] == 2
+    assert [row["id"] for row in duplicates["duplicate_row_samples"]] == [1, 2, 3, 4]
+    assert duplicates["approximate"] is False
+
+
+def test_raw_duplicates_match_pandas(frame):
+    df = pd.concat([frame, frame.iloc[:25]], ignore_index=True)
+    df.loc[len(df)] = [None] * len(df.columns)
+    df.loc[len(df)] = [None] * len(df.columns)
+
+    assert DataQualityAnalyzer(df)._raw_duplicate_count() == df.duplicated().sum()
+
+
+def test_fingerprints_treat_int_and_float_chunks_alike():
+    as_int = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    as_float = as_int.astype({"a": "float64"})
+
+    assert (row_fingerprints(as_int) == row_fingerprints(as_float)).all()
+    assert row_fingerprints(pd.DataFrame({"user_id": [1, 1]})) is None
@@ -0,0 +1,105 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from utils import dataset_state, tasks
+from utils.dataset_state import combined_hash, dataset_versions, load_state, save_state, state_path
+from utils.serialization import dumps
+from utils.streaming_analyzer import DatasetAccumulator, StreamingDataQualityAnalyzer
+
+
+@pytest.fixture
+def versions(tmp_path, frame):
+    # Three uploads of the same columns; the last one repeats rows of the first.
+    parts = [frame.iloc[:80], frame.iloc[80:150], frame.iloc[150:].assign(id=frame["id"].iloc[:50].to_numpy())]
+    versions = []
+    for number, part in enumerate(parts, start=1):
+        path = tmp_path / f"v{number}.csv"
+        part.to_csv(path, index=False)
+        versions.append({"version": number, "filename": path.name, "file_path": str(path)})
+    return versions
+
+
+def without_timings(report):
+    return {key: value for key, value in report.items() if key != "timings"}
+
+
+def test_appended_versions_equal_a_single_pass(versions):
+    accumulator = DatasetAccumulator(sample_limit=tasks.DUPLICATE_SAMPLE_LIMIT)
+    for version in versions:
+        for chunk in tasks.read_chunks(version["file_path"], version["filename"]):
+            accumulator.update(chunk)
+    expected = StreamingDataQualityAnalyzer(accumulator=accumulator).generate_full_report()
+
+    # Analyzed after each upload, as the append endpoint does.
+    for last in range(1, len(versions) + 1):
+        report = tasks.analyze_versions(versions[:last])
+
+    assert dumps(without_timings(report)) == dumps(tasks.stringify_keys(expected))
+
+
+def test_only_new_versions_are_read(versions, monkeypatch):
+    tasks.accumulate_versions(versions[:2])
+    read = []
+    read_chunks = tasks.read_chunks
+    monkeypatch.setattr(tasks, "read_chunks", lambda path, *args: read.append(path) or read_chunks(path, *args))
+
+    accumulator = tasks.accumulate_versions(versions)
+    assert read == [versions[2]["file_path"]]
+    assert accumulator.rows == 200
+    assert all(state_path(version["file_path"]).exists() for version in versions)
+
+
+def test_state_in_another_format_is_rebuilt(versions, monkeypatch):
+    path = versions[0]["file_path"]
+    save_state(DatasetAccumulator(), path)
+    assert load_state(path) is not None
+
+    monkeypatch.setattr(dataset_state, "STATE_FORMAT", dataset_state.STATE_FORMAT + 1)
+    assert load_state(path) is None
+    state_path(path).write_bytes(pickle.dumps(DatasetAccumulator()))
+    assert load_state(path) is None
+    state_path(path).write_bytes(b"truncated")
+    assert load_state(path) is None
+
+
+def test_dataset_versions_and_combined_hash():
+    dataset = {"filename": "a.csv", "file_path": "/tmp/a.csv", "content_hash": "h1", "upload_date": "2024-01-01"}
+
+    assert [v["content_hash"] for v in dataset_versions(dataset)] == ["h1"]
+    assert combined_hash(["h1"]) == "h1"
+    assert combined_hash(["h1", "h2"]) != combined_hash(["h2", "h1"])
+
+
+@pytest.mark.anyio
+async def test_concurrent_append_keeps_the_winning_file(server, db, monkeypatch, tmp_path):
+    import asyncio
+    import io
+
+    from starlette.datastructures import UploadFile
+
+    original = tmp_path / "d1_data.csv"
+    original.write_text("a\n1\n")
+    await db.datasets.insert_one({"id": "d1", "user_id": "u1", "filename": "data.csv", "file_path": str(original),
+                                  "file_size": 4, "content_hash": "h1", "rows": 1})
+
+    async def run_analysis_task(func, versions):
+        await asyncio.sleep(0.01)
+        return {"rows": 2, "columns": 1, "health_score": 100.0}
+
+    monkeypatch.setattr(server, "db", db)
+    monkeypatch.setattr(server, "UPLOAD_DIR", tmp_path)
+    monkeypatch.setattr(server, "run_analysis_task", run_analysis_task)
+    appends = [server.append_dataset_version("d1", UploadFile(io.BytesIO(b"a\n2\n"), filename="more.csv"), "u1")
+               for _ in range(2)]
+
+    results = await asyncio.gather(*appends, return_exceptions=True)
+
+    conflicts = [r for r in results if isinstance(r, server.HTTPException)]
+    assert len(conflicts) == 1 and conflicts[0].status_code == 409
+    dataset = await db.datasets.find_one({"id": "d1"})
+    assert dataset["version"] == 2
+    assert Path(dataset["versions"][1]["file_path"]).read_bytes() == b"a\n2\n"
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        ["d1_data.csv", Path(dataset["versions"][1]["file_path"]).name])
@@ -0,0 +1,49 @@
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from utils.executor import AnalysisExecutor, ExecutorBusyError, JobTimeoutError
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def executor():
+    executor = AnalysisExecutor(max_workers=1, max_pending=2)
+    yield executor
+    executor.shutdown()
+
+
+async def test_runs_in_a_worker_process(executor):
+    assert await executor.run(os.getpid) != os.getpid()
+    assert await executor.run(pow, 2, 10) == 1024
+    assert executor.pending == 0
+
+
+async def test_rejects_jobs_past_max_pending(executor):
+    running = [asyncio.ensure_future(executor.run(time.sleep, 0.5)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(ExecutorBusyError):
+        await executor.run(pow, 2, 2)
+    await asyncio.gather(*running)
+    assert await executor.run(pow, 2, 2) == 4
+
+
+async def test_timeout_keeps_the_slot_until_the_worker_finishes(executor):
+    with pytest.raises(JobTimeoutError):
+        await executor.run(time.sleep, 0.5, timeout=0.05)
+    assert executor.pending == 1
+
+    await executor.run(pow, 2, 2)
+    assert executor.pending == 0
+
+
+async def test_replaces_the_pool_after_a_worker_dies(executor):
+    with pytest.raises(BrokenProcessPool):
+        await executor.run(os._exit, 1)
+
+    assert await executor.run(pow, 3, 2) == 9
@@ -0,0 +1,23 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "reportlab", "pyarrow"]
+
+PROBE = f"""
+import json, sys
+import server
+print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))
+"""
+
+
+def test_server_starts_without_the_analysis_stack():
+    env = {**os.environ, "MONGO_URL": "mongodb://localhost:27017", "DB_NAME": "test"}
+    result = subprocess.run([sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
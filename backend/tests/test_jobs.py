@@ -0,0 +1,130 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from utils import jobs
+from utils.executor import ExecutorBusyError
+from utils.jobs import (JOB_COMPLETED, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JobWorker, job_progress_reporter,
+                        job_status, new_job_doc, utc_now)
+
+pytestmark = pytest.mark.anyio
+
+
+async def wait_for_status(db, job_id, status, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job = await db.jobs.find_one({"id": job_id}, {"_id": 0})
+        if job["status"] == status:
+            return job
+        assert asyncio.get_running_loop().time() < deadline, f"job stayed {job['status']}"
+        await asyncio.sleep(0.01)
+
+
+async def run_worker(db, handler, job, status, **options):
+    await db.jobs.insert_one(job)
+    worker = JobWorker(db, handler, poll_interval=0.01, **options)
+    worker.start()
+    try:
+        return await wait_for_status(db, job["id"], status)
+    finally:
+        await worker.stop()
+
+
+def test_job_status_reports_percent_complete():
+    job = new_job_doc("dataset", "user")
+    job["progress"].update(parse="done", summary="done", health_score="running")
+
+    status = job_status(job)
+    assert status["status"] == JOB_QUEUED
+    assert status["percent_complete"] == round(2 / len(jobs.ANALYSIS_STAGES) * 100, 2)
+
+
+async def test_worker_completes_a_queued_job(db):
+    async def handler(job):
+        return f"report-for-{job['dataset_id']}"
+
+    job = await run_worker(db, handler, new_job_doc("d1", "u1"), JOB_COMPLETED)
+    assert job["report_id"] == "report-for-d1"
+    assert job["attempts"] == 1 and job["lease_expires_at"] is None
+    assert job_status(job)["percent_complete"] == 100
+
+
+async def test_failed_handler_marks_the_job_failed(db):
+    async def handler(job):
+        raise ValueError("bad file")
+
+    job = await run_worker(db, handler, new_job_doc("d1", "u1"), JOB_FAILED)
+    assert job["error"] == "bad file"
+
+
+async def test_expired_lease_is_claimed_again(db):
+    job = new_job_doc("d1", "u1")
+    job.update(status=JOB_RUNNING, worker_id="dead", attempts=1,
+               lease_expires_at=(utc_now() - timedelta(seconds=1)).isoformat())
+
+    async def handler(job):
+        return "r1"
+
+    job = await run_worker(db, handler, job, JOB_COMPLETED)
+    assert job["attempts"] == 2 and job["worker_id"] != "dead"
+
+
+async def test_job_past_max_attempts_fails(db):
+    job = new_job_doc("d1", "u1")
+    job["attempts"] = 3
+
+    async def handler(job):
+        return "r1"
+
+    job = await run_worker(db, handler, job, JOB_FAILED, max_attempts=3)
+    assert "maximum number of attempts" in job["error"]
+
+
+async def test_busy_executor_requeues_the_job(db):
+    calls = []
+
+    async def handler(job):
+        calls.append(job["attempts"])
+        if len(calls) == 1:
+            raise ExecutorBusyError("busy")
+        return "r1"
+
+    job = await run_worker(db, handler, new_job_doc("d1", "u1"), JOB_COMPLETED)
+    assert calls == [1, 1]
+    # A busy pool does not use up an attempt.
+    assert job["attempts"] == 1 and job["report_id"] == "r1"
+
+
+async def test_lease_renewal_survives_errors(db):
+    class FlakyJobs:
+        calls = 0
+
+        async def update_one(self, *args, **kwargs):
+            FlakyJobs.calls += 1
+            if FlakyJobs.calls <= 2:
+                raise ConnectionError("mongo down")
+
+    class FlakyDb:
+        jobs = FlakyJobs()
+
+    renew = asyncio.ensure_future(JobWorker(FlakyDb(), None, lease_seconds=0.03)._renew_lease("j1"))
+    await asyncio.sleep(0.1)
+    assert not renew.done() and FlakyJobs.calls > 2
+    renew.cancel()
+
+
+def test_progress_writes_stop_after_a_failure(monkeypatch):
+    writes = []
+
+    class FailingJobs:
+        def update_one(self, query, update):
+            writes.append(update)
+            raise ConnectionError("mongo down")
+
+    monkeypatch.setattr(jobs, "_sync_db", type("Db", (), {"jobs": FailingJobs()})())
+    report = job_progress_reporter("j1")
+    report("parse", "running")
+    report("parse", "done")
+
+    assert len(writes) == 1
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from utils.loader import ColumnSelectionError, optimize_frame, select_columns
+from utils.tasks import load_dataset
+
+
+def test_select_columns_keeps_file_order():
+    available = ["id", "amount", "region"]
+
+    assert select_columns(available, None) is None
+    assert select_columns(available, []) is None
+    assert select_columns(available, ["region", "id"]) == ["id", "region"]
+
+
+def test_select_columns_lists_missing_columns():
+    with pytest.raises(ColumnSelectionError, match="not found in dataset: price, qty$"):
+        select_columns(["id", "amount"], ["price", "amount", "qty"])
+
+
+def test_optimize_frame_converts_dtypes(frame):
+    source = frame.copy()
+    df, loaded = optimize_frame(frame)
+
+    assert loaded["source_dtypes"] == {
+        "id": "int64", "amount": "float64", "count": "int64",
+        "region": "object", "signup_date": "object", "label": "object",
+    }
+    memory = loaded["memory"]
+    assert set(memory["category_columns"]) == {"region", "signup_date", "label"}
+    assert "count" in memory["downcast_columns"]
+    assert isinstance(df["label"].dtype, pd.CategoricalDtype)
+    assert df["count"].dtype.itemsize == 1
+    assert 0 < memory["saved_pct"] < 100
+    assert memory["loaded_mb"] <= memory["default_dtypes_mb"]
+    # No value changes.
+    assert (df["count"].astype("int64") == source["count"]).all()
+    assert df["label"].astype(object).tolist() == source["label"].tolist()
+
+
+def test_unique_text_stays_string():
+    df, loaded = optimize_frame(pd.DataFrame({"name": [f"user {i}" for i in range(50)]}))
+
+    assert loaded["memory"]["string_columns"] == ["name"]
+    assert isinstance(df["name"].dtype, pd.StringDtype)
+
+
+def test_lossy_float_is_not_downcast():
+    df, loaded = optimize_frame(pd.DataFrame({"x": [0.1, 0.2], "y": [0.5, 1.25]}))
+
+    assert loaded["memory"]["downcast_columns"] == ["y"]
+    assert df["x"].dtype == "float64"
+
+
+def test_load_dataset_with_columns(tmp_path, frame):
+    source = tmp_path / "data.csv"
+    frame.to_csv(source, index=False)
+
+    df, loaded = load_dataset(source, "data.csv", ["label", "amount"])
+
+    assert list(df.columns) == ["label", "amount"]
+    assert loaded["source_dtypes"] == {"label": "object", "amount": "float64"}
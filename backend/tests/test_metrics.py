@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from utils.instrumentation import StageTimings
+from utils.metrics import AppMetrics, Counter, Histogram, RequestMetricsMiddleware
+
+
+def samples(metrics: AppMetrics, suffix: str):
+    # {labels: value} of the request histogram's lines ending in `suffix`.
+    name = f"dataguard_http_request_duration_seconds{suffix}"
+    return {line[len(name):].rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+            for line in metrics.render().splitlines() if line.startswith(name + "{")}
+
+
+def test_stage_timings_accumulate():
+    timings = StageTimings()
+    with timings.stage("parse"):
+        sum(range(100_000))
+    with timings.stage("mongo_insert", resources=False):
+        time.sleep(0.01)
+    timings.record("mongo_insert", 0.5)
+
+    stages = timings.as_dict()
+    assert list(stages) == ["parse", "mongo_insert"]
+    assert stages["parse"]["cpu_seconds"] is not None
+    assert stages["mongo_insert"]["cpu_seconds"] is None
+    assert stages["mongo_insert"]["wall_seconds"] >= 0.51
+
+
+def test_histogram_and_counter_render():
+    histogram = Histogram("latency", "Latency.", ["route"], buckets=(0.1, 1))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5, route="/a")
+    counter = Counter("cpu_total", "CPU.", ["stage"])
+    counter.inc(1.5, stage='say "hi"')
+
+    assert histogram.render()[2:] == [
+        'latency_bucket{route="/a",le="0.1"} 1',
+        'latency_bucket{route="/a",le="1"} 2',
+        'latency_bucket{route="/a",le="+Inf"} 3',
+        'latency_sum{route="/a"} 5.55',
+        'latency_count{route="/a"} 3',
+    ]
+    assert counter.render()[2:] == ['cpu_total{stage="say \\"hi\\""} 1.5']
+
+
+def test_observe_timings():
+    metrics = AppMetrics()
+    metrics.observe_timings({"parse": {"wall_seconds": 0.2, "cpu_seconds": 0.1, "peak_memory_mb": 2.0}})
+
+    text = metrics.render()
+    assert 'dataguard_stage_duration_seconds_count{stage="parse"} 1' in text
+    assert 'dataguard_stage_cpu_seconds_total{stage="parse"} 0.1' in text
+
+
+@pytest.fixture
+def app_metrics():
+    metrics = AppMetrics()
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware, metrics=metrics)
+
+    @app.get("/stream/{name}")
+    async def stream(name: str):
+        async def body():
+            for _ in range(3):
+                await asyncio.sleep(0.05)
+                yield b"x"
+        return StreamingResponse(body())
+
+    @app.get("/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    return TestClient(app, raise_server_exceptions=False), metrics
+
+
+def test_requests_are_timed_until_the_body_is_sent(app_metrics):
+    client, metrics = app_metrics
+    assert client.get("/stream/a").text == "xxx"
+    client.get("/stream/b")
+
+    labels = '{method="GET",route="/stream/{name}",status="200"}'
+    assert samples(metrics, "_count")[labels] == 2
+    assert samples(metrics, "_sum")[labels] >= 0.3
+
+
+def test_failed_and_unmatched_requests_are_counted(app_metrics):
+    client, metrics = app_metrics
+    assert client.get("/fail").status_code == 500
+    assert client.get("/missing").status_code == 404
+
+    counts = samples(metrics, "_count")
+    assert counts['{method="GET",route="/fail",status="500"}'] == 1
+    assert counts['{method="GET",route="unmatched",status="404"}'] == 1
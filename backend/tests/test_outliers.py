@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.outliers import (MAD_SCALE, MEAN_AD_SCALE, OutlierSettingsError, detect_outliers, outlier_settings,
+                            parse_column_thresholds, sketch_outliers)
+from utils.sketches import QuantileSketch
+
+
+@pytest.fixture
+def numeric():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "normal": rng.normal(0, 1, 1000),
+        "skewed": rng.lognormal(0, 1, 1000),
+        "ints": rng.integers(0, 5, 1000).astype(float),
+    })
+    df.loc[::9, "normal"] = np.nan
+    df.loc[3, "normal"] = 25.0
+    return df
+
+
+def test_iqr_bounds_match_pandas_quantiles(numeric):
+    result = detect_outliers(numeric, outlier_settings("iqr"))
+
+    for col in numeric.columns:
+        series = numeric[col].dropna()
+        q1, q3 = series.quantile(0.25), series.quantile(0.75)
+        lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        assert result[col]["q1"] == pytest.approx(q1)
+        assert result[col]["q3"] == pytest.approx(q3)
+        assert result[col]["lower_bound"] == pytest.approx(lower)
+        assert result[col]["upper_bound"] == pytest.approx(upper)
+        assert result[col]["outlier_count"] == ((series < lower) | (series > upper)).sum()
+        assert (result[col]["min"], result[col]["max"]) == (series.min(), series.max())
+
+
+def test_mad_bounds_match_pandas(numeric):
+    result = detect_outliers(numeric, outlier_settings("mad", column_thresholds={"skewed": 5}))
+
+    for col, threshold in (("normal", 3.5), ("skewed", 5.0)):
+        series = numeric[col].dropna()
+        median = series.median()
+        mad = (series - median).abs().median()
+        assert result[col]["median"] == pytest.approx(median)
+        assert result[col]["mad"] == pytest.approx(mad)
+        assert result[col]["upper_bound"] == pytest.approx(median + threshold * mad / MAD_SCALE)
+        robust_z = MAD_SCALE * (series - median).abs() / mad
+        assert result[col]["outlier_count"] == (robust_z > threshold).sum()
+
+
+def test_zero_mad_falls_back_to_the_mean_deviation():
+    df = pd.DataFrame({"mostly_zero": [0.0] * 95 + [1.0, 2.0, 3.0, 4.0, 50.0]})
+    result = detect_outliers(df, outlier_settings("mad"))["mostly_zero"]
+
+    # Mean absolute deviation 0.6, so the bounds are +-3.5 * 0.6 / 0.7979.
+    assert result["mad"] == 0
+    assert result["upper_bound"] == pytest.approx(3.5 * 0.6 / MEAN_AD_SCALE)
+    assert result["outlier_count"] == 3
+
+
+def test_empty_and_all_null_columns():
+    assert detect_outliers(pd.DataFrame(), outlier_settings()) == {}
+    result = detect_outliers(pd.DataFrame({"a": [np.nan, np.nan], "b": [1.0, 2.0]}), outlier_settings())
+    assert result["a"]["outlier_count"] == 0 and np.isnan(result["a"]["lower_bound"])
+
+
+def test_sketch_bounds_match_exact_bounds_below_k(numeric):
+    sketch = QuantileSketch()
+    sketch.update(numeric["normal"].to_numpy())
+
+    for method in ("iqr", "mad"):
+        settings = outlier_settings(method)
+        exact = detect_outliers(numeric[["normal"]], settings)["normal"]
+        estimate = sketch_outliers(sketch, settings, "normal")
+        assert estimate["lower_bound"] == pytest.approx(exact["lower_bound"])
+        assert estimate["upper_bound"] == pytest.approx(exact["upper_bound"])
+        assert estimate["outlier_count"] == exact["outlier_count"]
+
+
+def test_settings_validation():
+    assert outlier_settings() == {"method": "iqr", "threshold": 1.5, "column_thresholds": {}}
+    assert parse_column_thresholds('{"price": 3}') == {"price": 3}
+    with pytest.raises(OutlierSettingsError):
+        outlier_settings("zscore")
+    with pytest.raises(OutlierSettingsError):
+        outlier_settings("iqr", threshold=0)
+    with pytest.raises(OutlierSettingsError):
+        outlier_settings("iqr", column_thresholds={"price": True})
@@ -0,0 +1,76 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utils.indexes import INDEXES, ensure_indexes
+from utils.pagination import InvalidCursorError, decode_cursor, encode_cursor, paginate
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+async def add_datasets(db, count, user_id="u1"):
+    # Pairs share an upload_date, so the id tie-break is exercised.
+    await db.datasets.insert_many([
+        {"id": f"d{i:03d}", "user_id": user_id, "name": f"file{i}.csv",
+         "upload_date": (START + timedelta(minutes=i // 2)).isoformat()}
+        for i in range(count)
+    ])
+
+
+def test_cursor_round_trip():
+    value = START.isoformat()
+
+    assert decode_cursor(encode_cursor(value, "d001")) == (value, "d001")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    raw_cursor(["2024-01-01T00:00:00+00:00"]),
+    raw_cursor([{"$gt": ""}, "d001"]),
+    raw_cursor(["2024-01-01T00:00:00+00:00", {"$ne": None}]),
+    raw_cursor([1704067200, "d001"]),
+    raw_cursor(["yesterday", "d001"]),
+])
+def test_bad_cursors(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+async def test_pages_cover_every_document_once(db):
+    await add_datasets(db, 25)
+    await add_datasets(db, 3, user_id="u2")
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page, cursor = await paginate(db.datasets, {"user_id": "u1"}, "upload_date", 10, cursor)
+        seen.extend(doc["id"] for doc in page)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == [f"d{i:03d}" for i in reversed(range(25))]
+
+
+async def test_projection_keeps_the_cursor_fields(db):
+    await add_datasets(db, 3)
+
+    page, cursor = await paginate(db.datasets, {"user_id": "u1"}, "upload_date", 2, projection={"name": 1})
+    assert page == [{"name": "file2.csv", "upload_date": page[0]["upload_date"], "id": "d002"},
+                    {"name": "file1.csv", "upload_date": page[1]["upload_date"], "id": "d001"}]
+    assert decode_cursor(cursor) == (page[1]["upload_date"], "d001")
+
+
+async def test_ensure_indexes(db):
+    assert await ensure_indexes(db) == []
+
+    names = set(await db.datasets.index_information())
+    assert {model.document["name"] for model in INDEXES["datasets"]} <= names
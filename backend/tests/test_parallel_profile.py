@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+from utils.data_analyzer import DataQualityAnalyzer
+from utils.parallel_profile import partition_columns
+from utils.serialization import dumps
+
+
+@pytest.fixture
+def wide(frame):
+    # Wide enough for DataQualityAnalyzer.PARALLEL_MIN_COLUMNS.
+    return pd.concat([frame.add_suffix(f"_{i}") for i in range(6)], axis=1)
+
+
+def test_partitions_cover_every_column_once():
+    for columns, parts in ((10, 3), (32, 8), (5, 8), (1, 1)):
+        partitions = partition_columns(columns, parts)
+        assert [i for part in partitions for i in part] == list(range(columns))
+        assert len(partitions) <= parts
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_parallel_report_equals_the_serial_report(wide, mode):
+    assert len(wide.columns) >= DataQualityAnalyzer.PARALLEL_MIN_COLUMNS
+    serial = DataQualityAnalyzer(wide).generate_full_report()
+    parallel = DataQualityAnalyzer(wide, profile_workers=2, profile_mode=mode).generate_full_report()
+
+    assert dumps(parallel) == dumps(serial)
@@ -0,0 +1,40 @@
+import asyncio
+import threading
+
+import pytest
+
+from utils.passwords import PasswordHasher
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def hasher():
+    # The lowest cost bcrypt accepts keeps the tests fast.
+    hasher = PasswordHasher(rounds=4, max_workers=2)
+    yield hasher
+    hasher.shutdown()
+
+
+async def test_hash_and_verify(hasher):
+    hashed = await hasher.hash("s3cret")
+
+    assert hashed.startswith("$2b$04$")
+    assert await hasher.verify("s3cret", hashed)
+    assert not await hasher.verify("wrong", hashed)
+
+
+async def test_hashing_runs_off_the_event_loop(hasher, monkeypatch):
+    threads = []
+    hash_sync = hasher.hash_sync
+    monkeypatch.setattr(hasher, "hash_sync", lambda password: threads.append(threading.current_thread()) or
+                        hash_sync(password))
+
+    await asyncio.gather(*(hasher.hash("pw") for _ in range(4)))
+    assert threads and all(thread.name.startswith("bcrypt") for thread in threads)
+
+
+def test_needs_rehash(hasher):
+    assert not hasher.needs_rehash(hasher.hash_sync("pw"))
+    assert PasswordHasher(rounds=5).needs_rehash(hasher.hash_sync("pw"))
+    assert not hasher.needs_rehash("not a bcrypt hash")
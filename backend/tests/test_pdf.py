@@ -0,0 +1,47 @@
+import sys
+
+from reportlab.graphics.shapes import Rect
+from reportlab.lib import colors
+
+from utils.data_analyzer import DataQualityAnalyzer
+from utils.pdf_charts import column_percentage_chart, health_score_bar
+from utils.sampling import annotate_sampled_report
+from utils.tasks import PDF_SECTIONS, render_pdf, render_pdf_timed
+
+
+def bar_widths(drawing):
+    return [shape.width for shape in drawing.contents if isinstance(shape, Rect)]
+
+
+def test_health_score_bar_is_clamped():
+    track, fill = bar_widths(health_score_bar(150, "Excellent"))
+    assert fill == track
+    track, fill = bar_widths(health_score_bar(-5, "Poor"))
+    assert fill == 0
+
+
+def test_column_chart_draws_the_largest_columns_first():
+    items = [{"column": f"col{i}", "percentage": i} for i in range(20)]
+    drawing = column_percentage_chart(items, colors.red, max_columns=5)
+
+    widths = bar_widths(drawing)
+    tracks, bars = widths[0::2], widths[1::2]
+    assert len(bars) == 5
+    assert bars == sorted(bars, reverse=True)
+    assert bars[0] == tracks[0] * 19 / 100
+
+
+def test_render_pdf(frame):
+    report = DataQualityAnalyzer(frame).generate_full_report()
+
+    pdf, timings = render_pdf_timed({key: report[key] for key in PDF_SECTIONS if key in report}, "frame.csv")
+    assert pdf.startswith(b"%PDF") and b"%%EOF" in pdf[-32:]
+    assert "pdf_render" in timings
+    assert "matplotlib" not in sys.modules
+
+
+def test_render_pdf_of_a_sampled_report(frame):
+    report = DataQualityAnalyzer(frame.head(50)).generate_full_report()
+    report = annotate_sampled_report(report, 50, len(frame), "reservoir")
+
+    assert render_pdf(report, "frame.csv").startswith(b"%PDF")
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from utils.outliers import outlier_settings
+from utils.report_cache import ReportCache, cache_key
+from utils.report_payloads import ReportPayloadStore
+from utils.tasks import ANALYZER_VERSION, analysis_config
+
+pytestmark = pytest.mark.anyio
+
+REPORT = {"summary": {"total_rows": 3, "total_columns": 1, "numeric_summary": {}},
+          "health_score": 90.0, "duplicates": {"full_row_duplicates": 0, "duplicate_row_samples": []}}
+
+
+@pytest.fixture
+def cache(db):
+    return ReportCache(db, ReportPayloadStore(db))
+
+
+def test_cache_key_depends_on_content_version_and_config():
+    config = analysis_config()
+    key = cache_key("abc", ANALYZER_VERSION, config)
+
+    assert key == cache_key("abc", ANALYZER_VERSION, dict(reversed(list(config.items()))))
+    assert key != cache_key("abd", ANALYZER_VERSION, config)
+    assert key != cache_key("abc", ANALYZER_VERSION + "-next", config)
+    assert key != cache_key("abc", ANALYZER_VERSION, analysis_config(outlier_settings("mad")))
+
+
+async def test_miss_then_hit(cache, db):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return dict(REPORT)
+
+    first, cached = await cache.get_or_compute("k1", compute, {"content_hash": "abc"})
+    assert not cached and first == REPORT
+    second, cached = await cache.get_or_compute("k1", compute, {"content_hash": "abc"})
+    assert cached and second == REPORT
+    assert len(calls) == 1
+
+    entry = await db.report_cache.find_one({"key": "k1"})
+    assert entry["content_hash"] == "abc" and entry["summary"]["health_score"] == 90.0
+
+
+async def test_concurrent_misses_compute_once(cache):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return dict(REPORT)
+
+    results = await asyncio.gather(*(cache.get_or_compute("k1", compute, {}) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert [cached for _, cached in results].count(False) == 1
+    assert all(report == REPORT for report, _ in results)
+
+
+async def test_failed_computation_is_not_cached(cache):
+    async def fail():
+        raise RuntimeError("parse error")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compute("k1", fail, {})
+    assert await cache.get("k1") is None
+
+
+async def test_partial_load_of_a_cached_report(cache):
+    await cache.put("k1", REPORT, {})
+
+    assert await cache.get("k1", sections=["health_score"]) == {"health_score": 90.0}
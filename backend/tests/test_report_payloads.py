@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from utils.report_payloads import ReportPayloadStore, join_report, report_summary, split_report, with_detached
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def report():
+    rng = np.random.default_rng(0)
+    return {
+        "summary": {"total_rows": 1000, "numeric_summary": {f"col{i}": {"mean": float(rng.random())} for i in range(200)},
+                    "total_columns": 200},
+        "health_score": 87.5,
+        "duplicates": {"full_row_duplicates": 3, "duplicate_row_samples": [{"a": i} for i in range(50)],
+                       "column_duplicates": []},
+        "outliers": {"details": [{"column": f"col{i}", "noise": rng.random(40).tolist()} for i in range(200)]},
+    }
+
+
+def test_split_and_join_keep_field_order(report):
+    sections = split_report(report)
+
+    assert sections["summary"]["numeric_summary"] is None
+    assert "duplicates.duplicate_row_samples" in sections
+    joined = join_report(sections)
+    assert joined == report
+    assert list(joined["summary"]) == list(report["summary"])
+
+
+def test_join_without_detached_fields_drops_them(report):
+    sections = split_report(report)
+    del sections["summary.numeric_summary"]
+
+    assert "numeric_summary" not in join_report(sections)["summary"]
+
+
+def test_with_detached():
+    assert with_detached(["summary", "health_score"]) == ["summary", "health_score", "summary.numeric_summary"]
+
+
+async def test_chunked_round_trip(db, report):
+    store = ReportPayloadStore(db, chunk_bytes=1024)
+    await store.put("p1", report)
+
+    assert await db.report_sections.count_documents({"payload_id": "p1", "n": {"$gt": 0}}) > 0
+    loaded = await store.get("p1")
+    assert loaded == report
+    assert list(loaded) == list(report)
+
+
+async def test_rewrite_is_idempotent(db, report):
+    store = ReportPayloadStore(db, chunk_bytes=1024)
+    await store.put("p1", report)
+    documents = await db.report_sections.count_documents({})
+    await store.put("p1", report)
+
+    assert await db.report_sections.count_documents({}) == documents
+    assert await store.get("p1") == report
+
+
+async def test_partial_load(db, report):
+    store = ReportPayloadStore(db, chunk_bytes=1024)
+    await store.put("p1", report)
+
+    assert await store.get("p1", ["health_score"]) == {"health_score": 87.5}
+    summary = (await store.get("p1", ["summary"]))["summary"]
+    assert "numeric_summary" not in summary and summary["total_rows"] == 1000
+    assert (await store.get("p1", with_detached(["summary"])))["summary"] == report["summary"]
+    assert await store.get("missing") is None
+
+
+def test_report_summary(report):
+    assert report_summary(report) == {"health_score": 87.5, "approximate": False,
+                                      "total_rows": 1000, "total_columns": 200}
+
+
+async def test_deleting_the_last_dataset_drops_its_cached_report(server, db, monkeypatch, tmp_path, report):
+    from utils.report_cache import ReportCache
+
+    cache = ReportCache(db, ReportPayloadStore(db))
+    monkeypatch.setattr(server, "db", db)
+    monkeypatch.setattr(server, "report_cache", cache)
+    await cache.put("k1", report, {})
+    for dataset_id in ("d1", "d2"):
+        path = tmp_path / f"{dataset_id}.csv"
+        path.write_text("a\n1\n")
+        await db.datasets.insert_one({"id": dataset_id, "user_id": "u1", "filename": "a.csv", "file_path": str(path)})
+        await db.reports.insert_one({"id": f"r{dataset_id}", "dataset_id": dataset_id, "user_id": "u1",
+                                     "cache_key": "k1", "payload_id": "k1"})
+
+    await server.delete_dataset("d1", current_user={"id": "u1"})
+    assert await cache.get("k1") == report
+
+    await server.delete_dataset("d2", current_user={"id": "u1"})
+    assert await db.report_cache.count_documents({}) == 0
+    assert await db.report_sections.count_documents({}) == 0
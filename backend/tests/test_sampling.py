@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data_analyzer import DataQualityAnalyzer
+from utils.sampling import SamplingError, annotate_sampled_report, proportion_interval, reservoir_sample
+
+
+def chunks(df, size):
+    return [df.iloc[start:start + size] for start in range(0, len(df), size)]
+
+
+@pytest.fixture
+def population():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"row": np.arange(10_000), "group": rng.choice(["a", "b", "c"], 10_000, p=[0.7, 0.25, 0.05])})
+
+
+def test_sample_is_seeded_and_independent_of_chunking(population):
+    sample, seen = reservoir_sample(chunks(population, 1000), 500, seed=3)
+    again, _ = reservoir_sample(chunks(population, 1000), 500, seed=3)
+
+    assert seen == len(population)
+    assert len(sample) == 500 and sample["row"].is_unique
+    assert sample["row"].is_monotonic_increasing
+    pd.testing.assert_frame_equal(sample, again)
+    assert list(sample.columns) == list(population.columns)
+
+
+def test_small_population_is_kept_whole(population):
+    sample, seen = reservoir_sample(chunks(population.head(50), 20), 500, seed=1)
+
+    assert seen == 50
+    pd.testing.assert_frame_equal(sample, population.head(50))
+
+
+def test_stratified_sample_allocates_by_stratum_size(population):
+    sample, _ = reservoir_sample(chunks(population, 999), 1000, seed=2, stratify_by="group")
+
+    expected = (population["group"].value_counts(normalize=True) * 1000).round()
+    assert sample["group"].value_counts().to_dict() == expected.astype(int).to_dict()
+
+
+def test_unknown_stratum_column(population):
+    with pytest.raises(SamplingError):
+        reservoir_sample(chunks(population, 1000), 100, stratify_by="missing")
+
+
+def test_wilson_interval():
+    low, high = proportion_interval(10, 100)
+    assert low < 10 < high
+    assert (low, high) == pytest.approx((5.52, 17.44), abs=0.01)
+
+    # The finite population correction narrows the interval...
+    corrected = proportion_interval(10, 100, population=200)
+    assert low < corrected[0] and corrected[1] < high
+    # ...down to nothing for a census.
+    assert proportion_interval(10, 100, population=100) == (10.0, 10.0)
+    assert proportion_interval(0, 0) == (0.0, 100.0)
+
+
+def test_annotated_report(frame):
+    report = DataQualityAnalyzer(frame.head(100)).generate_full_report()
+    report = annotate_sampled_report(report, 100, 1000, "reservoir")
+
+    assert report["approximate"] is True
+    assert report["sampling"]["population_rows"] == 1000
+    for item in report["missing_values"]["details"]:
+        low, high = item["confidence_interval"]
+        assert low <= item["percentage"] <= high
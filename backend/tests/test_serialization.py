@@ -0,0 +1,89 @@
+import json
+
+import numpy as np
+import orjson
+import pandas as pd
+import pytest
+
+from utils.serialization import _chunked, dumps, iter_json, select_fields, stringify_keys
+from utils.tasks import REPORT_FIELDS, analyze_file, analyze_sample
+
+REPORT = {
+    "report_data": {
+        "summary": {"total_rows": np.int64(3), "mean": np.float32(1.5), 7: "int key"},
+        "missing_values": {"details": [{"column": "a", "first_seen": pd.NaT, "value": pd.NA}]},
+        "labels": {"yes", "no"},
+        "created": pd.Timestamp("2024-03-01 12:00"),
+        "empty": {},
+    },
+    "values": np.arange(3),
+}
+
+
+def test_dumps_encodes_pandas_and_numpy_values():
+    decoded = json.loads(dumps(REPORT))
+
+    assert decoded["report_data"]["summary"] == {"total_rows": 3, "mean": 1.5, "7": "int key"}
+    assert decoded["report_data"]["missing_values"]["details"][0] == {"column": "a", "first_seen": None, "value": None}
+    assert sorted(decoded["report_data"]["labels"]) == ["no", "yes"]
+    assert decoded["report_data"]["created"] == "2024-03-01T12:00:00"
+    assert decoded["values"] == [0, 1, 2]
+
+
+def test_dumps_rejects_unknown_types():
+    with pytest.raises(orjson.JSONEncodeError):
+        dumps({"value": object()})
+
+
+@pytest.mark.parametrize("depth", [0, 1, 3, 10])
+def test_streamed_json_equals_dumps(depth):
+    assert b"".join(iter_json(REPORT, depth)) == dumps(REPORT)
+
+
+def test_chunks_reach_the_chunk_size():
+    pieces = [b"x" * 10] * 25
+
+    chunks = list(_chunked(pieces, 64))
+
+    assert b"".join(chunks) == b"x" * 250
+    assert [len(chunk) for chunk in chunks] == [70, 70, 70, 40]
+
+
+def test_select_fields_keeps_report_order():
+    report = {"summary": 1, "health_score": 2, "outliers": 3}
+
+    assert select_fields(report, None) is report
+    assert select_fields(report, ["outliers", "summary"]) == {"summary": 1, "outliers": 3}
+
+
+def test_stringify_keys():
+    assert stringify_keys({1: [{2.5: "a"}], "b": {None: 0}}) == {"1": [{"2.5": "a"}], "b": {"None": 0}}
+
+
+def test_report_fields_cover_every_report_key(tmp_path, frame):
+    source = tmp_path / "data.csv"
+    frame.to_csv(source, index=False)
+    version = {"file_path": str(source), "filename": "data.csv"}
+
+    full = analyze_file(str(source), "data.csv")
+    sampled = analyze_sample([version], size=50)
+
+    assert set(full) | set(sampled) <= set(REPORT_FIELDS)
+    assert {"memory", "timings", "approximate", "sampling"} <= set(full) | set(sampled)
+
+
+def test_field_selection(server):
+    assert server.field_selection(None) is None
+    assert server.field_selection("summary, health_score,") == ["summary", "health_score"]
+
+
+@pytest.mark.parametrize("fields, detail", [
+    (" , ", "fields must name at least one report section"),
+    ("summary,colour,size", "Unknown report fields: colour, size"),
+])
+def test_field_selection_rejects(server, fields, detail):
+    with pytest.raises(server.HTTPException) as error:
+        server.field_selection(fields)
+
+    assert error.value.status_code == 400
+    assert error.value.detail == detail
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.sketches import DistinctCounter, HeavyHitters, Moments, QuantileSketch, RowHashCounter
+
+
+def chunks(values, size):
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+def random_hashes(n, seed=0):
+    return np.random.default_rng(seed).integers(0, 2 ** 63, n, dtype=np.int64).astype(np.uint64) * np.uint64(2)
+
+
+def test_quantiles_are_exact_below_k():
+    values = np.random.default_rng(0).normal(size=1000)
+    sketch = QuantileSketch(k=2048)
+    sketch.update(values)
+
+    assert sketch.is_exact
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        assert sketch.quantile(q) == pytest.approx(np.quantile(values, q))
+
+
+def test_merged_quantiles_match_a_single_pass():
+    values = np.random.default_rng(1).normal(size=50_000)
+    single = QuantileSketch(k=256)
+    single.update(values)
+    merged = QuantileSketch(k=256)
+    for chunk in chunks(values, 7_000):
+        part = QuantileSketch(k=256)
+        part.update(chunk)
+        merged.merge(part)
+
+    assert merged.count == single.count == len(values)
+    for q in (0.05, 0.25, 0.5, 0.75, 0.95):
+        # Rank error, not value error, is what the sketch bounds.
+        assert abs((values < merged.quantile(q)).mean() - q) < 0.02
+        assert abs((values < single.quantile(q)).mean() - q) < 0.02
+
+
+def test_heavy_hitters_are_exact_until_they_overflow():
+    values = pd.Series(np.random.default_rng(2).choice(list("abcdefgh"), 10_000))
+    counter = HeavyHitters(capacity=20)
+    for chunk in chunks(values, 999):
+        counter.update(chunk.value_counts())
+
+    assert not counter.overflowed
+    assert counter.value_counts().to_dict() == values.value_counts().to_dict()
+
+
+def test_distinct_counter_merge():
+    left, right = DistinctCounter(k=4096), DistinctCounter(k=4096)
+    left.update(pd.Series(range(0, 3000)))
+    right.update(pd.Series(range(2000, 5000)))
+    left.merge(right)
+
+    assert not left.is_exact
+    assert left.estimate() == pytest.approx(5000, rel=0.05)
+
+
+def test_moments_merge_matches_numpy():
+    values = np.random.default_rng(3).normal(5, 2, 10_000)
+    merged = Moments()
+    for chunk in chunks(values, 3_000):
+        part = Moments()
+        part.update(chunk)
+        merged.merge(part)
+
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.std == pytest.approx(values.std(ddof=1))
+
+
+def test_row_hashes_count_duplicates_exactly_within_capacity():
+    hashes = random_hashes(10_000)
+    hashes = np.concatenate([hashes, hashes[:1234]])
+    counter = RowHashCounter(capacity=1 << 20)
+    for chunk in chunks(hashes, 1000):
+        counter.update(chunk)
+
+    assert counter.is_exact
+    assert counter.total == len(hashes)
+    assert counter.duplicates() == 1234
+    assert counter.distinct() == 10_000
+
+
+def test_row_hash_merge_matches_a_single_pass():
+    hashes = random_hashes(50_000, seed=4)
+    hashes = np.concatenate([hashes, hashes[::7]])
+    np.random.default_rng(5).shuffle(hashes)
+    single = RowHashCounter(capacity=4096)
+    single.update(hashes)
+    merged = RowHashCounter(capacity=4096)
+    for chunk in chunks(hashes, 10_000):
+        part = RowHashCounter(capacity=4096)
+        part.update(chunk)
+        merged.merge(part)
+
+    assert merged.duplicates() == single.duplicates()
+    assert merged.total == single.total
+    assert merged.level == single.level > 0
+
+
+def test_row_hashes_stay_bounded_and_estimate_past_capacity():
+    hashes = random_hashes(200_000, seed=6)
+    hashes = np.concatenate([hashes, hashes[:20_000]])
+    counter = RowHashCounter(capacity=10_000)
+    for chunk in chunks(hashes, 25_000):
+        counter.update(chunk)
+
+    assert not counter.is_exact
+    assert len(counter.hashes) <= 10_000
+    assert counter.duplicates() == pytest.approx(20_000, rel=0.15)
+
+
+def test_row_hashes_without_duplicates():
+    counter = RowHashCounter(capacity=1000)
+    counter.update(random_hashes(50_000, seed=7))
+
+    assert counter.duplicates() == 0
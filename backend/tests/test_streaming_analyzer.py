@@ -0,0 +1,44 @@
+import io
+
+import pandas as pd
+import pytest
+
+from utils.data_analyzer import DataQualityAnalyzer
+from utils.streaming_analyzer import StreamingDataQualityAnalyzer
+
+
+def read_chunks(df, chunksize):
+    # The way uploads are streamed: read_csv re-infers dtypes per chunk.
+    return pd.read_csv(io.StringIO(df.to_csv(index=False)), chunksize=chunksize)
+
+
+def in_memory_report(df):
+    return DataQualityAnalyzer(pd.read_csv(io.StringIO(df.to_csv(index=False)))).generate_full_report()
+
+
+@pytest.mark.parametrize("chunksize", [7, 64, 1000])
+def test_exact_sections_match_the_in_memory_analyzer(frame, chunksize):
+    expected = in_memory_report(frame)
+    report = StreamingDataQualityAnalyzer(read_chunks(frame, chunksize)).generate_full_report()
+
+    assert report["summary"]["total_rows"] == expected["summary"]["total_rows"]
+    assert report["missing_values"] == expected["missing_values"]
+    for key in ("full_row_duplicates", "percentage"):
+        assert report["duplicates"][key] == expected["duplicates"][key]
+    assert report["duplicates"]["approximate"] is False
+    assert report["date_formats"] == expected["date_formats"]
+    assert report["class_imbalance"] == expected["class_imbalance"]
+
+
+@pytest.mark.parametrize("chunksize", [50, 500, 7000])
+def test_date_format_is_fixed_by_the_first_value(chunksize):
+    # The first value fixes %Y-%m-%d for the whole column, as pd.to_datetime
+    # does in one pass; a later chunk must not guess %m/%d/%Y for itself.
+    dates = ["2021-02-03"] * 3 + ["03/04/2021", "bad", None, "2021-13-01"] * 2000 + ["2020-01-01"] * 10
+    df = pd.DataFrame({"event_date": dates, "value": range(len(dates))})
+
+    expected = in_memory_report(df)["date_formats"]
+    report = StreamingDataQualityAnalyzer(read_chunks(df, chunksize)).generate_full_report()["date_formats"]
+
+    assert report == expected
+    assert report["details"][0]["invalid_dates"] == 6000
@@ -0,0 +1,63 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from utils.type_inference import merge_parse_counts, resolve_text_type, text_parse_counts
+
+
+@pytest.fixture(autouse=True)
+def quiet_date_parsing():
+    # Mixed-format columns make pd.to_datetime warn about falling back to dateutil.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        yield
+
+
+def test_numbers_stored_as_text():
+    counts = text_parse_counts(pd.Series(["1", "2.5", "-3", "4e2"]))
+
+    assert counts == {"values": 4, "numeric": 4, "datetime": 0, "sampled": False}
+    assert resolve_text_type(counts)["inferred_type"] == "numeric"
+
+
+def test_dates_with_a_stray_entry():
+    values = pd.Series(["2021-01-01"] * 19 + ["unknown"])
+    counts = text_parse_counts(values)
+
+    assert counts["datetime"] == 19
+    resolved = resolve_text_type(counts)
+    assert resolved["inferred_type"] is None
+    assert resolved["mostly_type"] == "datetime"
+    assert resolved["parse_success"]["datetime"] == 0.95
+
+
+def test_free_text_parses_as_nothing():
+    resolved = resolve_text_type(text_parse_counts(pd.Series(["north", "south", "east"])))
+
+    assert resolved["inferred_type"] is None and resolved["mostly_type"] is None
+    assert resolved["parse_success"] == {"numeric": 0.0, "datetime": 0.0}
+
+
+def test_large_columns_are_sampled_unless_every_sample_parses():
+    numbers = pd.Series([str(i) for i in range(5000)])
+    assert text_parse_counts(numbers, sample_size=100) == {"values": 5000, "numeric": 5000, "datetime": 0,
+                                                           "sampled": False}
+
+    mixed = pd.Series(["1", "x"] * 2500)
+    counts = text_parse_counts(mixed, sample_size=100)
+    assert counts["sampled"] is True
+    assert counts["numeric"] == pytest.approx(2500, rel=0.2)
+
+
+def test_one_stray_value_keeps_the_ratio_below_one():
+    counts = {"values": 100_000, "numeric": 99_999, "datetime": 0, "sampled": False}
+
+    assert resolve_text_type(counts)["parse_success"]["numeric"] == 0.9999
+
+
+def test_counts_of_chunks_add_up():
+    values = pd.Series(["1", "2", "2021-02-03", "x", "5", "2020-01-01"])
+    merged = merge_parse_counts(merge_parse_counts(None, text_parse_counts(values[:3])), text_parse_counts(values[3:]))
+
+    assert merged == {"values": 6, "numeric": 3, "datetime": 2, "sampled": False}
@@ -0,0 +1,99 @@
+import hashlib
+import io
+
+import pytest
+
+from utils.uploads import RequestBodyLimitMiddleware, UploadTooLargeError, file_sha256, stream_upload_to_disk
+
+pytestmark = pytest.mark.anyio
+
+CONTENT = b"a,b\n" + b"1,2\n" * 10_000
+
+
+class FakeUpload:
+    """The read() side of an UploadFile, recording the chunk sizes asked for."""
+
+    def __init__(self, data: bytes):
+        self.file = io.BytesIO(data)
+        self.reads = []
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads.append(size)
+        return self.file.read(size)
+
+
+async def test_copies_the_upload_in_chunks(tmp_path):
+    upload = FakeUpload(CONTENT)
+    dest = tmp_path / "data.csv"
+
+    size, digest = await stream_upload_to_disk(upload, dest, chunk_size=1024)
+
+    assert dest.read_bytes() == CONTENT
+    assert size == len(CONTENT)
+    assert digest == hashlib.sha256(CONTENT).hexdigest() == file_sha256(dest, chunk_size=100)
+    assert set(upload.reads) == {1024}
+
+
+async def test_oversized_upload_is_removed(tmp_path):
+    upload = FakeUpload(CONTENT)
+    dest = tmp_path / "data.csv"
+
+    with pytest.raises(UploadTooLargeError):
+        await stream_upload_to_disk(upload, dest, chunk_size=1024, max_bytes=4096)
+
+    assert not dest.exists()
+    # Stops reading once the limit is passed.
+    assert len(upload.reads) == 5
+
+
+async def test_empty_upload(tmp_path):
+    dest = tmp_path / "empty.csv"
+
+    assert await stream_upload_to_disk(FakeUpload(b""), dest, chunk_size=1024) == (0, hashlib.sha256().hexdigest())
+    assert dest.read_bytes() == b""
+
+
+@pytest.fixture
+def client():
+    from fastapi import FastAPI, File, UploadFile
+    from fastapi.testclient import TestClient
+
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.post("/upload")
+    @app.post("/batch")
+    async def upload(file: UploadFile = File(...)):
+        app.state.calls += 1
+        return {"size": len(await file.read())}
+
+    app.add_middleware(RequestBodyLimitMiddleware, max_bytes=4096, path_limits={"/batch": 0})
+    return TestClient(app)
+
+
+def test_body_within_the_limit(client):
+    response = client.post("/upload", files={"file": ("a.csv", CONTENT[:1000])})
+
+    assert response.status_code == 200 and response.json() == {"size": 1000}
+
+
+def test_declared_oversized_body_is_rejected_before_the_route(client):
+    response = client.post("/upload", files={"file": ("a.csv", CONTENT)})
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request body exceeds the limit of 4096 bytes"}
+    assert client.app.state.calls == 0
+
+
+def test_streamed_oversized_body_is_rejected(client):
+    body = b"--x\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.csv\"\r\n\r\n" + CONTENT + b"\r\n--x--\r\n"
+    chunks = iter([body[i:i + 1024] for i in range(0, len(body), 1024)])
+
+    response = client.post("/upload", content=chunks, headers={"Content-Type": "multipart/form-data; boundary=x"})
+
+    assert response.status_code == 413
+    assert client.app.state.calls == 0
+
+
+def test_path_limit_overrides_the_default(client):
+    assert client.post("/batch", files={"file": ("a.csv", CONTENT)}).json() == {"size": len(CONTENT)}
@@ -0,0 +1,55 @@
+from utils import user_cache as user_cache_module
+from utils.user_cache import UserCache
+
+
+def user(user_id, name="a"):
+    return {"id": user_id, "name": name, "email": f"{user_id}@example.com"}
+
+
+def test_hit_returns_a_copy():
+    cache = UserCache()
+    cache.put(user("u1"))
+
+    cached = cache.get("u1")
+    cached["name"] = "changed"
+    assert cache.get("u1") == user("u1")
+    assert cache.get("u2") is None
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(user_cache_module.time, "monotonic", lambda: now[0])
+    cache = UserCache(ttl_seconds=60)
+    cache.put(user("u1"))
+
+    now[0] += 59
+    assert cache.get("u1") is not None
+    now[0] += 2
+    assert cache.get("u1") is None
+
+
+def test_least_recently_used_is_evicted():
+    cache = UserCache(max_entries=2)
+    cache.put(user("u1"))
+    cache.put(user("u2"))
+    cache.get("u1")
+    cache.put(user("u3"))
+
+    assert cache.get("u2") is None
+    assert cache.get("u1") is not None and cache.get("u3") is not None
+
+
+def test_put_replaces_the_record():
+    cache = UserCache()
+    cache.put(user("u1"))
+    cache.put(user("u1", name="b"))
+
+    assert cache.get("u1")["name"] == "b"
+
+
+def test_zero_ttl_disables_the_cache():
+    cache = UserCache(ttl_seconds=0)
+    cache.put(user("u1"))
+
+    assert not cache.enabled
+    assert cache.get("u1") is None
@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+
+class PdfArtifactStore:
+    """Rendered report PDFs on local disk, keyed by report id.
+
+    Files are named `<report_id>.<etag>.pdf`, so the ETag survives restarts
+    without a separate index. An in-process LRU index, rebuilt from file
+    modification times at startup, keeps the total size under `max_bytes`
+    (0 disables eviction). Reports are immutable, so a stored PDF never goes
+    stale; it is only dropped by eviction or when its report is deleted.
+    """
+
+    def __init__(self, root, max_bytes: int = 0):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._index: "OrderedDict[str, Tuple[Path, str, int]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._load()
+
+    def _load(self):
+        entries = []
+        for path in self.root.glob("*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(entries):
+            report_id, _, etag = path.stem.rpartition(".")
+            self._add(report_id, path, etag, size)
+
+    def _add(self, report_id: str, path: Path, etag: str, size: int):
+        self._remove(report_id)
+        self._index[report_id] = (path, etag, size)
+        self.total_bytes += size
+
+    def _remove(self, report_id: str) -> Optional[Path]:
+        entry = self._index.pop(report_id, None)
+        if entry is None:
+            return None
+        self.total_bytes -= entry[2]
+        return entry[0]
+
+    def get(self, report_id: str) -> Optional[Tuple[Path, str]]:
+        entry = self._index.get(report_id)
+        if entry is None:
+            # Possibly written by another worker process sharing the directory.
+            path = next(self.root.glob(f"{report_id}.*.pdf"), None)
+            if path is None:
+                return None
+            try:
+                self._add(report_id, path, path.stem.rpartition(".")[2], path.stat().st_size)
+            except FileNotFoundError:
+                return None
+            entry = self._index[report_id]
+
+        path, etag, _ = entry
+        try:
+            # Touch so that a restart rebuilds the same LRU order.
+            os.utime(path)
+        except FileNotFoundError:
+            self._remove(report_id)
+            return None
+        self._index.move_to_end(report_id)
+        return path, etag
+
+    def _write(self, report_id: str, data: bytes) -> Tuple[Path, str]:
+        etag = hashlib.sha256(data).hexdigest()[:32]
+        path = self.root / f"{report_id}.{etag}.pdf"
+        tmp_path = self.root / f"{report_id}.{etag}.tmp"
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        return path, etag
+
+    def put(self, report_id: str, data: bytes) -> Tuple[Path, str]:
+        return self._commit(report_id, *self._write(report_id, data), len(data))
+
+    def _commit(self, report_id: str, path: Path, etag: str, size: int) -> Tuple[Path, str]:
+        old_path = self._remove(report_id)
+        if old_path is not None and old_path != path:
+            old_path.unlink(missing_ok=True)
+        self._add(report_id, path, etag, size)
+        self._evict()
+        return path, etag
+
+    def _evict(self):
+        # The most recently used entry always stays, even if it alone is too big.
+        while self.max_bytes and self.total_bytes > self.max_bytes and len(self._index) > 1:
+            report_id = next(iter(self._index))
+            path = self._remove(report_id)
+            path.unlink(missing_ok=True)
+
+    def delete(self, report_id: str):
+        self._remove(report_id)
+        for path in self.root.glob(f"{report_id}.*.pdf"):
+            path.unlink(missing_ok=True)
+
+    async def get_or_render(self, report_id: str, render: Callable[[], Awaitable[bytes]]) -> Tuple[Path, str]:
+        """Return (path, etag) of the report's PDF, rendering it on a miss.
+
+        Concurrent misses for the same report within this process share one render.
+        """
+        stored = self.get(report_id)
+        if stored is not None:
+            return stored
+
+        if report_id in self._in_flight:
+            return await asyncio.shield(self._in_flight[report_id])
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[report_id] = future
+        try:
+            data = await render()
+            # Only the file write leaves the event loop; the index is not thread-safe.
+            path, etag = await run_in_threadpool(self._write, report_id, data)
+            stored = self._commit(report_id, path, etag, len(data))
+            future.set_result(stored)
+            return stored
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody may be waiting; mark the exception as retrieved.
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._in_flight[report_id]
@@ -0,0 +1,97 @@
+import asyncio
+import hashlib
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Sequence
+
+
+class BatchError(ValueError):
+    pass
+
+
+def is_archive(filename: str) -> bool:
+    return filename.lower().endswith('.zip')
+
+
+def archive_members(path: Path, filename: str, max_bytes: int, max_ratio: float) -> List[str]:
+    """Files in a zip archive, without directories, hidden files and macOS resource forks.
+
+    Raises BatchError when the members together expand to more than
+    `max_bytes`, or one of them is compressed more than `max_ratio` times
+    (zip bombs). The sizes checked are the declared ones; reading a member
+    never yields more than its declared size (see extract_zip_member).
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            infos = [info for info in archive.infolist() if not info.is_dir()]
+    except zipfile.BadZipFile:
+        raise BatchError(f"{filename} is not a valid zip archive")
+    members = []
+    total = 0
+    for info in infos:
+        parts = PurePosixPath(info.filename).parts
+        if parts[0] == '__MACOSX' or parts[-1].startswith('.'):
+            continue
+        if info.compress_size and info.file_size / info.compress_size > max_ratio:
+            raise BatchError(f"{filename}: {info.filename} is compressed more than {max_ratio:g} times")
+        total += info.file_size
+        if total > max_bytes:
+            raise BatchError(f"{filename} expands to more than the limit of {max_bytes} bytes")
+        members.append(info.filename)
+    return members
+
+
+async def run_bounded(items: Sequence[Any], process: Callable[[int, Any], Awaitable[List[Dict[str, Any]]]],
+                      concurrency: int) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the results of process(index, item) for every item as each one finishes.
+
+    At most `concurrency` items are processed at once. Closing the
+    generator early (e.g. when the client disconnects) cancels the rest.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(index: int, item: Any) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await process(index, item)
+
+    tasks = [asyncio.create_task(bounded(index, item)) for index, item in enumerate(items)]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            for result in await finished:
+                yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def batch_summary(batch_id: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The last line of a batch response: totals and every item's health score, in upload order."""
+    results = sorted(results, key=lambda result: (result["index"], result.get("sheet") or ""))
+    datasets = [result["dataset"] for result in results if result["status"] == "ok"]
+    rows = sum(dataset["rows"] for dataset in datasets)
+    return {
+        "type": "summary",
+        "batch_id": batch_id,
+        "items": len(results),
+        "succeeded": len(datasets),
+        "failed": len(results) - len(datasets),
+        "total_rows": rows,
+        "mean_health_score": round(sum(d["health_score"] for d in datasets) / len(datasets), 2) if datasets else None,
+        # Weighted by rows, i.e. the score of the batch as a whole rather than of the average file.
+        "row_weighted_health_score": round(
+            sum(d["health_score"] * d["rows"] for d in datasets) / rows, 2) if rows else None,
+        "health_scores": [
+            {"source": result["source"], "sheet": result.get("sheet"), "status": result["status"],
+             "dataset_id": result["dataset"]["id"] if result["status"] == "ok" else None,
+             "health_score": result["dataset"]["health_score"] if result["status"] == "ok" else None}
+            for result in results
+        ],
+    }
+
+
+def sheet_content_hash(workbook_hash: str, sheet: str) -> str:
+    # Sheet files are written by pandas with timestamps in their metadata, so
+    # their bytes differ on every upload; the workbook's hash and the sheet
+    # name identify the content instead, so re-uploads hit the report cache.
+    return hashlib.sha256(f"{workbook_hash}\n{sheet}".encode('utf-8')).hexdigest()
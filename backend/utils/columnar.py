@@ -0,0 +1,94 @@
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Parsed uploads are cached as Parquet next to the original file so later
+# analyses skip CSV/Excel/JSON parsing. pyarrow is optional: without it every
+# analysis simply parses the original again. A file whose cache cannot be
+# written leaves a marker behind instead, so the write is not attempted (and
+# logged) again on every analysis; a different pyarrow version retries it.
+
+
+def _parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    return pq
+
+
+def columnar_path(file_path) -> Path:
+    return Path(f"{file_path}.parquet")
+
+
+def skip_marker_path(file_path) -> Path:
+    return Path(f"{columnar_path(file_path)}.skip")
+
+
+def write_columnar(df: "pd.DataFrame", file_path) -> Optional[Path]:
+    if _parquet() is None:
+        return None
+    import pyarrow
+    marker = skip_marker_path(file_path)
+    try:
+        if marker.read_text() == pyarrow.__version__:
+            return None
+    except OSError:
+        pass
+    path = columnar_path(file_path)
+    tmp_path = Path(f"{path}.tmp")
+    try:
+        df.to_parquet(tmp_path, engine='pyarrow', index=False)
+        tmp_path.replace(path)
+        marker.unlink(missing_ok=True)
+        return path
+    except Exception as e:
+        # e.g. mixed-type object columns or non-string column names.
+        tmp_path.unlink(missing_ok=True)
+        logger.warning(f"Could not write columnar cache for {file_path}, not retrying: {str(e)}")
+        try:
+            marker.write_text(pyarrow.__version__)
+        except OSError:
+            pass
+        return None
+
+
+def move_columnar(file_path, dest) -> None:
+    # Follow the file to `dest` when it is renamed.
+    for derived in (columnar_path, skip_marker_path):
+        source = derived(file_path)
+        if source.exists():
+            source.replace(derived(dest))
+
+
+def _string_dtype(arrow_type):
+    import pandas as pd
+    import pyarrow as pa
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+def read_columnar(file_path, columns: Optional[List[str]] = None,
+                  strings: bool = False) -> Optional["pd.DataFrame"]:
+    # With `strings`, text comes back as pyarrow-backed strings without
+    # creating a Python object per value.
+    pq = _parquet()
+    path = columnar_path(file_path)
+    if pq is None or not path.exists():
+        return None
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    return table.to_pandas(types_mapper=_string_dtype if strings else None)
+
+
+def columnar_columns(file_path) -> Optional[List[str]]:
+    pq = _parquet()
+    path = columnar_path(file_path)
+    if pq is None or not path.exists():
+        return None
+    return pq.read_schema(path).names
@@ -1,46 +1,218 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
-from sklearn.preprocessing import LabelEncoder
+from contextlib import nullcontext
+from typing import Dict, Any, List, Optional, Callable
+from utils.instrumentation import StageTimings
+from utils.type_inference import text_parse_counts, resolve_text_type
+from utils.outliers import detect_outliers, outlier_settings as default_outlier_settings
 import warnings
 warnings.filterwarnings('ignore')
 
+_HASH_MULTIPLIER = np.uint64(0x100000001B3)
+
+
+def _normalized_text(series: pd.Series) -> pd.Series:
+    return (
+        series.astype(str)
+        .str.strip()
+        .str.lower()
+        .replace({"nan": np.nan, "none": np.nan, "": np.nan})
+        .fillna("__missing__"))
+
+
+_MISSING_TEXT_HASH = pd.util.hash_array(np.array(["__missing__"], dtype=object))[0]
+
+
+def _normalized_text_hash(series: pd.Series) -> np.ndarray:
+    # Normalize and hash each distinct value once, then broadcast by code.
+    codes, uniques = pd.factorize(series)
+    unique_hashes = pd.util.hash_pandas_object(_normalized_text(pd.Series(uniques, dtype=object)), index=False).to_numpy()
+    return np.where(codes >= 0, unique_hashes[codes], _MISSING_TEXT_HASH).astype(np.uint64)
+
+
+def row_fingerprints(df: pd.DataFrame, normalize: bool = True) -> Optional[np.ndarray]:
+    """64-bit fingerprint per row, built one column at a time.
+
+    With `normalize`, id-like columns are skipped and text is compared
+    case- and whitespace-insensitively, matching check_duplicates. Numeric
+    columns are hashed as float64 so chunks of the same file that pandas
+    typed as int and float still agree. Returns None when no column is left
+    to compare, in which case no row counts as a duplicate.
+    """
+    fingerprints = np.zeros(len(df), dtype=np.uint64)
+    hashed_columns = 0
+    for col in df.columns:
+        series = df[col]
+        if normalize and 'id' in str(col).lower():
+            continue
+        if normalize and is_text_dtype(series.dtype):
+            column_hash = _normalized_text_hash(series)
+        else:
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                series = series.astype('float64')
+            column_hash = pd.util.hash_pandas_object(series, index=False).to_numpy()
+        fingerprints = fingerprints * _HASH_MULTIPLIER ^ column_hash
+        hashed_columns += 1
+    return fingerprints if hashed_columns else None
+
+
+def null_safe_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    # Rows as dicts with None for missing values; NaN is not valid JSON.
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def is_text_dtype(dtype) -> bool:
+    # Object columns, and the pyarrow string and text category dtypes of frames from utils.loader.
+    if isinstance(dtype, pd.CategoricalDtype):
+        return is_text_dtype(dtype.categories.dtype)
+    return dtype == object or isinstance(dtype, pd.StringDtype)
+
+
+def text_value_counts(series: pd.Series) -> pd.Series:
+    """Series.value_counts() of a text column, as it would be for dtype object.
+
+    Categories are counted by code, so ties keep the order of first
+    appearance rather than category order and unobserved levels are left
+    out; the index is always of objects and the counts int64.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = pd.Series(series.cat.codes.to_numpy())
+        counts = codes[codes >= 0].value_counts()
+        index = series.cat.categories.take(counts.index.to_numpy())
+    else:
+        counts = series.value_counts()
+        index = counts.index
+    return pd.Series(counts.to_numpy(dtype='int64'), index=pd.Index(index, dtype=object, name=series.name),
+                     name='count')
+
+
+DATE_LIKE_KEYWORDS = ["date", "time", "timestamp", "dob", "day", "month", "year"]
+
+
 class DataQualityAnalyzer:
-    def __init__(self, df: pd.DataFrame):
+    CATEGORICAL_PROFILE_LIMIT = 100
+    TYPE_SAMPLE_SIZE = 1000
+    MOSTLY_TYPE_THRESHOLD = 0.9
+    # Narrower frames are profiled serially even with profile_workers > 1.
+    PARALLEL_MIN_COLUMNS = 32
+
+    # Set for frames loaded through utils.loader: the dtypes pandas reads each
+    # column as, reported instead of the leaner ones, and the memory saved.
+    source_dtypes: Dict[str, str] = {}
+    memory_usage: Optional[Dict[str, Any]] = None
+
+    def __init__(self, df: pd.DataFrame, duplicate_sample_limit: int = 100,
+                 outlier_settings: Optional[Dict[str, Any]] = None,
+                 profile_workers: int = 1, profile_mode: str = "process",
+                 source_dtypes: Optional[Dict[str, str]] = None, memory_usage: Optional[Dict[str, Any]] = None):
         self.df = df
         self.total_rows = len(df)
         self.total_cols = len(df.columns)
+        self.duplicate_sample_limit = duplicate_sample_limit
+        self.outlier_settings = outlier_settings or default_outlier_settings()
+        self.profile_workers = profile_workers
+        self.profile_mode = profile_mode
+        self.source_dtypes = source_dtypes or {}
+        self.memory_usage = memory_usage
+        self._profile = None
+        self._fingerprints = None
+
+    @property
+    def profile(self) -> Dict[str, Dict[str, Any]]:
+        if self._profile is None:
+            self._profile = self._build_profile()
+        return self._profile
+
+    def _build_profile(self) -> Dict[str, Dict[str, Any]]:
+        if self.profile_workers > 1 and self.total_cols >= self.PARALLEL_MIN_COLUMNS:
+            from utils.parallel_profile import parallel_profile
+            return parallel_profile(self.df, self.outlier_settings, self.profile_workers, self.profile_mode,
+                                    self.source_dtypes)
+        return self.profile_frame(self.df)
+
+    def profile_frame(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        # One pass over the columns of `df` (all of self.df, or a subset of
+        # them when profiling in parallel); every check below reads from this
+        # instead of recomputing nulls, cardinality, value counts, quartiles
+        # and date parsing.
+        numeric_cols = set(df.select_dtypes(include=[np.number]).columns)
+        categorical_cols = set(df.select_dtypes(include=['object', 'string', 'category']).columns)
+        null_counts = df.isnull().sum()
+        # Bounds for every numeric column at once, see utils.outliers.
+        numeric_stats = detect_outliers(df[[col for col in df.columns if col in numeric_cols]],
+                                        self.outlier_settings)
+
+        profile = {}
+        for col in df.columns:
+            series = df[col]
+            text = is_text_dtype(series.dtype)
+            null_count = int(null_counts[col])
+            info = {
+                "dtype": self.source_dtypes.get(str(col), str(series.dtype)),
+                "is_numeric": col in numeric_cols,
+                "is_categorical": col in categorical_cols,
+                "null_count": null_count,
+                "value_counts": None,
+            }
+
+            if info["is_categorical"]:
+                value_counts = text_value_counts(series) if text else series.value_counts()
+                # value_counts() also lists unobserved levels of a category dtype.
+                info["unique_count"] = len(value_counts) if text else int(series.nunique())
+                if len(value_counts) < self.CATEGORICAL_PROFILE_LIMIT:
+                    info["value_counts"] = value_counts
+                    # Distinct values after cleaning, from the distinct values themselves.
+                    cleaned = pd.Series(value_counts.index, dtype=object).str.strip().str.lower() if text else series
+                    info["cleaned_unique_count"] = int(cleaned.nunique())
+            else:
+                info["unique_count"] = int(series.nunique())
+
+            # Series.duplicated() treats every null after the first as a duplicate.
+            distinct = info["unique_count"] + (1 if null_count > 0 else 0)
+            info["duplicate_count"] = self.total_rows - distinct
+
+            if info["is_numeric"]:
+                info.update(numeric_stats.get(col, {"outlier_count": 0}))
+
+            if text:
+                counts = text_parse_counts(series.dropna(), self.TYPE_SAMPLE_SIZE)
+                info.update(resolve_text_type(counts, self.MOSTLY_TYPE_THRESHOLD))
+
+            if any(keyword in str(col).lower() for keyword in DATE_LIKE_KEYWORDS):
+                try:
+                    parsed = pd.to_datetime(series, errors='coerce', infer_datetime_format=True)
+                    info["date_null_count"] = int(parsed.isnull().sum())
+                except Exception:
+                    pass
+
+            profile[col] = info
+        return profile
     
     def calculate_health_score(self) -> float:
         scores = []
         weights = []
+        profile = self.profile
         
-        missing_pct = (self.df.isnull().sum().sum() / (self.total_rows * self.total_cols)) * 100
+        total_missing = sum(info["null_count"] for info in profile.values())
+        missing_pct = (total_missing / (self.total_rows * self.total_cols)) * 100
         missing_score = max(0, 100 - missing_pct * 2)
         scores.append(missing_score)
         weights.append(0.30)
         
-        duplicate_pct = (self.df.duplicated().sum() / self.total_rows) * 100
+        duplicate_pct = (self._raw_duplicate_count() / self.total_rows) * 100
         duplicate_score = max(0, 100 - duplicate_pct * 3)
         scores.append(duplicate_score)
         weights.append(0.25)
         
-        type_issues = 0
-        for col in self.df.columns:
-            if self.df[col].dtype == 'object':
-                try:
-                    pd.to_numeric(self.df[col].dropna())
-                    type_issues += 1
-                except:
-                    pass
+        type_issues = sum(1 for info in profile.values() if info.get("inferred_type") == "numeric")
         type_score = max(0, 100 - (type_issues / self.total_cols) * 100)
         scores.append(type_score)
         weights.append(0.20)
         
         imbalance_scores = []
-        for col in self.df.select_dtypes(include=['object', 'category']).columns:
-            if self.df[col].nunique() < 20: 
-                value_counts = self.df[col].value_counts()
+        for info in profile.values():
+            if info["is_categorical"] and info["unique_count"] < 20: 
+                value_counts = info["value_counts"]
                 if len(value_counts) > 1:
                     ratio = value_counts.max() / value_counts.min()
                     imbalance_scores.append(max(0, 100 - (ratio - 1) * 10))
@@ -51,16 +223,10 @@ class DataQualityAnalyzer:
             scores.append(100)
         weights.append(0.15)
         
-        outlier_count = 0
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            Q1 = self.df[col].quantile(0.25)
-            Q3 = self.df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            outliers = ((self.df[col] < (Q1 - 1.5 * IQR)) | (self.df[col] > (Q3 + 1.5 * IQR))).sum()
-            outlier_count += outliers
+        numeric_profiles = [info for info in profile.values() if info["is_numeric"]]
+        outlier_count = sum(info["outlier_count"] for info in numeric_profiles)
         
-        outlier_pct = (outlier_count / (self.total_rows * len(numeric_cols))) * 100 if len(numeric_cols) > 0 else 0
+        outlier_pct = (outlier_count / (self.total_rows * len(numeric_profiles))) * 100 if len(numeric_profiles) > 0 else 0
         outlier_score = max(0, 100 - outlier_pct * 2)
         scores.append(outlier_score)
         weights.append(0.10)
@@ -68,12 +234,21 @@ class DataQualityAnalyzer:
         health_score = sum(s * w for s, w in zip(scores, weights))
         return round(health_score, 2)
     
+    def _row_fingerprints(self) -> Optional[np.ndarray]:
+        if self._fingerprints is None:
+            self._fingerprints = row_fingerprints(self.df)
+        return self._fingerprints
+
+    def _raw_duplicate_count(self) -> int:
+        fingerprints = row_fingerprints(self.df, normalize=False)
+        return 0 if fingerprints is None else self.total_rows - len(pd.unique(fingerprints))
+
     def check_missing_values(self) -> Dict[str, Any]:
         missing_data = []
         total_missing = 0
         
-        for col in self.df.columns:
-            missing_count = self.df[col].isnull().sum()
+        for col, info in self.profile.items():
+            missing_count = info["null_count"]
             if missing_count > 0:
                 missing_pct = (missing_count / self.total_rows) * 100
                 missing_data.append({
@@ -91,42 +266,31 @@ class DataQualityAnalyzer:
             "details": sorted(missing_data, key=lambda x: x['percentage'], reverse=True)
         }
     
-    def check_duplicates(self):
-        import numpy as np
-        import pandas as pd
-        df_original = self.df.copy().reset_index(drop=True)
-        id_cols = [c for c in df_original.columns if 'id' in c.lower()]
-        df_clean = df_original.drop(columns=id_cols, errors='ignore').copy()
-        for col in df_clean.select_dtypes(include=['object']).columns:
-            df_clean[col] = (
-                df_clean[col].astype(str)
-                .str.strip()
-                .str.lower()
-                .replace({"nan": np.nan, "none": np.nan, "": np.nan})
-                .fillna("__missing__"))
-
-        df_clean = df_clean.reset_index(drop=True)
-        df_original = df_original.reset_index(drop=True)
-
-        duplicate_mask = df_clean.duplicated(keep=False)
-        duplicate_count = int(df_clean.duplicated().sum())
-        duplicate_pct = round((duplicate_count / len(df_clean)) * 100, 2)
-
-        if len(duplicate_mask) == len(df_original):
-            duplicate_rows = df_original.loc[duplicate_mask].copy()
+    def check_duplicates(self) -> Dict[str, Any]:
+        fingerprints = self._row_fingerprints()
+        if fingerprints is None:
+            duplicate_mask = np.zeros(self.total_rows, dtype=bool)
+            duplicate_count = 0
         else:
-            duplicate_rows = pd.DataFrame()  
+            duplicate_mask = pd.Series(fingerprints).duplicated(keep=False).to_numpy()
+            duplicate_count = self.total_rows - len(pd.unique(fingerprints))
+        duplicate_pct = round((duplicate_count / self.total_rows) * 100, 2)
+
+        sample_positions = np.flatnonzero(duplicate_mask)[:self.duplicate_sample_limit]
+        duplicate_rows = self.df.iloc[sample_positions]
+
         column_duplicates = []
-        for col in df_original.columns:
-            dup_count = df_original[col].duplicated().sum()
+        for col, info in self.profile.items():
+            dup_count = info["duplicate_count"]
             if dup_count > 0:
                 column_duplicates.append({
-                    "column": col,"count": int(dup_count),"percentage": round((dup_count / len(df_original)) * 100, 2)})
+                    "column": col,"count": int(dup_count),"percentage": round((dup_count / self.total_rows) * 100, 2)})
 
         return {
-            "full_row_duplicates": duplicate_count,
+            "full_row_duplicates": int(duplicate_count),
             "percentage": duplicate_pct,
-            "duplicate_row_samples": duplicate_rows.to_dict(orient="records"),
+            "approximate": False,
+            "duplicate_row_samples": null_safe_records(duplicate_rows),
             "column_duplicates": sorted(column_duplicates, key=lambda x: x['percentage'], reverse=True)}
 
     
@@ -134,33 +298,37 @@ class DataQualityAnalyzer:
         type_analysis = []
         issues = []
         
-        for col in self.df.columns:
-            dtype = str(self.df[col].dtype)
+        for col, info in self.profile.items():
             type_info = {
                 "column": col,
-                "current_type": dtype,
-                "unique_values": int(self.df[col].nunique()),
-                "null_count": int(self.df[col].isnull().sum())
+                "current_type": info["dtype"],
+                "unique_values": int(info["unique_count"]),
+                "null_count": int(info["null_count"])
             }
+            if "parse_success" in info:
+                type_info["parse_success"] = info["parse_success"]
             
-            if dtype == 'object':
-                try:
-                    pd.to_numeric(self.df[col].dropna())
-                    issues.append({
-                        "column": col,
-                        "issue": "Numeric values stored as text",
-                        "suggested_type": "numeric"
-                    })
-                except:
-                    try:
-                        pd.to_datetime(self.df[col].dropna())
-                        issues.append({
-                            "column": col,
-                            "issue": "Date values stored as text",
-                            "suggested_type": "datetime"
-                        })
-                    except:
-                        pass
+            inferred = info.get("inferred_type")
+            mostly = info.get("mostly_type")
+            if inferred == "numeric":
+                issues.append({
+                    "column": col,
+                    "issue": "Numeric values stored as text",
+                    "suggested_type": "numeric"
+                })
+            elif inferred == "datetime":
+                issues.append({
+                    "column": col,
+                    "issue": "Date values stored as text",
+                    "suggested_type": "datetime"
+                })
+            elif mostly:
+                issues.append({
+                    "column": col,
+                    "issue": f"Mostly {'numeric' if mostly == 'numeric' else 'date'} values stored as text",
+                    "suggested_type": mostly,
+                    "parse_success_ratio": info["parse_success"][mostly]
+                })
             
             type_analysis.append(type_info)
         
@@ -172,16 +340,14 @@ class DataQualityAnalyzer:
     def check_categorical_consistency(self) -> Dict[str, Any]:
         categorical_analysis = []
         
-        for col in self.df.select_dtypes(include=['object', 'category']).columns:
-            unique_count = self.df[col].nunique()
+        for col, info in self.profile.items():
+            if not info["is_categorical"]:
+                continue
+            unique_count = info["unique_count"]
             
-            if unique_count < 100:
-                value_counts = self.df[col].value_counts()
-                
-                cleaned = self.df[col].str.strip().str.lower() if self.df[col].dtype == 'object' else self.df[col]
-                cleaned_unique = cleaned.nunique()
-                
-                has_inconsistency = unique_count != cleaned_unique
+            if unique_count < self.CATEGORICAL_PROFILE_LIMIT:
+                value_counts = info["value_counts"]
+                has_inconsistency = unique_count != info["cleaned_unique_count"]
                 
                 categorical_analysis.append({
                     "column": col,
@@ -197,35 +363,30 @@ class DataQualityAnalyzer:
             }
     def check_date_formats(self) -> Dict[str, Any]:
         date_analysis = []
-        date_like_keywords = ["date", "time", "timestamp", "dob", "day", "month", "year"]
 
-        for col in self.df.columns:
-            col_lower = col.lower()
+        for col, info in self.profile.items():
+            # Date-like columns are parsed while profiling.
+            if "date_null_count" not in info:
+                continue
+            null_after_parse = info["date_null_count"]
+            original_null = info["null_count"]
 
-            if any(keyword in col_lower for keyword in date_like_keywords):
-                try:
-                    parsed = pd.to_datetime(self.df[col], errors='coerce', infer_datetime_format=True)
-                    null_after_parse = parsed.isnull().sum()
-                    original_null = self.df[col].isnull().sum()
-
-                    if null_after_parse > original_null:
-                        date_analysis.append({
-                            "column": col,
-                            "status": "Invalid date formats detected",
-                            "valid_dates": int(len(parsed) - null_after_parse),
-                            "invalid_dates": int(null_after_parse - original_null),
-                            "sample_values": self.df[col].dropna().head(3).tolist()
-                        })
-                    elif null_after_parse == original_null and null_after_parse < len(self.df):
-                        date_analysis.append({
-                            "column": col,
-                            "status": "Valid date column",
-                            "valid_dates": int(len(parsed) - null_after_parse),
-                            "invalid_dates": 0,
-                            "sample_values": self.df[col].dropna().head(3).tolist()
-                        })
-                except Exception:
-                    continue
+            if null_after_parse > original_null:
+                date_analysis.append({
+                    "column": col,
+                    "status": "Invalid date formats detected",
+                    "valid_dates": int(self.total_rows - null_after_parse),
+                    "invalid_dates": int(null_after_parse - original_null),
+                    "sample_values": self.df[col].dropna().head(3).tolist()
+                })
+            elif null_after_parse == original_null and null_after_parse < self.total_rows:
+                date_analysis.append({
+                    "column": col,
+                    "status": "Valid date column",
+                    "valid_dates": int(self.total_rows - null_after_parse),
+                    "invalid_dates": 0,
+                    "sample_values": self.df[col].dropna().head(3).tolist()
+                })
 
         return {
         "date_columns_found": len(date_analysis),
@@ -236,11 +397,13 @@ class DataQualityAnalyzer:
     def check_class_imbalance(self) -> Dict[str, Any]:
         imbalance_analysis = []
         
-        for col in self.df.select_dtypes(include=['object', 'category']).columns:
-            unique_count = self.df[col].nunique()
+        for col, info in self.profile.items():
+            if not info["is_categorical"]:
+                continue
+            unique_count = info["unique_count"]
             
             if 2 <= unique_count <= 20: 
-                value_counts = self.df[col].value_counts()
+                value_counts = info["value_counts"]
                 max_count = value_counts.max()
                 min_count = value_counts.min()
                 imbalance_ratio = max_count / min_count if min_count > 0 else float('inf')
@@ -265,36 +428,43 @@ class DataQualityAnalyzer:
     def check_outliers(self) -> Dict[str, Any]:
         outlier_analysis = []
         
-        numeric_cols = self.df.select_dtypes(include=[np.number]).columns
-        
-        for col in numeric_cols:
-            Q1 = self.df[col].quantile(0.25)
-            Q3 = self.df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            outliers = ((self.df[col] < lower_bound) | (self.df[col] > upper_bound)).sum()
+        for col, info in self.profile.items():
+            if not info["is_numeric"]:
+                continue
+            outliers = info["outlier_count"]
             
             if outliers > 0:
                 outlier_analysis.append({
                     "column": col,
                     "outlier_count": int(outliers),
                     "percentage": round((outliers / self.total_rows) * 100, 2),
-                    "lower_bound": round(float(lower_bound), 2),
-                    "upper_bound": round(float(upper_bound), 2),
-                    "min_value": round(float(self.df[col].min()), 2),
-                    "max_value": round(float(self.df[col].max()), 2)
+                    "lower_bound": round(float(info["lower_bound"]), 2),
+                    "upper_bound": round(float(info["upper_bound"]), 2),
+                    "min_value": round(float(info["min"]), 2),
+                    "max_value": round(float(info["max"]), 2)
                 })
         
         return {
+            "method": self.outlier_settings["method"],
+            "threshold": self.outlier_settings["threshold"],
+            "column_thresholds": self.outlier_settings["column_thresholds"],
             "columns_with_outliers": len(outlier_analysis),
             "details": sorted(outlier_analysis, key=lambda x: x['percentage'], reverse=True)
         }
     
+    def _describe_frame(self) -> pd.DataFrame:
+        # describe() as on pandas' default dtypes: float32 statistics are
+        # computed in float64, and without numeric columns the text columns
+        # are described as objects.
+        numeric = self.df.select_dtypes(include=[np.number])
+        if len(numeric.columns):
+            widened = {col: 'float64' for col, dtype in numeric.dtypes.items() if dtype == np.float32}
+            return numeric.astype(widened, copy=False) if widened else numeric
+        text = {col: object for col, dtype in self.df.dtypes.items() if is_text_dtype(dtype) and dtype != object}
+        return self.df.astype(text, copy=False) if text else self.df
+
     def get_summary_statistics(self) -> Dict[str, Any]:
-        numeric_summary = self.df.describe().to_dict()
+        numeric_summary = self._describe_frame().describe().to_dict()
         
         for col in numeric_summary:
             for stat in numeric_summary[col]:
@@ -305,20 +475,38 @@ class DataQualityAnalyzer:
         return {
             "total_rows": self.total_rows,
             "total_columns": self.total_cols,
-            "numeric_columns": len(self.df.select_dtypes(include=[np.number]).columns),
-            "categorical_columns": len(self.df.select_dtypes(include=['object', 'category']).columns),
+            "numeric_columns": sum(1 for info in self.profile.values() if info["is_numeric"]),
+            "categorical_columns": sum(1 for info in self.profile.values() if info["is_categorical"]),
             "numeric_summary": numeric_summary
         }
     
-    def generate_full_report(self) -> Dict[str, Any]:
-        return {
-            "summary": self.get_summary_statistics(),
-            "health_score": self.calculate_health_score(),
-            "missing_values": self.check_missing_values(),
-            "duplicates": self.check_duplicates(),
-            "data_types": self.check_data_types(),
-            "categorical_consistency": self.check_categorical_consistency(),
-            "date_formats": self.check_date_formats(),
-            "class_imbalance": self.check_class_imbalance(),
-            "outliers": self.check_outliers()
-        }
\ No newline at end of file
+    REPORT_SECTIONS = [
+        ("summary", "get_summary_statistics"),
+        ("health_score", "calculate_health_score"),
+        ("missing_values", "check_missing_values"),
+        ("duplicates", "check_duplicates"),
+        ("data_types", "check_data_types"),
+        ("categorical_consistency", "check_categorical_consistency"),
+        ("date_formats", "check_date_formats"),
+        ("class_imbalance", "check_class_imbalance"),
+        ("outliers", "check_outliers"),
+    ]
+
+    def generate_full_report(self, progress: Optional[Callable[[str, str], None]] = None,
+                             timings: Optional[StageTimings] = None) -> Dict[str, Any]:
+        # With `timings`, the shared profile is built up front so that its cost
+        # is not charged to whichever section happens to read it first.
+        if timings:
+            with timings.stage("profile"):
+                self.profile
+        report = {}
+        for section, method in self.REPORT_SECTIONS:
+            if progress:
+                progress(section, "running")
+            with timings.stage(section) if timings else nullcontext():
+                report[section] = getattr(self, method)()
+            if progress:
+                progress(section, "done")
+        if self.memory_usage:
+            report["memory"] = self.memory_usage
+        return report
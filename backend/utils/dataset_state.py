@@ -0,0 +1,67 @@
+import hashlib
+import logging
+import pickle
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from utils.streaming_analyzer import DatasetAccumulator
+
+logger = logging.getLogger(__name__)
+
+# Datasets grow by appended uploads ("versions"). Next to each version's file
+# the cumulative DatasetAccumulator through that version is pickled, so the
+# next version only has to read its own rows and merge them in.
+
+# Bump when the accumulator's pickled layout changes; states in another
+# format are ignored and rebuilt from the version files.
+STATE_FORMAT = 3
+
+
+def state_path(file_path) -> Path:
+    return Path(f"{file_path}.state")
+
+
+def save_state(accumulator: "DatasetAccumulator", file_path) -> Path:
+    path = state_path(file_path)
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({"format": STATE_FORMAT, "accumulator": accumulator}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(path)
+    return path
+
+
+def load_state(file_path) -> Optional["DatasetAccumulator"]:
+    path = state_path(file_path)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Could not load dataset state {path}: {str(e)}")
+        return None
+    if not isinstance(state, dict) or state.get("format") != STATE_FORMAT:
+        logger.info(f"Rebuilding dataset state {path} written in an older format")
+        return None
+    return state["accumulator"]
+
+
+def dataset_versions(dataset: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Datasets that were never appended to have no version list.
+    return dataset.get('versions') or [{
+        "version": 1,
+        "filename": dataset['filename'],
+        "file_path": dataset['file_path'],
+        "file_size": dataset.get('file_size'),
+        "content_hash": dataset.get('content_hash'),
+        "rows": dataset.get('rows'),
+        "uploaded_at": dataset.get('upload_date'),
+    }]
+
+
+def combined_hash(content_hashes: List[str]) -> str:
+    # The content hash of a multi-version dataset, for the report cache key.
+    if len(content_hashes) == 1:
+        return content_hashes[0]
+    return hashlib.sha256('\n'.join(content_hashes).encode('utf-8')).hexdigest()
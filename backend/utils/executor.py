@@ -0,0 +1,114 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+
+class ExecutorBusyError(Exception):
+    pass
+
+
+class JobTimeoutError(Exception):
+    pass
+
+
+class AnalysisExecutor:
+    """Bounded process pool for the CPU-bound parse/analyze/render work.
+
+    `max_pending` caps the number of jobs that are running or waiting for a
+    worker; once it is reached new submissions fail fast with
+    ExecutorBusyError instead of piling up behind the pool.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 timeout: Optional[float] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self.timeout = timeout
+        self._pool = None
+        self._pending = 0
+
+    @classmethod
+    def from_env(cls) -> "AnalysisExecutor":
+        timeout = float(os.environ.get('ANALYSIS_TIMEOUT_SECONDS', '300'))
+        return cls(
+            max_workers=int(os.environ.get('ANALYSIS_WORKERS', '0')) or None,
+            max_pending=int(os.environ.get('ANALYSIS_MAX_PENDING', '0')) or None,
+            timeout=timeout if timeout > 0 else None,
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn keeps the event loop and Mongo client threads out of the workers.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        # A worker died (OOM kill, segfault) and the pool refuses new work;
+        # the next job starts a fresh one.
+        if self._pool is pool:
+            self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, fn: Callable, *args) -> "asyncio.Future":
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        try:
+            future = loop.run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            pool = self._get_pool()
+            future = loop.run_in_executor(pool, fn, *args)
+        future.add_done_callback(lambda f: self._discard_if_broken(pool, f))
+        return future
+
+    def _discard_if_broken(self, pool: ProcessPoolExecutor, future: "asyncio.Future") -> None:
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._discard_pool(pool)
+
+    def _release(self, _future):
+        self._pending -= 1
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """Run `fn(*args)` in a worker process.
+
+        A timeout only stops the wait: the worker cannot be interrupted
+        without killing the other jobs of the pool, so it runs the job to the
+        end and keeps its slot (and a share of `max_pending`) until then.
+        """
+        if self._pending >= self.max_pending:
+            raise ExecutorBusyError("Too many analysis jobs in progress, please retry shortly")
+
+        future = self._submit(fn, *args)
+        # The slot is held until the worker actually finishes, so a job that
+        # timed out still counts against the queue depth while it keeps running.
+        self._pending += 1
+        future.add_done_callback(self._release)
+
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise JobTimeoutError(f"Job exceeded the {timeout:g}s time limit")
+
+    async def warm_up(self, fn: Callable) -> None:
+        """Start the worker processes and run `fn` (e.g. module imports) in each.
+
+        Best effort: nothing pins a call to a particular worker, so a worker
+        may run `fn` twice while another one skips it.
+        """
+        await asyncio.gather(*(self._submit(fn) for _ in range(self.max_workers)))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,60 @@
+import logging
+from typing import Any, Dict, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+logger = logging.getLogger(__name__)
+
+# Indexes backing the queries in server.py and utils/, per collection.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+    ],
+    "datasets": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        # Listing a user's datasets newest first, paginated on (upload_date, id).
+        IndexModel([("user_id", ASCENDING), ("upload_date", DESCENDING), ("id", DESCENDING)], name="user_upload_date"),
+    ],
+    "reports": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="user_created_at"),
+        IndexModel([("dataset_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="dataset_created_at"),
+        # Reuse of a dataset's report for the same cache key.
+        IndexModel([("dataset_id", ASCENDING), ("user_id", ASCENDING), ("cache_key", ASCENDING)], name="dataset_cache_key"),
+        # Whether any report still uses a cache entry, when a dataset is deleted.
+        IndexModel([("cache_key", ASCENDING)], name="cache_key"),
+    ],
+    "jobs": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        # The two branches of JobWorker._claim.
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created_at"),
+        IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)], name="status_lease"),
+        IndexModel([("dataset_id", ASCENDING)], name="dataset_id"),
+    ],
+    "report_cache": [
+        IndexModel([("key", ASCENDING)], unique=True, name="key_unique"),
+    ],
+    "report_sections": [
+        IndexModel([("payload_id", ASCENDING), ("section", ASCENDING), ("n", ASCENDING)], unique=True, name="payload_section_chunk"),
+        # ReportPayloadStore.get reads a payload's chunks in order.
+        IndexModel([("payload_id", ASCENDING), ("position", ASCENDING), ("n", ASCENDING)], name="payload_position"),
+    ],
+}
+
+
+async def ensure_indexes(db) -> List[Tuple[str, Any]]:
+    """Create any missing indexes; existing ones are left untouched.
+
+    A collection whose indexes cannot be created (e.g. duplicate emails
+    blocking a unique index) is logged and skipped so the API still starts.
+    Returns (collection, error) pairs for the failures.
+    """
+    failures = []
+    for collection, models in INDEXES.items():
+        try:
+            await db[collection].create_indexes(models)
+        except Exception as e:
+            logger.error(f"Could not create indexes on {collection}: {str(e)}")
+            failures.append((collection, e))
+    return failures
@@ -0,0 +1,96 @@
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+# Wall time, CPU time and peak memory growth of the stages of an analysis.
+#
+# The peak is the process's resident memory high-water mark during the stage
+# minus its resident memory at the start. On Linux the high-water mark
+# (VmHWM) is reset at the start of every stage through /proc/self/clear_refs;
+# elsewhere the growth of ru_maxrss is used instead, which is only non-zero
+# for stages that take the process past its earlier peak. Both cover the
+# whole process, so stages are meant to run one at a time in an analysis
+# worker and are never nested. (tracemalloc would attribute Python
+# allocations exactly but slows the analyzers down several times over.)
+
+_STATUS_PATH = '/proc/self/status'
+_CLEAR_REFS_PATH = '/proc/self/clear_refs'
+# Writing "5" to clear_refs resets the peak RSS (Linux 4.0+).
+_RESET_PEAK_RSS = '5'
+
+
+def _status_kb(field: str) -> Optional[int]:
+    try:
+        with open(_STATUS_PATH) as f:
+            match = re.search(rf'^{field}:\s+(\d+) kB', f.read(), re.MULTILINE)
+    except OSError:
+        return None
+    return int(match.group(1)) if match else None
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        with open(_CLEAR_REFS_PATH, 'w') as f:
+            f.write(_RESET_PEAK_RSS)
+        return True
+    except OSError:
+        return False
+
+
+def _max_rss_kb() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class StageTimings:
+    """Per-stage measurements, in the order the stages ran.
+
+    as_dict() maps each stage to {"wall_seconds", "cpu_seconds",
+    "peak_memory_mb"}; the last two are None for stages recorded without
+    resource usage (e.g. awaits on the event loop, where the process is
+    shared with other requests).
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def stage(self, name: str, resources: bool = True):
+        if not resources:
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.record(name, time.perf_counter() - start)
+            return
+
+        peak_reset = _reset_peak_rss()
+        memory_before = _status_kb('VmRSS') if peak_reset else _max_rss_kb()
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+            memory_after = _status_kb('VmHWM') if peak_reset else _max_rss_kb()
+            peak = None
+            if memory_before is not None and memory_after is not None:
+                peak = max(0, memory_after - memory_before) / 1024
+            self.record(name, wall, cpu, peak)
+
+    def record(self, name: str, wall_seconds: float, cpu_seconds: Optional[float] = None,
+               peak_memory_mb: Optional[float] = None):
+        # A stage recorded twice (e.g. two Mongo writes) adds up; the peak is the larger one.
+        entry = self.stages.setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": None, "peak_memory_mb": None})
+        entry["wall_seconds"] = round(entry["wall_seconds"] + wall_seconds, 6)
+        if cpu_seconds is not None:
+            entry["cpu_seconds"] = round((entry["cpu_seconds"] or 0.0) + cpu_seconds, 6)
+        if peak_memory_mb is not None:
+            entry["peak_memory_mb"] = round(max(entry["peak_memory_mb"] or 0.0, peak_memory_mb), 3)
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: dict(entry) for name, entry in self.stages.items()}
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from pymongo import ReturnDocument
+
+from utils.executor import ExecutorBusyError
+
+logger = logging.getLogger(__name__)
+
+# Progress keys reported by an analysis job: file parsing followed by the
+# sections of DataQualityAnalyzer.generate_full_report, in execution order.
+ANALYSIS_STAGES = [
+    "parse",
+    "summary",
+    "health_score",
+    "missing_values",
+    "duplicates",
+    "data_types",
+    "categorical_consistency",
+    "date_formats",
+    "class_imbalance",
+    "outliers",
+]
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def new_job_doc(dataset_id: str, user_id: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    now = utc_now().isoformat()
+    return {
+        "id": str(uuid.uuid4()),
+        "type": "analysis",
+        "dataset_id": dataset_id,
+        "user_id": user_id,
+        # Per-request analysis settings, e.g. {"outliers": outlier_settings(...)}.
+        "options": options or {},
+        "status": JOB_QUEUED,
+        "progress": {stage: "pending" for stage in ANALYSIS_STAGES},
+        "attempts": 0,
+        "worker_id": None,
+        "lease_expires_at": None,
+        "report_id": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    done = sum(1 for stage in ANALYSIS_STAGES if job["progress"].get(stage) == "done")
+    return {
+        "job_id": job["id"],
+        "dataset_id": job["dataset_id"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "percent_complete": round(done / len(ANALYSIS_STAGES) * 100, 2),
+        "report_id": job.get("report_id"),
+        "error": job.get("error"),
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
+
+
+_sync_db = None
+# Progress writes happen inside the analysis; an unreachable Mongo should cost
+# them a couple of seconds, not pymongo's 30s default per stage.
+PROGRESS_TIMEOUT_MS = 2000
+
+
+def job_progress_reporter(job_id: str) -> Callable[[str, str], None]:
+    """Progress callback for use inside a pool worker process.
+
+    Workers cannot share the API's asyncio Motor client, so they write
+    progress straight to the `jobs` collection with a per-process pymongo client.
+    """
+    global _sync_db
+    if _sync_db is None:
+        from pymongo import MongoClient
+        _sync_db = MongoClient(
+            os.environ['MONGO_URL'],
+            serverSelectionTimeoutMS=PROGRESS_TIMEOUT_MS,
+            connectTimeoutMS=PROGRESS_TIMEOUT_MS,
+            socketTimeoutMS=PROGRESS_TIMEOUT_MS,
+        )[os.environ['DB_NAME']]
+    jobs = _sync_db.jobs
+
+    failed = False
+
+    def report(stage: str, state: str):
+        # Progress is best effort: a failed write must not abort the analysis,
+        # and after one the rest of the job's progress is not written at all.
+        nonlocal failed
+        if failed:
+            return
+        try:
+            jobs.update_one(
+                {"id": job_id, "status": JOB_RUNNING},
+                {"$set": {f"progress.{stage}": state, "updated_at": utc_now().isoformat()}},
+            )
+        except Exception as e:
+            failed = True
+            logger.warning(f"Could not record progress for job {job_id}: {str(e)}")
+
+    return report
+
+
+class JobWorker:
+    """Claims queued analysis jobs from Mongo and runs them.
+
+    Jobs are claimed with an atomic find_one_and_update and held under a lease
+    that is renewed while they run, so any API or worker node can pick up work
+    and a job whose worker died is retried once its lease expires.
+    """
+
+    def __init__(self, db, handler: Callable[[Dict[str, Any]], Awaitable[str]],
+                 concurrency: int = 1, poll_interval: float = 1.0,
+                 lease_seconds: float = 60.0, max_attempts: int = 3):
+        self.db = db
+        self.handler = handler
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._slots = asyncio.Semaphore(concurrency)
+        self._task: Optional[asyncio.Task] = None
+        self._running = set()
+
+    @classmethod
+    def from_env(cls, db, handler, default_concurrency: int) -> "JobWorker":
+        return cls(
+            db,
+            handler,
+            concurrency=int(os.environ.get('JOB_WORKER_CONCURRENCY', '0')) or default_concurrency,
+            poll_interval=float(os.environ.get('JOB_POLL_INTERVAL_SECONDS', '1')),
+            lease_seconds=float(os.environ.get('JOB_LEASE_SECONDS', '60')),
+            max_attempts=int(os.environ.get('JOB_MAX_ATTEMPTS', '3')),
+        )
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in list(self._running):
+            task.cancel()
+
+    async def _claim(self) -> Optional[Dict[str, Any]]:
+        now = utc_now()
+        job = await self.db.jobs.find_one_and_update(
+            {
+                "$or": [
+                    {"status": JOB_QUEUED},
+                    {"status": JOB_RUNNING, "lease_expires_at": {"$lt": now.isoformat()}},
+                ]
+            },
+            {
+                "$set": {
+                    "status": JOB_RUNNING,
+                    "worker_id": self.worker_id,
+                    "lease_expires_at": (now + timedelta(seconds=self.lease_seconds)).isoformat(),
+                    "updated_at": now.isoformat(),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if job is not None:
+            job.pop("_id", None)
+        return job
+
+    async def _loop(self):
+        while True:
+            await self._slots.acquire()
+            try:
+                job = await self._claim()
+            except Exception as e:
+                self._slots.release()
+                logger.error(f"Job claim error: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            if job is None:
+                self._slots.release()
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            task = asyncio.create_task(self._run(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _renew_lease(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            # A failed renewal is retried on the next tick; the lease only
+            # lapses if Mongo stays unreachable for a whole lease period.
+            try:
+                await self.db.jobs.update_one(
+                    {"id": job_id, "worker_id": self.worker_id},
+                    {"$set": {"lease_expires_at": (utc_now() + timedelta(seconds=self.lease_seconds)).isoformat()}},
+                )
+            except Exception as e:
+                logger.error(f"Lease renewal error for job {job_id}: {str(e)}")
+
+    async def _finish(self, job_id: str, fields: Dict[str, Any]):
+        fields.update({"lease_expires_at": None, "updated_at": utc_now().isoformat()})
+        await self.db.jobs.update_one({"id": job_id, "worker_id": self.worker_id}, {"$set": fields})
+
+    async def _run(self, job: Dict[str, Any]):
+        renew = asyncio.create_task(self._renew_lease(job["id"]))
+        try:
+            if job["attempts"] > self.max_attempts:
+                await self._finish(job["id"], {"status": JOB_FAILED, "error": "Job exceeded the maximum number of attempts"})
+                return
+            report_id = await self.handler(job)
+            await self._finish(job["id"], {
+                "status": JOB_COMPLETED,
+                "report_id": report_id,
+                "progress": {stage: "done" for stage in ANALYSIS_STAGES},
+            })
+        except ExecutorBusyError:
+            # Give the job back to the queue for this or another worker.
+            await self._finish(job["id"], {"status": JOB_QUEUED, "worker_id": None, "attempts": job["attempts"] - 1})
+            await asyncio.sleep(self.poll_interval)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Analysis job {job['id']} failed: {str(e)}")
+            await self._finish(job["id"], {"status": JOB_FAILED, "error": str(e)})
+        finally:
+            renew.cancel()
+            self._slots.release()
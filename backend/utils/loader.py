@@ -0,0 +1,127 @@
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Memory-lean dtypes for frames loaded for analysis. pandas' defaults keep
+# every string as a Python object and every number in 64 bits; here text
+# columns become pyarrow-backed strings, or `category` when few distinct
+# values repeat, and numbers are downcast where no value changes. The
+# analyzers report and compute on the dtypes pandas would have produced
+# ("source dtypes"), so reports do not depend on these conversions.
+
+# Text columns with at most this share of distinct non-null values become `category`.
+CATEGORY_MAX_UNIQUE_RATIO = float(os.environ.get('LOADER_CATEGORY_MAX_UNIQUE_RATIO', '0.5'))
+OPTIMIZE_DTYPES = os.environ.get('LOADER_OPTIMIZE_DTYPES', 'true').lower() == 'true'
+
+# Rough size of a Python str object beyond its characters, and of the
+# pointer to it in an object column.
+_PY_STR_OVERHEAD = 49
+_PY_POINTER = 8
+
+
+class ColumnSelectionError(ValueError):
+    pass
+
+
+def select_columns(available: List[str], requested: Optional[List[str]]) -> Optional[List[str]]:
+    """The requested columns in file order, or None to load them all."""
+    if not requested:
+        return None
+    missing = [col for col in requested if col not in available]
+    if missing:
+        raise ColumnSelectionError(f"Columns not found in dataset: {', '.join(missing)}")
+    return [col for col in available if col in requested]
+
+
+def _default_text_bytes(strings: "pd.Series") -> int:
+    # Estimated size as an object column: a pointer per row plus a str object
+    # per non-null value (ASCII-sized, so an underestimate for other text).
+    lengths = strings.str.len()
+    non_null = int(lengths.notna().sum())
+    return len(strings) * _PY_POINTER + non_null * _PY_STR_OVERHEAD + int(lengths.sum() or 0)
+
+
+def _is_all_strings(series: "pd.Series") -> bool:
+    import pandas as pd
+    return pd.api.types.infer_dtype(series, skipna=True) == 'string'
+
+
+def _downcast_float(series: "pd.Series") -> Optional["pd.Series"]:
+    import numpy as np
+    import pandas as pd
+    values = series.to_numpy()
+    narrow = values.astype(np.float32)
+    if np.array_equal(narrow.astype(np.float64), values, equal_nan=True):
+        return pd.Series(narrow, index=series.index, name=series.name)
+    return None
+
+
+def _optimize_column(series: "pd.Series") -> Tuple["pd.Series", Optional[str], int]:
+    """Return (column, conversion, estimated bytes with pandas' default dtypes)."""
+    import numpy as np
+    import pandas as pd
+
+    dtype = series.dtype
+    if isinstance(dtype, pd.StringDtype) or (dtype == object and _is_all_strings(series)):
+        strings = series if isinstance(dtype, pd.StringDtype) else series.astype(pd.StringDtype("pyarrow"))
+        default_bytes = _default_text_bytes(strings)
+        non_null = int(strings.notna().sum())
+        if non_null and strings.nunique() <= non_null * CATEGORY_MAX_UNIQUE_RATIO:
+            return strings.astype('category'), "category", default_bytes
+        return strings, "string", default_bytes
+
+    default_bytes = int(series.memory_usage(index=False, deep=dtype == object))
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iu' and dtype.itemsize > 1:
+        narrow = pd.to_numeric(series, downcast='integer' if dtype.kind == 'i' else 'unsigned')
+        if narrow.dtype != dtype:
+            return narrow, "downcast", default_bytes
+    elif isinstance(dtype, np.dtype) and dtype == np.float64:
+        narrow = _downcast_float(series)
+        if narrow is not None:
+            return narrow, "downcast", default_bytes
+    return series, None, default_bytes
+
+
+def source_dtype(series: "pd.Series") -> str:
+    # The dtype pandas gives the column when reading the file.
+    from utils.data_analyzer import is_text_dtype
+    return 'object' if is_text_dtype(series.dtype) else str(series.dtype)
+
+
+def optimize_frame(df: "pd.DataFrame") -> Tuple["pd.DataFrame", Dict[str, Any]]:
+    """Convert `df`'s columns in place to leaner dtypes.
+
+    Returns the frame and {"source_dtypes", "memory"}: source_dtypes maps
+    each column to the dtype pandas reads it as, memory gives the estimated
+    bytes with pandas' default dtypes, the bytes after conversion, the
+    saving and the converted columns by kind.
+    """
+    source_dtypes = {}
+    converted = {"string": [], "category": [], "downcast": []}
+    default_bytes = 0
+    for i, col in enumerate(df.columns):
+        series = df.iloc[:, i]
+        source_dtypes[str(col)] = source_dtype(series)
+        if OPTIMIZE_DTYPES:
+            series, conversion, column_bytes = _optimize_column(series)
+            if conversion:
+                converted[conversion].append(str(col))
+                df.isetitem(i, series)
+        else:
+            column_bytes = int(series.memory_usage(index=False, deep=True))
+        default_bytes += column_bytes
+
+    loaded_bytes = int(df.memory_usage(index=False, deep=True).sum())
+    return df, {
+        "source_dtypes": source_dtypes,
+        "memory": {
+            "default_dtypes_mb": round(default_bytes / (1024 * 1024), 2),
+            "loaded_mb": round(loaded_bytes / (1024 * 1024), 2),
+            "saved_pct": round((1 - loaded_bytes / default_bytes) * 100, 1) if default_bytes else 0.0,
+            "string_columns": converted["string"],
+            "category_columns": converted["category"],
+            "downcast_columns": converted["downcast"],
+        },
+    }
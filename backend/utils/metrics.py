@@ -0,0 +1,162 @@
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# In-process metrics in the Prometheus text exposition format (version
+# 0.0.4), served on /metrics. Each API process keeps its own; analysis
+# workers send their stage timings back with the report and they are
+# observed here, in the API process.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+MEMORY_BUCKETS = tuple(float(2 ** power) * 1024 * 1024 for power in range(0, 14, 2))  # 1 MB .. 4 GB
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Per label set: [count per bucket (not cumulative)], sum, count.
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            counts, totals = self._values.setdefault(key, ([0] * len(self.buckets), [0.0, 0]))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            totals[0] += value
+            totals[1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, (total, count)) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = _labels(self.labelnames, key, ("le", _number(bound)))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class AppMetrics:
+    """The metrics served on /metrics: analysis stage costs and request latency."""
+
+    def __init__(self, prefix: str = "dataguard"):
+        self.stage_seconds = Histogram(
+            f"{prefix}_stage_duration_seconds", "Wall time of analysis pipeline stages.", ["stage"])
+        self.stage_cpu_seconds = Counter(
+            f"{prefix}_stage_cpu_seconds_total", "CPU time spent in analysis pipeline stages.", ["stage"])
+        self.stage_peak_memory = Histogram(
+            f"{prefix}_stage_peak_memory_bytes", "Peak resident memory growth during analysis pipeline stages.",
+            ["stage"], MEMORY_BUCKETS)
+        self.request_seconds = Histogram(
+            f"{prefix}_http_request_duration_seconds", "Latency of HTTP requests by route.",
+            ["method", "route", "status"])
+        self._metrics = [self.stage_seconds, self.stage_cpu_seconds, self.stage_peak_memory, self.request_seconds]
+
+    def observe_timings(self, timings: Dict[str, Dict[str, Optional[float]]]):
+        # A StageTimings.as_dict() block.
+        for stage, timing in timings.items():
+            self.stage_seconds.observe(timing["wall_seconds"], stage=stage)
+            if timing.get("cpu_seconds") is not None:
+                self.stage_cpu_seconds.inc(timing["cpu_seconds"], stage=stage)
+            if timing.get("peak_memory_mb") is not None:
+                self.stage_peak_memory.observe(timing["peak_memory_mb"] * 1024 * 1024, stage=stage)
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float):
+        self.request_seconds.observe(seconds, method=method, route=route, status=str(status))
+
+    def render(self) -> str:
+        return '\n'.join(line for metric in self._metrics for line in metric.render()) + '\n'
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware timing each HTTP request into `metrics.request_seconds`.
+
+    A request is timed until its last body message is sent, so streamed
+    responses count the time spent producing them, not just their headers.
+    """
+
+    def __init__(self, app, metrics: AppMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        observed = False
+
+        def observe():
+            nonlocal observed
+            observed = True
+            # The route template (e.g. /api/datasets/{dataset_id}/analyze) keeps the label set small.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            self.metrics.observe_request(scope["method"], route, status, time.perf_counter() - start)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Failed before (or while) sending the response, or the client went away.
+            if not observed:
+                observe()
@@ -0,0 +1,153 @@
+import json
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Default threshold per method: the IQR multiplier (Tukey fences) and the
+# robust z-score cut-off (Iglewicz and Hoaglin).
+OUTLIER_METHODS = {"iqr": 1.5, "mad": 3.5}
+DEFAULT_OUTLIER_METHOD = "iqr"
+
+# Robust z = 0.6745 * (x - median) / MAD, i.e. MAD scaled to match the
+# standard deviation of normal data. A zero MAD falls back to the mean
+# absolute deviation around the median, scaled likewise.
+MAD_SCALE = 0.6745
+MEAN_AD_SCALE = 0.7979
+
+
+class OutlierSettingsError(ValueError):
+    pass
+
+
+def outlier_settings(method: Optional[str] = None, threshold: Optional[float] = None,
+                     column_thresholds: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    method = method or DEFAULT_OUTLIER_METHOD
+    if method not in OUTLIER_METHODS:
+        raise OutlierSettingsError(f"Unknown outlier method '{method}', expected one of: {', '.join(OUTLIER_METHODS)}")
+    threshold = OUTLIER_METHODS[method] if threshold is None else threshold
+    column_thresholds = {str(col): value for col, value in (column_thresholds or {}).items()}
+    for value in [threshold, *column_thresholds.values()]:
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not value > 0:
+            raise OutlierSettingsError(f"Outlier thresholds must be positive numbers, got {value!r}")
+    return {
+        "method": method,
+        "threshold": float(threshold),
+        "column_thresholds": {col: float(value) for col, value in sorted(column_thresholds.items())},
+    }
+
+
+def parse_column_thresholds(value: Optional[str]) -> Optional[Dict[str, float]]:
+    # Query parameter form: a JSON object of column name to threshold.
+    if not value:
+        return None
+    try:
+        thresholds = json.loads(value)
+    except ValueError:
+        raise OutlierSettingsError("Column thresholds must be a JSON object of column name to threshold")
+    if not isinstance(thresholds, dict):
+        raise OutlierSettingsError("Column thresholds must be a JSON object of column name to threshold")
+    return thresholds
+
+
+def column_threshold(settings: Dict[str, Any], column) -> float:
+    return settings["column_thresholds"].get(str(column), settings["threshold"])
+
+
+def _sorted_quantiles(sorted_values: "np.ndarray", counts: "np.ndarray", q: float) -> "np.ndarray":
+    import numpy as np
+
+    # Linear interpolation, as Series.quantile; NaN sorts last, so only the
+    # first `counts` values of each column take part.
+    position = np.maximum(counts - 1, 0) * q
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, np.maximum(counts - 1, 0))
+    below = np.take_along_axis(sorted_values, lower[None, :], axis=0)[0]
+    above = np.take_along_axis(sorted_values, upper[None, :], axis=0)[0]
+    result = below + (above - below) * (position - lower)
+    return np.where(counts > 0, result, np.nan)
+
+
+def detect_outliers(numeric: "pd.DataFrame", settings: Dict[str, Any]) -> Dict[Any, Dict[str, Any]]:
+    """Outlier bounds and counts for every column of a numeric DataFrame.
+
+    The block is sorted once, column-wise; quartiles, medians, min and max
+    are read off the sorted values and the bounds of all columns are applied
+    in a single broadcast comparison. Returns, per column, lower_bound,
+    upper_bound, min, max and outlier_count, plus q1/q3 ("iqr") or
+    median/mad ("mad").
+    """
+    import numpy as np
+
+    columns = list(numeric.columns)
+    if not columns or numeric.empty:
+        return {}
+
+    values = numeric.to_numpy(dtype='float64', na_value=np.nan)
+    sorted_values = np.sort(values, axis=0)
+    counts = np.count_nonzero(~np.isnan(values), axis=0)
+    threshold = np.array([column_threshold(settings, col) for col in columns])
+
+    if settings["method"] == "iqr":
+        q1 = _sorted_quantiles(sorted_values, counts, 0.25)
+        q3 = _sorted_quantiles(sorted_values, counts, 0.75)
+        iqr = q3 - q1
+        lower_bound = q1 - threshold * iqr
+        upper_bound = q3 + threshold * iqr
+        extra = {"q1": q1, "q3": q3}
+    else:
+        median = _sorted_quantiles(sorted_values, counts, 0.5)
+        deviations = np.abs(values - median)
+        mad = _sorted_quantiles(np.sort(deviations, axis=0), counts, 0.5)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_ad = np.nansum(deviations, axis=0) / counts
+        scale = np.where(mad > 0, mad / MAD_SCALE, mean_ad / MEAN_AD_SCALE)
+        lower_bound = median - threshold * scale
+        upper_bound = median + threshold * scale
+        extra = {"median": median, "mad": mad}
+
+    with np.errstate(invalid='ignore'):
+        outlier_counts = np.count_nonzero((values < lower_bound) | (values > upper_bound), axis=0)
+    last = np.maximum(counts - 1, 0)
+    minimum = np.where(counts > 0, sorted_values[0], np.nan)
+    maximum = np.where(counts > 0, np.take_along_axis(sorted_values, last[None, :], axis=0)[0], np.nan)
+
+    result = {}
+    for i, col in enumerate(columns):
+        result[col] = {
+            "lower_bound": lower_bound[i],
+            "upper_bound": upper_bound[i],
+            "min": minimum[i],
+            "max": maximum[i],
+            "outlier_count": int(outlier_counts[i]),
+            **{key: stat[i] for key, stat in extra.items()},
+        }
+    return result
+
+
+def sketch_outliers(sketch, settings: Dict[str, Any], column) -> Dict[str, Any]:
+    """The same bounds as detect_outliers, estimated from a QuantileSketch."""
+    threshold = column_threshold(settings, column)
+    if settings["method"] == "iqr":
+        q1 = sketch.quantile(0.25)
+        q3 = sketch.quantile(0.75)
+        iqr = q3 - q1
+        lower_bound, upper_bound = q1 - threshold * iqr, q3 + threshold * iqr
+        extra = {"q1": q1, "q3": q3}
+    else:
+        median = sketch.quantile(0.5)
+        mad = sketch.median_absolute_deviation(median)
+        # A sketch keeps no mean absolute deviation; a zero MAD flags every
+        # value off the median, as the robust z-score does.
+        scale = mad / MAD_SCALE
+        lower_bound, upper_bound = median - threshold * scale, median + threshold * scale
+        extra = {"median": median, "mad": mad}
+
+    outliers = sketch.count_below(lower_bound) + sketch.count_above(upper_bound)
+    return {
+        "lower_bound": lower_bound,
+        "upper_bound": upper_bound,
+        "outlier_count": int(round(outliers)),
+        **extra,
+    }
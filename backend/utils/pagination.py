@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(sort_value: Any, doc_id: str) -> str:
+    payload = json.dumps([sort_value, doc_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    # Listings are sorted on ISO timestamps; anything else (a number, an
+    # object) would end up as a Mongo operator argument in the page query.
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_value, doc_id = json.loads(payload)
+        if not isinstance(sort_value, str) or not isinstance(doc_id, str):
+            raise ValueError("cursor values must be strings")
+        datetime.fromisoformat(sort_value)
+    except Exception:
+        raise InvalidCursorError("Invalid pagination cursor")
+    return sort_value, doc_id
+
+
+async def paginate(collection, query: Dict[str, Any], sort_field: str, limit: int,
+                   cursor: Optional[str] = None,
+                   projection: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Keyset pagination, newest first, over (sort_field, id).
+
+    Each page starts right after the cursor's position, so the cost of a page
+    does not grow with how deep into the listing it is. Returns the page and
+    the cursor for the next one (None on the last page).
+    """
+    if cursor:
+        sort_value, doc_id = decode_cursor(cursor)
+        query = {
+            **query,
+            "$or": [
+                {sort_field: {"$lt": sort_value}},
+                {sort_field: sort_value, "id": {"$lt": doc_id}},
+            ],
+        }
+
+    projection = {"_id": 0, **(projection or {})}
+    if len(projection) > 1:
+        # The next cursor is built from these.
+        projection.update({sort_field: 1, "id": 1})
+
+    docs = await collection.find(query, projection).sort([(sort_field, -1), ("id", -1)]).limit(limit + 1).to_list(limit + 1)
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, encode_cursor(docs[-1][sort_field], docs[-1]["id"])
@@ -0,0 +1,120 @@
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.data_analyzer import is_text_dtype
+
+logger = logging.getLogger(__name__)
+
+# Column-partitioned profiling for wide frames. The per-column profile of
+# DataQualityAnalyzer does not depend on other columns, so the profile of a
+# subset of the columns is exactly that subset of the full profile.
+#
+# "thread" workers read the analyzer's own DataFrame. "process" workers get
+# the columns through an uncompressed Arrow IPC file that each of them
+# memory-maps, so nothing is pickled across; without pyarrow, or for frames
+# Arrow cannot represent, profiling falls back to threads.
+PROFILE_MODES = ("thread", "process")
+
+# /dev/shm keeps the shared file in memory where available.
+SHARE_DIR = os.environ.get('PROFILE_SHARE_DIR') or ('/dev/shm' if os.path.isdir('/dev/shm') else None)
+
+_pools: Dict[Tuple[str, int], Executor] = {}
+
+
+def _pool(mode: str, workers: int) -> Executor:
+    # Reused across analyses; process workers pay for importing pandas once.
+    key = (mode, workers)
+    if key not in _pools:
+        if mode == "process":
+            _pools[key] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        else:
+            _pools[key] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="profile")
+    return _pools[key]
+
+
+def partition_columns(n_columns: int, parts: int) -> List[List[int]]:
+    # Contiguous ranges keep numeric columns together for the block-wise outlier pass.
+    size = -(-n_columns // parts)
+    return [list(range(start, min(start + size, n_columns))) for start in range(0, n_columns, size)]
+
+
+def _profile_frame(df: pd.DataFrame, settings: Dict[str, Any],
+                   source_dtypes: Optional[Dict[str, str]] = None) -> Dict[Any, Dict[str, Any]]:
+    from utils.data_analyzer import DataQualityAnalyzer
+    return DataQualityAnalyzer(df, outlier_settings=settings, source_dtypes=source_dtypes).profile_frame(df)
+
+
+def _profile_shared(path: str, columns: List[str], settings: Dict[str, Any],
+                    source_dtypes: Optional[Dict[str, str]] = None) -> Dict[Any, Dict[str, Any]]:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    with pa.memory_map(path) as source:
+        table = ipc.open_file(source).read_all().select(columns)
+        return _profile_frame(table.to_pandas(), settings, source_dtypes)
+
+
+def _share(df: pd.DataFrame) -> Optional[str]:
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+    except ImportError:
+        return None
+    if not all(isinstance(col, str) for col in df.columns) or df.columns.has_duplicates:
+        return None
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except Exception as e:
+        # e.g. object columns mixing numbers and strings.
+        logger.info(f"Profiling with threads, columns cannot be shared through Arrow: {str(e)}")
+        return None
+    # Only columns that come back from Arrow with the same dtype: plain
+    # numpy numbers and booleans, and text. pyarrow strings come back as
+    # objects and text categories as categories, which profile alike.
+    for col, field in zip(df.columns, table.schema):
+        dtype = df[col].dtype
+        if isinstance(dtype, (pd.StringDtype, pd.CategoricalDtype)):
+            if not is_text_dtype(dtype):
+                return None
+        elif not (isinstance(dtype, np.dtype) and (dtype.kind in 'iufb' or (dtype.kind == 'O' and pa.types.is_string(field.type)))):
+            return None
+
+    fd, path = tempfile.mkstemp(suffix=".arrow", dir=SHARE_DIR)
+    os.close(fd)
+    try:
+        with pa.OSFile(path, 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return path
+    except Exception as e:
+        os.unlink(path)
+        logger.warning(f"Profiling with threads, could not write shared columns: {str(e)}")
+        return None
+
+
+def parallel_profile(df: pd.DataFrame, settings: Dict[str, Any], workers: int,
+                     mode: str = "process", source_dtypes: Optional[Dict[str, str]] = None) -> Dict[Any, Dict[str, Any]]:
+    """DataQualityAnalyzer.profile_frame(df), computed on `workers` cores."""
+    partitions = partition_columns(len(df.columns), workers * 2)
+    path = _share(df) if mode == "process" else None
+    try:
+        if path:
+            pool = _pool("process", workers)
+            futures = [pool.submit(_profile_shared, path, [df.columns[i] for i in part], settings, source_dtypes)
+                       for part in partitions]
+        else:
+            pool = _pool("thread", workers)
+            futures = [pool.submit(_profile_frame, df.iloc[:, part], settings, source_dtypes) for part in partitions]
+        profile = {}
+        for future in futures:
+            profile.update(future.result())
+        return profile
+    finally:
+        if path:
+            os.unlink(path)
@@ -0,0 +1,49 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+
+class PasswordHasher:
+    """bcrypt hashing and verification on a bounded thread pool.
+
+    bcrypt releases the GIL, so the event loop keeps serving requests while
+    up to `max_workers` hashes run; further calls queue for a free thread.
+    New hashes use `rounds` as their cost; needs_rehash() tells whether a
+    stored hash was made with a different one.
+    """
+
+    def __init__(self, rounds: int = 12, max_workers: int = 4):
+        self.rounds = rounds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+
+    @classmethod
+    def from_env(cls) -> "PasswordHasher":
+        return cls(
+            rounds=int(os.environ.get('BCRYPT_ROUNDS', '12')),
+            max_workers=int(os.environ.get('PASSWORD_HASH_WORKERS', '4')),
+        )
+
+    def hash_sync(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(self.rounds)).decode('utf-8')
+
+    @staticmethod
+    def verify_sync(password: str, hashed: str) -> bool:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.get_running_loop().run_in_executor(self._pool, self.hash_sync, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(self._pool, self.verify_sync, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        # Hashes look like $2b$12$<salt+digest>.
+        try:
+            return int(hashed.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return False
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
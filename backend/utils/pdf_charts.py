@@ -0,0 +1,77 @@
+from typing import Any, Dict, List
+
+from reportlab.graphics.shapes import Drawing, Line, Rect, String
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+
+# Vector charts for the PDF report, drawn with reportlab.graphics primitives
+# so that rendering a report needs no plotting library or raster images.
+
+AXIS_COLOR = colors.HexColor('#cccccc')
+TICK_COLOR = colors.HexColor('#666666')
+TRACK_COLOR = colors.HexColor('#f1f5f9')
+
+
+def get_health_color(score: float) -> str:
+    if score >= 90:
+        return "green"
+    elif score >= 70:
+        return "orange"
+    else:
+        return "red"
+
+
+def _percent_axis(drawing: Drawing, x: float, y: float, width: float, label: str):
+    drawing.add(Line(x, y, x + width, y, strokeColor=AXIS_COLOR))
+    for tick in range(0, 101, 20):
+        tick_x = x + width * tick / 100
+        drawing.add(Line(tick_x, y, tick_x, y - 3, strokeColor=AXIS_COLOR))
+        drawing.add(String(tick_x, y - 12, str(tick), fontSize=8, fillColor=TICK_COLOR, textAnchor='middle'))
+    drawing.add(String(x + width / 2, y - 24, label, fontSize=9, fillColor=TICK_COLOR, textAnchor='middle'))
+
+
+def health_score_bar(score: float, label: str, width: float = 6 * inch, height: float = 1 * inch) -> Drawing:
+    """Single horizontal bar showing the health score on a 0-100 axis."""
+    drawing = Drawing(width, height)
+    bar_width = width * 0.65
+    bar_height = height * 0.3
+    x, y = 0.1 * inch, height - bar_height - 0.1 * inch
+    fill = min(max(score, 0), 100) / 100
+
+    drawing.add(Rect(x, y, bar_width, bar_height, fillColor=TRACK_COLOR, strokeColor=None))
+    drawing.add(Rect(x, y, bar_width * fill, bar_height, fillColor=colors.toColor(get_health_color(score)), strokeColor=None))
+    drawing.add(String(x + bar_width + 8, y + bar_height / 2 - 4, f"{score:.1f}%  ({label})",
+                       fontName='Helvetica-Bold', fontSize=12))
+    _percent_axis(drawing, x, y - 4, bar_width, 'Score (%)')
+    return drawing
+
+
+def column_percentage_chart(items: List[Dict[str, Any]], color, value_key: str = 'percentage',
+                            max_columns: int = 15, width: float = 6 * inch) -> Drawing:
+    """Horizontal bars of a per-column percentage, largest first.
+
+    `items` are report detail entries with a `column` and `value_key`; only
+    the first `max_columns` are drawn.
+    """
+    items = sorted(items, key=lambda item: item[value_key], reverse=True)[:max_columns]
+    row_height = 16
+    label_width = 1.8 * inch
+    value_width = 0.6 * inch
+    bar_area = width - label_width - value_width
+    height = row_height * len(items) + 36
+    drawing = Drawing(width, height)
+
+    for i, item in enumerate(items):
+        y = height - (i + 1) * row_height
+        percentage = float(item[value_key])
+        name = str(item['column'])
+        if len(name) > 28:
+            name = name[:27] + '…'
+        drawing.add(String(label_width - 6, y + 4, name, fontSize=8, textAnchor='end'))
+        drawing.add(Rect(label_width, y + 2, bar_area, row_height - 4, fillColor=TRACK_COLOR, strokeColor=None))
+        drawing.add(Rect(label_width, y + 2, bar_area * min(max(percentage, 0), 100) / 100, row_height - 4,
+                         fillColor=color, strokeColor=None))
+        drawing.add(String(label_width + bar_area + 4, y + 4, f"{percentage:.2f}%", fontSize=8))
+
+    _percent_axis(drawing, label_width, 30, bar_area, 'Rows affected (%)')
+    return drawing
@@ -9,26 +9,15 @@ from reportlab.platypus import (
     Paragraph,
     Spacer,
     PageBreak,
-    Image,
 )
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-import matplotlib
-matplotlib.use('Agg')
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from io import BytesIO
-import matplotlib.pyplot as plt
-import io
 from datetime import datetime
 from pathlib import Path
-def get_health_color(score: float) -> str:
-    if score >= 90:
-        return "green"
-    elif score >= 70:
-        return "orange"
-    else:
-        return "red"
+from utils.pdf_charts import health_score_bar, column_percentage_chart
 
 def generate_pdf_report(report_data: Dict[str, Any], filename: str, output):
     from io import BytesIO
@@ -59,6 +48,11 @@ def generate_pdf_report(report_data: Dict[str, Any], filename: str, output):
     clean_filename = Path(filename).name  
     story.append(Paragraph(f"Dataset: {clean_filename}", styles['Normal']))
     story.append(Paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+    sampling = report_data.get('sampling')
+    if report_data.get('approximate') and sampling:
+        story.append(Paragraph(
+            f"Approximate report: based on a {sampling['method']} sample of {sampling['sample_rows']} "
+            f"of {sampling['population_rows']} rows.", styles['Normal']))
     story.append(Spacer(1, 0.3 * inch))
 
     health_score = report_data['health_score']
@@ -79,26 +73,7 @@ def generate_pdf_report(report_data: Dict[str, Any], filename: str, output):
 
     score_label = get_score_label(health_score)
 
-    fig, ax = plt.subplots(figsize=(6, 1.2))
-    bar_color = get_health_color(health_score)
-    ax.barh([''], [health_score], color=bar_color, height=0.4)
-    ax.set_xlim(0, 100)
-    ax.set_xlabel('Score (%)', fontsize=10)
-    ax.set_yticks([])
-    ax.text(
-        102, 0, f"{health_score:.1f}%  ({score_label})",
-        va='center',ha='left',fontsize=12,fontweight='bold',color='black')
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_visible(False)
-    ax.spines['bottom'].set_color('#cccccc')
-    ax.tick_params(axis='x', colors='#666666')
-    plt.tight_layout(pad=1.0)
-    img_buffer = io.BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-    img_buffer.seek(0)
-    plt.close()
-    story.append(Image(img_buffer, width=5 * inch, height=1 * inch))
+    story.append(health_score_bar(health_score, score_label))
     story.append(Spacer(1, 0.2 * inch))
 
 
@@ -139,11 +114,14 @@ def generate_pdf_report(report_data: Dict[str, Any], filename: str, output):
             ('GRID', (0, 0), (-1, -1), 1, colors.black)
         ]))
         story.append(mv_table)
+        story.append(Spacer(1, 0.2 * inch))
+        story.append(column_percentage_chart(missing['details'], colors.HexColor('#f59e0b')))
     story.append(Spacer(1, 0.3 * inch))
 
     duplicates = report_data['duplicates']
     story.append(Paragraph("Duplicate Rows Analysis", heading_style))
-    story.append(Paragraph(f"Full Row Duplicates: {duplicates['full_row_duplicates']} ({duplicates['percentage']}%)", styles['Normal']))
+    approximate = " (approximate)" if duplicates.get('approximate') else ""
+    story.append(Paragraph(f"Full Row Duplicates: {duplicates['full_row_duplicates']} ({duplicates['percentage']}%){approximate}", styles['Normal']))
 
     imbalance = report_data['class_imbalance']
     story.append(Paragraph("Class Imbalance Detection", heading_style))
@@ -183,6 +161,9 @@ def generate_pdf_report(report_data: Dict[str, Any], filename: str, output):
         outliers = report_data["outliers"]
         story.append(Paragraph("Outliers Detection", heading_style))
         story.append(Paragraph(f"{outliers.get('columns_with_outliers', 0)} Columns with Outliers", styles["Normal"]))
+        if outliers.get('method'):
+            method = {"iqr": "IQR fences", "mad": "robust z-score (MAD)"}.get(outliers['method'], outliers['method'])
+            story.append(Paragraph(f"Method: {method}, threshold {outliers['threshold']:g}", styles["Normal"]))
         story.append(Spacer(1, 0.1 * inch))
 
         details = outliers.get("details", [])
@@ -201,6 +182,8 @@ def generate_pdf_report(report_data: Dict[str, Any], filename: str, output):
                 ('GRID', (0, 0), (-1, -1), 1, colors.black)
             ]))
             story.append(outlier_table)
+            story.append(Spacer(1, 0.2 * inch))
+            story.append(column_percentage_chart(details, colors.HexColor('#ef4444')))
             story.append(Spacer(1, 0.3 * inch))
 
     if "date_formats" in report_data:
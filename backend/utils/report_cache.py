@@ -0,0 +1,95 @@
+import asyncio
+import hashlib
+import json
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from utils.instrumentation import StageTimings
+from utils.report_payloads import ReportPayloadStore, report_summary
+
+
+def cache_key(content_hash: str, analyzer_version: str, config: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"content": content_hash, "analyzer": analyzer_version, "config": config},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ReportCache:
+    """Analysis results shared by every dataset with the same bytes.
+
+    Entries live in the `report_cache` collection keyed by cache_key(), so
+    identical files uploaded by different users reuse one computation.
+    Concurrent misses for the same key within this process wait on a single
+    computation instead of each running their own. The reports themselves
+    are kept in `payloads` under the same key; an entry is only written once
+    its payload is complete.
+    """
+
+    def __init__(self, db, payloads: ReportPayloadStore):
+        self.db = db
+        self.payloads = payloads
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def get(self, key: str, sections: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        entry = await self.db.report_cache.find_one({"key": key}, {"_id": 0, "key": 1, "report_data": 1})
+        if not entry:
+            return None
+        # Entries written before payloads were split out keep report_data inline.
+        if "report_data" in entry:
+            return entry["report_data"]
+        return await self.payloads.get(key, sections)
+
+    async def put(self, key: str, report_data: Dict[str, Any], metadata: Dict[str, Any]):
+        await self.payloads.put(key, report_data)
+        await self.db.report_cache.update_one(
+            {"key": key},
+            {"$set": {
+                "key": key,
+                "summary": report_summary(report_data),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                **metadata,
+            }},
+            upsert=True,
+        )
+
+    async def delete(self, key: str):
+        # The entry goes first: an entry without its payload would read as a miss anyway.
+        await self.db.report_cache.delete_one({"key": key})
+        await self.payloads.delete(key)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Dict[str, Any]]],
+                             metadata: Dict[str, Any], timings: Optional[StageTimings] = None,
+                             sections: Optional[Iterable[str]] = None):
+        """Return (report_data, cached) for `key`, computing and storing it on a miss.
+
+        Storing a computed report is recorded as the "mongo_insert" stage of
+        `timings`. With `sections` a cached report may be loaded partially
+        (see ReportPayloadStore.get); computed reports are always whole.
+        """
+        cached = await self.get(key, sections)
+        if cached is not None:
+            return cached, True
+
+        if key in self._in_flight:
+            return await asyncio.shield(self._in_flight[key]), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            report_data = await compute()
+            with timings.stage("mongo_insert", resources=False) if timings else nullcontext():
+                await self.put(key, report_data, metadata)
+            future.set_result(report_data)
+            return report_data, False
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody may be waiting; mark the exception as retrieved.
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._in_flight[key]
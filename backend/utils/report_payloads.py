@@ -0,0 +1,119 @@
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+import bson
+from bson.binary import Binary
+from pymongo import UpdateOne
+
+# Fields that grow with the size of the dataset are split off into sections of
+# their own, so that callers that do not need them never load them.
+DETACHED_FIELDS = {
+    "summary": "numeric_summary",
+    "duplicates": "duplicate_row_samples",
+}
+
+# Stays well below the 16 MB document limit.
+CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def split_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    sections = {}
+    for name, value in report.items():
+        field = DETACHED_FIELDS.get(name)
+        if field and isinstance(value, dict) and field in value:
+            # The placeholder keeps the field's position for join_report.
+            sections[name] = {**value, field: None}
+            sections[f"{name}.{field}"] = value[field]
+        else:
+            sections[name] = value
+    return sections
+
+
+def join_report(sections: Dict[str, Any]) -> Dict[str, Any]:
+    report = {}
+    for name, value in sections.items():
+        if '.' in name:
+            continue
+        field = DETACHED_FIELDS.get(name)
+        if field and isinstance(value, dict):
+            value = dict(value)
+            detached = f"{name}.{field}"
+            if detached in sections:
+                value[field] = sections[detached]
+            else:
+                value.pop(field, None)
+        report[name] = value
+    return report
+
+
+def with_detached(sections: Iterable[str]) -> List[str]:
+    # Top-level section names, plus the fields detached from them.
+    sections = list(sections)
+    return sections + [f"{name}.{DETACHED_FIELDS[name]}" for name in sections if name in DETACHED_FIELDS]
+
+
+def report_summary(report: Dict[str, Any]) -> Dict[str, Any]:
+    # Small enough to keep on the report document for listings.
+    summary = report.get("summary", {})
+    return {
+        "health_score": report.get("health_score"),
+        "approximate": report.get("approximate", False),
+        "total_rows": summary.get("total_rows"),
+        "total_columns": summary.get("total_columns"),
+    }
+
+
+class ReportPayloadStore:
+    """Report payloads kept outside the report documents.
+
+    Each top-level section of a report (plus the DETACHED_FIELDS) is BSON
+    encoded, zlib compressed and written in chunks of at most `chunk_bytes`
+    to the `report_sections` collection, so no payload runs into the BSON
+    document limit and a reader can fetch just the sections it needs.
+    Payloads are addressed by `payload_id`, the report cache key, and are
+    shared by every report with that key.
+    """
+
+    def __init__(self, db, chunk_bytes: int = CHUNK_BYTES):
+        self.collection = db.report_sections
+        self.chunk_bytes = chunk_bytes
+
+    async def put(self, payload_id: str, report: Dict[str, Any]) -> None:
+        operations = []
+        for position, (name, value) in enumerate(split_report(report).items()):
+            data = zlib.compress(bson.encode({"value": value}))
+            chunks = [data[i:i + self.chunk_bytes] for i in range(0, len(data), self.chunk_bytes)]
+            for n, chunk in enumerate(chunks):
+                # Upserts keep a rewrite of the same payload idempotent.
+                operations.append(UpdateOne(
+                    {"payload_id": payload_id, "section": name, "n": n},
+                    {"$set": {"position": position, "chunks": len(chunks), "data": Binary(chunk)}},
+                    upsert=True,
+                ))
+        await self.collection.bulk_write(operations, ordered=False)
+
+    async def delete(self, payload_id: str) -> None:
+        await self.collection.delete_many({"payload_id": payload_id})
+
+    async def get(self, payload_id: str, sections: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """Reassemble a report, or only the named top-level `sections` of it.
+
+        A detached field is only loaded when all sections are requested or
+        when it is named explicitly, e.g. "duplicates.duplicate_row_samples".
+        """
+        query = {"payload_id": payload_id}
+        if sections is not None:
+            query["section"] = {"$in": list(sections)}
+
+        chunks: Dict[str, List[bytes]] = defaultdict(list)
+        cursor = self.collection.find(query, {"_id": 0, "section": 1, "data": 1}).sort([("position", 1), ("n", 1)])
+        async for doc in cursor:
+            chunks[doc["section"]].append(doc["data"])
+        if not chunks:
+            return None
+
+        return join_report({
+            name: bson.decode(zlib.decompress(b"".join(parts)))["value"]
+            for name, parts in chunks.items()
+        })
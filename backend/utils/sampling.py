@@ -0,0 +1,115 @@
+import math
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_SAMPLE_KEY = "__sample_key__"
+
+
+class SamplingError(ValueError):
+    pass
+
+
+def reservoir_sample(chunks: Iterable["pd.DataFrame"], size: int, seed: Optional[int] = None,
+                     stratify_by: Optional[str] = None) -> Tuple["pd.DataFrame", int]:
+    """Uniform sample of `size` rows from a stream of chunks.
+
+    Every row gets a random key and the rows with the smallest keys are kept,
+    which is equivalent to reservoir sampling but vectorizes per chunk. With
+    `stratify_by`, the smallest keys are kept per stratum and the final sample
+    is allocated proportionally to stratum sizes (at least one row each).
+    Returns the sample and the number of rows seen.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    reservoir = None
+    population = 0
+    strata_counts = pd.Series(dtype='int64')
+
+    for chunk in chunks:
+        if stratify_by and stratify_by not in chunk.columns:
+            raise SamplingError(f"Column '{stratify_by}' not found in dataset")
+        # Rows are indexed by their position in the file, so the sample can be
+        # put back in file order at the end.
+        chunk = chunk.assign(**{_SAMPLE_KEY: rng.random(len(chunk))})
+        chunk.index = pd.RangeIndex(population, population + len(chunk))
+        population += len(chunk)
+        combined = chunk if reservoir is None else pd.concat([reservoir, chunk])
+        if stratify_by:
+            strata_counts = strata_counts.add(chunk[stratify_by].value_counts(dropna=False), fill_value=0)
+            reservoir = combined.sort_values(_SAMPLE_KEY).groupby(stratify_by, dropna=False, sort=False).head(size)
+        else:
+            reservoir = combined.nsmallest(size, _SAMPLE_KEY)
+
+    if reservoir is None:
+        return pd.DataFrame(), 0
+
+    if stratify_by and population > size:
+        allocation = (strata_counts / population * size).round().clip(lower=1).astype(int)
+        reservoir = reservoir.sort_values(_SAMPLE_KEY)
+        ranks = reservoir.groupby(stratify_by, dropna=False, sort=False).cumcount()
+        # NaN strata are looked up by position since NaN != NaN.
+        limits = reservoir[stratify_by].map(allocation).fillna(allocation[allocation.index.isna()].sum())
+        reservoir = reservoir[ranks.to_numpy() < limits.to_numpy()]
+
+    return reservoir.sort_index().drop(columns=_SAMPLE_KEY).reset_index(drop=True), population
+
+
+def proportion_interval(successes: float, n: int, population: Optional[int] = None,
+                        z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for a proportion, in percent.
+
+    Uses the finite population correction when the population size is known,
+    so a sample that covers the whole population yields a zero-width interval.
+    """
+    if n <= 0:
+        return (0.0, 100.0)
+    p = successes / n
+    if population and population > 1:
+        if n >= population:
+            return (round(p * 100, 2), round(p * 100, 2))
+        n = n * (population - 1) / (population - n)
+    denominator = 1 + z ** 2 / n
+    centre = (p + z ** 2 / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return (round(max(0.0, centre - margin) * 100, 2), round(min(1.0, centre + margin) * 100, 2))
+
+
+def annotate_sampled_report(report: Dict[str, Any], sample_rows: int, population_rows: int,
+                            method: str, stratify_by: Optional[str] = None) -> Dict[str, Any]:
+    """Mark a report computed on a sample as approximate and add 95% intervals.
+
+    Every item carrying a `percentage` gets a `confidence_interval` [low, high]
+    for the corresponding population percentage.
+    """
+    cols = report["summary"]["total_columns"]
+
+    missing = report["missing_values"]
+    missing["confidence_interval"] = proportion_interval(
+        missing["total_missing"], missing["total_cells"], population_rows * cols)
+    for item in missing["details"]:
+        item["confidence_interval"] = proportion_interval(item["count"], sample_rows, population_rows)
+
+    duplicates = report["duplicates"]
+    duplicates["confidence_interval"] = proportion_interval(
+        duplicates["full_row_duplicates"], sample_rows, population_rows)
+    for item in duplicates["column_duplicates"]:
+        item["confidence_interval"] = proportion_interval(item["count"], sample_rows, population_rows)
+
+    for item in report["outliers"]["details"]:
+        item["confidence_interval"] = proportion_interval(item["outlier_count"], sample_rows, population_rows)
+
+    report["approximate"] = sample_rows < population_rows
+    report["sampling"] = {
+        "method": method,
+        "stratify_by": stratify_by,
+        "sample_rows": sample_rows,
+        "population_rows": population_rows,
+        "confidence_level": 0.95,
+        # Two copies of a row rarely land in the same sample.
+        "notes": "Duplicate counts only cover duplicates within the sample and understate the full-file rate.",
+    }
+    return report
@@ -0,0 +1,83 @@
+from typing import Any, Iterable, Iterator, List, Optional
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+# JSON encoding of API responses with orjson. Reports can be tens of MB, so
+# they are written out piece by piece: dicts down to STREAM_DEPTH levels are
+# encoded one key at a time and sent in chunks of about STREAM_CHUNK_BYTES,
+# instead of building the whole document first. StreamingResponse runs the
+# encoder in the threadpool, so the event loop never waits on a large report.
+
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+STREAM_CHUNK_BYTES = 64 * 1024
+# A response's report_data sections (response -> report_data -> section) are
+# split into their fields; each field is encoded in one go.
+STREAM_DEPTH = 3
+
+
+def _default(obj: Any) -> Any:
+    # Values orjson does not encode natively: pandas missing values and
+    # timestamps, numpy scalars outside OPT_SERIALIZE_NUMPY, and sets.
+    if type(obj).__name__ in ('NAType', 'NaTType'):
+        return None
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    if hasattr(obj, 'item'):
+        return obj.item()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_default, option=OPTIONS)
+
+
+def stringify_keys(obj):
+    # Reports are stored as BSON, which only takes string keys.
+    if isinstance(obj, dict):
+        return {str(k): stringify_keys(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [stringify_keys(i) for i in obj]
+    else:
+        return obj
+
+
+def iter_json(obj: Any, depth: int = STREAM_DEPTH) -> Iterator[bytes]:
+    """dumps(obj) in pieces: dicts less than `depth` levels deep are written key by key."""
+    if depth <= 0 or not isinstance(obj, dict) or not obj:
+        yield dumps(obj)
+        return
+    separator = b'{'
+    for key, value in obj.items():
+        yield separator + dumps(str(key)) + b':'
+        yield from iter_json(value, depth - 1)
+        separator = b','
+    yield b'}'
+
+
+def _chunked(pieces: Iterable[bytes], chunk_bytes: int) -> Iterator[bytes]:
+    buffer: List[bytes] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_bytes:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def select_fields(report: dict, fields: Optional[List[str]]) -> dict:
+    # Top-level report sections named in a `fields=` selector, in report order.
+    if fields is None:
+        return report
+    return {name: value for name, value in report.items() if name in fields}
+
+
+def json_stream_response(content: Any, status_code: int = 200, headers: Optional[dict] = None,
+                         chunk_bytes: int = STREAM_CHUNK_BYTES) -> StreamingResponse:
+    return StreamingResponse(_chunked(iter_json(content), chunk_bytes), status_code=status_code,
+                             headers=headers, media_type="application/json")
@@ -0,0 +1,304 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List
+
+# Mergeable summaries used by the chunked analyzer. Each one can be updated
+# with one chunk at a time and merged with another instance of the same kind,
+# so statistics for a file can be built piecewise and combined later.
+
+
+class QuantileSketch:
+    """KLL-style compacting quantile sketch.
+
+    Level `i` holds values that each stand for 2**i originals. While fewer than
+    `k` values have been seen nothing is compacted and answers are exact.
+    """
+
+    def __init__(self, k: int = 2048):
+        self.k = k
+        self.count = 0
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._offset = 0
+
+    @property
+    def is_exact(self) -> bool:
+        return len(self.levels) == 1
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, values in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self.count += other.count
+        self._compress()
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) > self.k:
+                values = np.sort(values)
+                # An odd element stays behind; the rest is halved and promoted.
+                keep = values[:1] if len(values) % 2 else values[:0]
+                values = values[len(keep):]
+                self._offset ^= 1
+                promoted = values[self._offset::2]
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def _weighted(self):
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(v), 2 ** i, dtype=float) for i, v in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        return values[order], weights[order]
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return float('nan')
+        if self.is_exact:
+            return float(np.quantile(self.levels[0], q))
+        values, weights = self._weighted()
+        cumulative = np.cumsum(weights)
+        index = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return float(values[min(index, len(values) - 1)])
+
+    def median_absolute_deviation(self, center: float) -> float:
+        if self.count == 0:
+            return float('nan')
+        if self.is_exact:
+            return float(np.median(np.abs(self.levels[0] - center)))
+        values, weights = self._weighted()
+        deviations = np.abs(values - center)
+        order = np.argsort(deviations, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        index = np.searchsorted(cumulative, 0.5 * cumulative[-1], side='left')
+        return float(deviations[order][min(index, len(order) - 1)])
+
+    def count_below(self, x: float) -> float:
+        values, weights = self._weighted()
+        return float(weights[values < x].sum()) * self._scale()
+
+    def count_above(self, x: float) -> float:
+        values, weights = self._weighted()
+        return float(weights[values > x].sum()) * self._scale()
+
+    def _scale(self) -> float:
+        # Compaction keeps total weight close to, but not exactly, `count`.
+        total = sum(len(v) * 2 ** i for i, v in enumerate(self.levels))
+        return self.count / total if total else 0.0
+
+
+class HeavyHitters:
+    """Weighted Misra-Gries counter keeping at most `capacity` values.
+
+    Counts are exact until more than `capacity` distinct values have been
+    seen; after that `overflowed` is set and each count may be low by at most
+    `error_bound`.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+        self.total = 0
+        self.error_bound = 0
+        self.overflowed = False
+
+    def update(self, value_counts: pd.Series) -> None:
+        if len(value_counts) > self.capacity:
+            # Values below the top `capacity` of this chunk would be pruned
+            # anyway; dropping them up front keeps the Python loop short.
+            value_counts = value_counts.sort_values(ascending=False)
+            dropped = int(value_counts.iloc[self.capacity])
+            self.total += int(value_counts.iloc[self.capacity:].sum())
+            value_counts = value_counts.iloc[:self.capacity]
+            self.error_bound += dropped
+            self.overflowed = True
+        for value, count in value_counts.items():
+            self.counts[value] = self.counts.get(value, 0) + int(count)
+            self.total += int(count)
+        self._prune()
+
+    def merge(self, other: "HeavyHitters") -> None:
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        self.total += other.total
+        self.error_bound += other.error_bound
+        self.overflowed = self.overflowed or other.overflowed
+        self._prune()
+
+    def _prune(self) -> None:
+        if len(self.counts) <= self.capacity:
+            return
+        threshold = sorted(self.counts.values(), reverse=True)[self.capacity]
+        self.counts = {v: c - threshold for v, c in self.counts.items() if c > threshold}
+        self.error_bound += threshold
+        self.overflowed = True
+
+    def value_counts(self) -> pd.Series:
+        counts = pd.Series(self.counts, dtype='int64')
+        if counts.empty:
+            return counts
+        return counts.sort_values(ascending=False, kind='stable')
+
+
+class DistinctCounter:
+    """K-minimum-values distinct count estimate over 64-bit value hashes.
+
+    Exact while fewer than `k` distinct hashes have been seen.
+    """
+
+    def __init__(self, k: int = 4096):
+        self.k = k
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, values: pd.Series) -> None:
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        self._keep(np.concatenate([self.hashes, hashes]))
+
+    def merge(self, other: "DistinctCounter") -> None:
+        self._keep(np.concatenate([self.hashes, other.hashes]))
+
+    def _keep(self, hashes: np.ndarray) -> None:
+        self.hashes = np.unique(hashes)[:self.k]
+
+    @property
+    def is_exact(self) -> bool:
+        return len(self.hashes) < self.k
+
+    def estimate(self) -> int:
+        if self.is_exact:
+            return len(self.hashes)
+        kth = float(self.hashes[-1]) / 2 ** 64
+        return int(round((self.k - 1) / kth))
+
+
+class RowHashCounter:
+    """Counts total and duplicate rows from 64-bit row fingerprints in bounded memory.
+
+    Distinct sampling over the hash space: every distinct fingerprint below a
+    threshold is kept with its number of occurrences. Since all occurrences
+    of a row share its fingerprint, duplicates among the kept rows are
+    counted exactly. Whenever more than `capacity` fingerprints are kept the
+    threshold is halved and the rest dropped, and duplicate counts are scaled
+    up by the inverse of the share of the hash space still sampled. Exact
+    (`is_exact`) until the threshold is first lowered. Holds at most about
+    `capacity` fingerprints and counts (16 bytes each) plus one pending batch.
+    """
+
+    def __init__(self, capacity: int = 1 << 20):
+        self.capacity = capacity
+        self.total = 0
+        # Fingerprints below 2 ** (64 - level) are sampled.
+        self.level = 0
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self._pending: List[np.ndarray] = []
+        self._pending_size = 0
+
+    @property
+    def is_exact(self) -> bool:
+        return self.level == 0
+
+    def _sampled(self, hashes: np.ndarray) -> np.ndarray:
+        if self.level == 0:
+            return hashes
+        return hashes[(hashes >> np.uint64(64 - self.level)) == 0]
+
+    def update(self, hashes: np.ndarray) -> None:
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        self.total += len(hashes)
+        hashes = self._sampled(hashes)
+        self._pending.append(hashes)
+        self._pending_size += len(hashes)
+        if self._pending_size >= max(len(self.hashes), 65536):
+            self._flush()
+
+    def merge(self, other: "RowHashCounter") -> None:
+        other._flush()
+        self._flush()
+        self.total += other.total
+        self.level = max(self.level, other.level)
+        self._fold(np.concatenate([self.hashes, other.hashes]), np.concatenate([self.counts, other.counts]))
+
+    def _flush(self) -> None:
+        if self._pending:
+            pending = np.concatenate(self._pending)
+            self._pending = []
+            self._pending_size = 0
+            self._fold(np.concatenate([self.hashes, pending]),
+                       np.concatenate([self.counts, np.ones(len(pending), dtype=np.int64)]))
+
+    def _fold(self, hashes: np.ndarray, counts: np.ndarray) -> None:
+        keep = (hashes >> np.uint64(64 - self.level)) == 0 if self.level else slice(None)
+        hashes, inverse = np.unique(hashes[keep], return_inverse=True)
+        counts = np.bincount(inverse, weights=counts[keep], minlength=len(hashes)).astype(np.int64)
+        while len(hashes) > self.capacity:
+            self.level += 1
+            keep = (hashes >> np.uint64(64 - self.level)) == 0
+            hashes, counts = hashes[keep], counts[keep]
+        self.hashes, self.counts = hashes, counts
+
+    def duplicates(self) -> int:
+        self._flush()
+        sampled = int(self.counts.sum()) - len(self.hashes)
+        return min(self.total, int(round(sampled * 2 ** self.level)))
+
+    def distinct(self) -> int:
+        return self.total - self.duplicates()
+
+    def __getstate__(self):
+        self._flush()
+        return self.__dict__.copy()
+
+
+class Moments:
+    """Running count, mean, variance (Chan et al. merge), min and max."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        other = Moments()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        self.merge(other)
+
+    def merge(self, other: "Moments") -> None:
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else float('nan')
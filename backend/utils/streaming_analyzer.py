@@ -0,0 +1,349 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, Iterable, Optional
+from pandas.tseries.api import guess_datetime_format
+
+from utils.data_analyzer import DATE_LIKE_KEYWORDS, DataQualityAnalyzer, null_safe_records, row_fingerprints
+from utils.sketches import QuantileSketch, HeavyHitters, DistinctCounter, RowHashCounter, Moments
+from utils.type_inference import text_parse_counts, merge_parse_counts, resolve_text_type
+from utils.outliers import sketch_outliers, outlier_settings as default_outlier_settings
+
+
+def _is_numeric(dtype) -> bool:
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+class ColumnAccumulator:
+    def __init__(self, name, sketch_size: int, heavy_hitter_capacity: int, distinct_k: int):
+        self.name = name
+        self.dtypes = []
+        self.rows = 0
+        self.null_count = 0
+        self.moments = Moments()
+        self.quantiles = QuantileSketch(sketch_size)
+        self.heavy_hitters = HeavyHitters(heavy_hitter_capacity)
+        self.distinct = DistinctCounter(distinct_k)
+        self.parse_counts = None
+        self.is_date_like = any(keyword in str(name).lower() for keyword in DATE_LIKE_KEYWORDS)
+        self.date_parse_nulls = 0
+        # pd.to_datetime guesses a format from the first non-null value and
+        # applies it to the whole series. Guessing again on every chunk would
+        # count a different set of values as invalid than one pass over the
+        # column does, so the first chunk with a value fixes it for the rest.
+        self.date_format = None
+        self.date_format_fixed = False
+        self.sample_values = []
+
+    def update(self, series: pd.Series) -> None:
+        dtype = series.dtype
+        if str(dtype) not in [str(d) for d in self.dtypes]:
+            self.dtypes.append(dtype)
+
+        non_null = series.dropna()
+        self.rows += len(series)
+        self.null_count += len(series) - len(non_null)
+        self.distinct.update(non_null)
+
+        if _is_numeric(dtype):
+            self.moments.update(non_null.to_numpy())
+            self.quantiles.update(non_null.to_numpy())
+        # Numeric chunks are counted too until the counter overflows: a column
+        # read_csv typed as numbers in one chunk can turn out to be text later.
+        if dtype == 'object' or isinstance(dtype, pd.CategoricalDtype) or not self.heavy_hitters.overflowed:
+            self.heavy_hitters.update(series.value_counts())
+
+        if dtype == 'object':
+            self.parse_counts = merge_parse_counts(
+                self.parse_counts, text_parse_counts(non_null, DataQualityAnalyzer.TYPE_SAMPLE_SIZE))
+        elif _is_numeric(dtype):
+            # Counted in case a later chunk turns the column into text.
+            numbers = len(non_null)
+            self.parse_counts = merge_parse_counts(
+                self.parse_counts, {"values": numbers, "numeric": numbers, "datetime": 0, "sampled": False})
+
+        if self.is_date_like:
+            try:
+                parsed = self._parse_dates(series)
+                self.date_parse_nulls += int(parsed.isnull().sum())
+            except Exception:
+                self.date_parse_nulls += len(series)
+            if len(self.sample_values) < 3:
+                self.sample_values.extend(non_null.head(3 - len(self.sample_values)).tolist())
+
+    def _parse_dates(self, series: pd.Series) -> pd.Series:
+        if not self.date_format_fixed:
+            non_null = series.dropna()
+            if len(non_null) == 0:
+                return pd.to_datetime(series, errors='coerce')
+            first = non_null.iloc[0]
+            if isinstance(first, str):
+                self.date_format = guess_datetime_format(first)
+            self.date_format_fixed = True
+        if self.date_format is not None:
+            return pd.to_datetime(series, errors='coerce', format=self.date_format)
+        if series.dtype == 'object':
+            # No format could be guessed from the first value, so every value
+            # is parsed on its own, as a single pass would.
+            return pd.to_datetime(series, errors='coerce', format='mixed')
+        return pd.to_datetime(series, errors='coerce')
+
+    def merge(self, other: "ColumnAccumulator") -> None:
+        for dtype in other.dtypes:
+            if str(dtype) not in [str(d) for d in self.dtypes]:
+                self.dtypes.append(dtype)
+        self.rows += other.rows
+        self.null_count += other.null_count
+        self.moments.merge(other.moments)
+        self.quantiles.merge(other.quantiles)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        self.distinct.merge(other.distinct)
+        if other.parse_counts is not None:
+            self.parse_counts = merge_parse_counts(self.parse_counts, other.parse_counts)
+        self.date_parse_nulls += other.date_parse_nulls
+        # Accumulators merge in row order, so the earlier one's format stands.
+        if not self.date_format_fixed:
+            self.date_format = other.date_format
+            self.date_format_fixed = other.date_format_fixed
+        self.sample_values = (self.sample_values + other.sample_values)[:3]
+
+    def resolved_dtype(self) -> str:
+        if len(self.dtypes) == 1:
+            return str(self.dtypes[0])
+        if self.dtypes and all(_is_numeric(d) for d in self.dtypes):
+            try:
+                return str(np.result_type(*self.dtypes))
+            except TypeError:
+                return 'float64'
+        if self.dtypes and all(isinstance(d, pd.CategoricalDtype) for d in self.dtypes):
+            return 'category'
+        return 'object'
+
+
+class DatasetAccumulator:
+    """Mergeable per-column and per-row statistics for a dataset.
+
+    Built one chunk at a time; two accumulators over different parts of the
+    same dataset can be merged into one covering both.
+    """
+
+    def __init__(self, sketch_size: int = 2048, heavy_hitter_capacity: int = 1000,
+                 distinct_k: int = 4096, sample_limit: int = 100, sample_window: int = 100_000):
+        self.sketch_size = sketch_size
+        self.heavy_hitter_capacity = heavy_hitter_capacity
+        self.distinct_k = distinct_k
+        self.sample_limit = sample_limit
+        self.sample_window = sample_window
+        self.rows = 0
+        self.columns: Dict[Any, ColumnAccumulator] = {}
+        self.row_hashes = RowHashCounter()
+        self.raw_row_hashes = RowHashCounter()
+        self.duplicate_samples = []
+        self._seen_hashes = set()
+
+    def _column(self, name) -> ColumnAccumulator:
+        if name not in self.columns:
+            self.columns[name] = ColumnAccumulator(
+                name, self.sketch_size, self.heavy_hitter_capacity, self.distinct_k)
+        return self.columns[name]
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        chunk = chunk.reset_index(drop=True)
+        self.rows += len(chunk)
+        for col in chunk.columns:
+            self._column(col).update(chunk[col])
+
+        hashes = row_fingerprints(chunk)
+        if hashes is not None:
+            self.row_hashes.update(hashes)
+            self._collect_duplicate_samples(chunk, hashes)
+        raw_hashes = row_fingerprints(chunk, normalize=False)
+        if raw_hashes is not None:
+            self.raw_row_hashes.update(raw_hashes)
+
+    def _collect_duplicate_samples(self, chunk: pd.DataFrame, hashes: np.ndarray) -> None:
+        # Samples only need to be representative, so duplicates are spotted
+        # within the chunk and against a bounded window of earlier rows.
+        if len(self.duplicate_samples) < self.sample_limit:
+            mask = pd.Series(hashes).duplicated(keep=False).to_numpy()
+            if self._seen_hashes:
+                mask |= np.fromiter((h in self._seen_hashes for h in hashes.tolist()), dtype=bool, count=len(hashes))
+            if mask.any():
+                remaining = self.sample_limit - len(self.duplicate_samples)
+                self.duplicate_samples.extend(null_safe_records(chunk.loc[mask].head(remaining)))
+        if len(self._seen_hashes) < self.sample_window:
+            self._seen_hashes.update(hashes[:self.sample_window - len(self._seen_hashes)].tolist())
+
+    def merge(self, other: "DatasetAccumulator") -> None:
+        # Columns missing from one side were absent from its rows; count them as nulls.
+        for name, column in self.columns.items():
+            if name not in other.columns:
+                column.rows += other.rows
+                column.null_count += other.rows
+        for name, column in other.columns.items():
+            if name not in self.columns:
+                self._column(name).rows = self.rows
+                self.columns[name].null_count = self.rows
+            self.columns[name].merge(column)
+        self.rows += other.rows
+        self.row_hashes.merge(other.row_hashes)
+        self.raw_row_hashes.merge(other.raw_row_hashes)
+        self.duplicate_samples = (self.duplicate_samples + other.duplicate_samples)[:self.sample_limit]
+
+
+class StreamingDataQualityAnalyzer(DataQualityAnalyzer):
+    """DataQualityAnalyzer over an iterator of DataFrame chunks.
+
+    Only one chunk is held in memory at a time. Counts, nulls, min/max and
+    type inference are exact; quartiles, outlier counts, high-cardinality
+    distinct counts and, past RowHashCounter's capacity, full-row duplicate
+    counts come from sketches and are approximate for large inputs.
+    The report has the same schema as DataQualityAnalyzer.generate_full_report.
+    """
+
+    def __init__(self, chunks: Iterable[pd.DataFrame] = (), accumulator: Optional[DatasetAccumulator] = None,
+                 duplicate_sample_limit: int = 100, outlier_settings: Optional[Dict[str, Any]] = None):
+        if accumulator is None:
+            accumulator = DatasetAccumulator(sample_limit=duplicate_sample_limit)
+        self.accumulator = accumulator
+        for chunk in chunks:
+            self.accumulator.update(chunk)
+        self.df = None
+        self.total_rows = self.accumulator.rows
+        self.total_cols = len(self.accumulator.columns)
+        self.duplicate_sample_limit = self.accumulator.sample_limit
+        self.outlier_settings = outlier_settings or default_outlier_settings()
+        self._profile = None
+        self._fingerprints = None
+
+    def _build_profile(self) -> Dict[str, Dict[str, Any]]:
+        profile = {}
+        for col, acc in self.accumulator.columns.items():
+            dtype = acc.resolved_dtype()
+            is_categorical = dtype in ('object', 'category')
+            info = {
+                "dtype": dtype,
+                "is_numeric": not is_categorical and _is_numeric(pd.api.types.pandas_dtype(dtype)),
+                "is_categorical": is_categorical,
+                "null_count": acc.null_count,
+                "value_counts": None,
+            }
+
+            value_counts = acc.heavy_hitters.value_counts()
+            if dtype == 'object' and len(acc.dtypes) > 1:
+                # Values from chunks pandas parsed as numbers would have been
+                # read as text had the whole file been loaded at once.
+                value_counts = value_counts.groupby(value_counts.index.map(str), sort=False).sum()
+                value_counts = value_counts.sort_values(ascending=False, kind='stable')
+            if not acc.heavy_hitters.overflowed:
+                info["unique_count"] = int((value_counts > 0).sum())
+            else:
+                info["unique_count"] = min(acc.distinct.estimate(), acc.rows - acc.null_count)
+            if is_categorical and info["unique_count"] < self.CATEGORICAL_PROFILE_LIMIT:
+                info["value_counts"] = value_counts
+                if dtype == 'object':
+                    info["cleaned_unique_count"] = len({v.strip().lower() for v in value_counts.index if isinstance(v, str)})
+                else:
+                    info["cleaned_unique_count"] = info["unique_count"]
+
+            distinct = info["unique_count"] + (1 if acc.null_count > 0 else 0)
+            info["duplicate_count"] = max(0, self.total_rows - distinct)
+
+            if info["is_numeric"]:
+                info.update(sketch_outliers(acc.quantiles, self.outlier_settings, col))
+                info.update({"min": acc.moments.min, "max": acc.moments.max})
+
+            if dtype == 'object':
+                counts = acc.parse_counts or {"values": 0, "numeric": 0, "datetime": 0, "sampled": False}
+                info.update(resolve_text_type(counts, self.MOSTLY_TYPE_THRESHOLD))
+
+            profile[col] = info
+        return profile
+
+    def _raw_duplicate_count(self) -> int:
+        return self.accumulator.raw_row_hashes.duplicates()
+
+    def check_duplicates(self) -> Dict[str, Any]:
+        duplicate_count = self.accumulator.row_hashes.duplicates()
+        column_duplicates = []
+        for col, info in self.profile.items():
+            dup_count = info["duplicate_count"]
+            if dup_count > 0:
+                column_duplicates.append({
+                    "column": col, "count": int(dup_count), "percentage": round((dup_count / self.total_rows) * 100, 2)})
+
+        return {
+            "full_row_duplicates": int(duplicate_count),
+            "percentage": round((duplicate_count / self.total_rows) * 100, 2),
+            "approximate": not self.accumulator.row_hashes.is_exact,
+            "duplicate_row_samples": self.accumulator.duplicate_samples,
+            "column_duplicates": sorted(column_duplicates, key=lambda x: x['percentage'], reverse=True)}
+
+    def check_date_formats(self) -> Dict[str, Any]:
+        date_analysis = []
+        for col, acc in self.accumulator.columns.items():
+            if not acc.is_date_like:
+                continue
+            null_after_parse = acc.date_parse_nulls + (self.total_rows - acc.rows)
+            original_null = self.profile[col]["null_count"]
+
+            if null_after_parse > original_null:
+                date_analysis.append({
+                    "column": col,
+                    "status": "Invalid date formats detected",
+                    "valid_dates": int(self.total_rows - null_after_parse),
+                    "invalid_dates": int(null_after_parse - original_null),
+                    "sample_values": acc.sample_values
+                })
+            elif null_after_parse == original_null and null_after_parse < self.total_rows:
+                date_analysis.append({
+                    "column": col,
+                    "status": "Valid date column",
+                    "valid_dates": int(self.total_rows - null_after_parse),
+                    "invalid_dates": 0,
+                    "sample_values": acc.sample_values
+                })
+
+        return {
+            "date_columns_found": len(date_analysis),
+            "details": date_analysis
+        }
+
+    def get_summary_statistics(self) -> Dict[str, Any]:
+        numeric_summary = {}
+        for col, info in self.profile.items():
+            if not info["is_numeric"]:
+                continue
+            acc = self.accumulator.columns[col]
+            numeric_summary[col] = {
+                "count": float(acc.moments.count),
+                "mean": acc.moments.mean if acc.moments.count else float('nan'),
+                "std": acc.moments.std,
+                "min": acc.moments.min if acc.moments.count else float('nan'),
+                "25%": acc.quantiles.quantile(0.25),
+                "50%": acc.quantiles.quantile(0.5),
+                "75%": acc.quantiles.quantile(0.75),
+                "max": acc.moments.max if acc.moments.count else float('nan'),
+            }
+
+        # Like DataFrame.describe(), fall back to the text columns when there
+        # are no numeric ones.
+        if not numeric_summary:
+            for col, info in self.profile.items():
+                if not info["is_categorical"]:
+                    continue
+                acc = self.accumulator.columns[col]
+                counts = info["value_counts"] if info["value_counts"] is not None else acc.heavy_hitters.value_counts()
+                numeric_summary[col] = {
+                    "count": acc.rows - acc.null_count,
+                    "unique": info["unique_count"],
+                    "top": counts.index[0] if len(counts) else None,
+                    "freq": int(counts.iloc[0]) if len(counts) else None,
+                }
+
+        return {
+            "total_rows": self.total_rows,
+            "total_columns": self.total_cols,
+            "numeric_columns": sum(1 for info in self.profile.values() if info["is_numeric"]),
+            "categorical_columns": sum(1 for info in self.profile.values() if info["is_categorical"]),
+            "numeric_summary": numeric_summary
+        }
@@ -0,0 +1,304 @@
+import importlib
+import io
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+
+from utils.columnar import columnar_columns, columnar_path, read_columnar, skip_marker_path, write_columnar
+from utils.instrumentation import StageTimings
+from utils.jobs import job_progress_reporter
+from utils.outliers import outlier_settings
+from utils.serialization import stringify_keys
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from utils.data_analyzer import DataQualityAnalyzer
+    from utils.streaming_analyzer import DatasetAccumulator
+
+# Entry points executed inside the analysis process pool. They take paths and
+# plain data so that only small, picklable arguments cross the process boundary.
+# pandas, the analyzers and ReportLab are imported inside the functions, so the
+# API process can import this module without loading the analysis stack.
+
+SUPPORTED_EXTENSIONS = ('.csv', '.xlsx', '.xls', '.json')
+
+# Bump whenever a change to the checks alters report output, so that cached
+# reports computed by an older analyzer are not served.
+ANALYZER_VERSION = "8"
+
+# CSV files larger than this are analyzed chunk by chunk instead of being
+# loaded into a single DataFrame.
+STREAMING_THRESHOLD_BYTES = int(os.environ.get('STREAMING_THRESHOLD_BYTES', str(512 * 1024 * 1024)))
+STREAMING_CHUNK_ROWS = int(os.environ.get('STREAMING_CHUNK_ROWS', '200000'))
+DUPLICATE_SAMPLE_LIMIT = int(os.environ.get('DUPLICATE_SAMPLE_LIMIT', '100'))
+# Cores used to profile the columns of a wide file within one analysis
+# ("thread" or "process" workers, see utils/parallel_profile.py).
+PROFILE_WORKERS = int(os.environ.get('PROFILE_WORKERS', '1'))
+PROFILE_MODE = os.environ.get('PROFILE_MODE', 'process')
+
+ANALYSIS_MODULES = (
+    'pandas',
+    'utils.data_analyzer',
+    'utils.loader',
+    'utils.streaming_analyzer',
+    'utils.sampling',
+    'utils.pdf_generator',
+)
+
+
+def analysis_config(outliers: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # Settings that change the report produced for the same file; part of the report cache key.
+    return {
+        "duplicate_sample_limit": DUPLICATE_SAMPLE_LIMIT,
+        "streaming_threshold_bytes": STREAMING_THRESHOLD_BYTES,
+        "streaming_chunk_rows": STREAMING_CHUNK_ROWS,
+        "outliers": outliers or outlier_settings(),
+    }
+
+
+def warm_up() -> List[str]:
+    # Imports the analysis stack ahead of the first request that needs it.
+    return [importlib.import_module(name).__name__ for name in ANALYSIS_MODULES]
+
+
+def read_source(file_path, filename: str, columns: Optional[List[str]] = None) -> "pd.DataFrame":
+    import pandas as pd
+    file_path = Path(file_path)
+    if filename.endswith('.csv'):
+        return pd.read_csv(file_path, usecols=columns)
+    elif filename.endswith(('.xlsx', '.xls')):
+        return pd.read_excel(file_path, usecols=columns)
+    df = pd.read_json(file_path)
+    return df[columns] if columns else df
+
+
+def split_workbook(file_path: str) -> List[Dict[str, str]]:
+    """Write each sheet of a multi-sheet workbook to a workbook of its own.
+
+    Returns [{"sheet", "file_path"}] in sheet order, or [] for a single-sheet
+    workbook, which is analyzed as it is. The sheet files are written next to
+    `file_path` for the caller to rename (with utils.columnar.move_columnar),
+    each with the columnar cache of the parsed sheet, so analyzing a sheet
+    does not parse it from Excel a second time.
+    """
+    import pandas as pd
+
+    sheets = []
+    try:
+        with pd.ExcelFile(file_path) as workbook:
+            if len(workbook.sheet_names) < 2:
+                return []
+            for i, name in enumerate(workbook.sheet_names):
+                sheets.append({"sheet": str(name), "file_path": f"{file_path}.sheet{i}.xlsx"})
+                # One sheet in memory at a time.
+                frame = workbook.parse(name)
+                frame.to_excel(sheets[-1]['file_path'], index=False)
+                write_columnar(frame, sheets[-1]['file_path'])
+    except BaseException:
+        for sheet in sheets:
+            Path(sheet['file_path']).unlink(missing_ok=True)
+            columnar_path(sheet['file_path']).unlink(missing_ok=True)
+            skip_marker_path(sheet['file_path']).unlink(missing_ok=True)
+        raise
+    return sheets
+
+
+def dataset_columns(file_path, filename: str) -> List[str]:
+    import pandas as pd
+    columns = columnar_columns(file_path)
+    if columns is not None:
+        return columns
+    if filename.endswith('.csv'):
+        return [str(col) for col in pd.read_csv(file_path, nrows=0).columns]
+    elif filename.endswith(('.xlsx', '.xls')):
+        return [str(col) for col in pd.read_excel(file_path, nrows=0).columns]
+    return [str(col) for col in read_source(file_path, filename).columns]
+
+
+def resolve_columns(file_path, filename: str, columns: Optional[List[str]]) -> Optional[List[str]]:
+    from utils.loader import select_columns
+
+    if not columns:
+        return None
+    return select_columns(dataset_columns(file_path, filename), columns)
+
+
+def read_dataset(file_path, filename: str, columns: Optional[List[str]] = None) -> "pd.DataFrame":
+    df = read_columnar(file_path, columns)
+    if df is not None:
+        return df
+    df = read_source(file_path, filename)
+    write_columnar(df, file_path)
+    return df[columns] if columns else df
+
+
+def load_dataset(file_path, filename: str, columns: Optional[List[str]] = None) -> Tuple["pd.DataFrame", Dict[str, Any]]:
+    """read_dataset with the lean dtypes of utils.loader.
+
+    Returns the frame and {"source_dtypes", "memory"} from optimize_frame.
+    """
+    from utils.loader import optimize_frame
+
+    df = read_columnar(file_path, columns, strings=True)
+    if df is None:
+        df = read_dataset(file_path, filename, columns)
+    return optimize_frame(df)
+
+
+def use_streaming(file_path, filename: str) -> bool:
+    return filename.endswith('.csv') and Path(file_path).stat().st_size > STREAMING_THRESHOLD_BYTES
+
+
+def build_analyzer(file_path, filename: str, outliers: Optional[Dict[str, Any]] = None,
+                   columns: Optional[List[str]] = None) -> "DataQualityAnalyzer":
+    import pandas as pd
+    from utils.data_analyzer import DataQualityAnalyzer
+    from utils.streaming_analyzer import StreamingDataQualityAnalyzer
+
+    columns = resolve_columns(file_path, filename, columns)
+    if use_streaming(file_path, filename):
+        return StreamingDataQualityAnalyzer(
+            pd.read_csv(file_path, chunksize=STREAMING_CHUNK_ROWS, usecols=columns),
+            duplicate_sample_limit=DUPLICATE_SAMPLE_LIMIT, outlier_settings=outliers)
+    df, loaded = load_dataset(file_path, filename, columns)
+    return DataQualityAnalyzer(df, duplicate_sample_limit=DUPLICATE_SAMPLE_LIMIT, outlier_settings=outliers,
+                               profile_workers=PROFILE_WORKERS, profile_mode=PROFILE_MODE,
+                               source_dtypes=loaded["source_dtypes"], memory_usage=loaded["memory"])
+
+
+def read_chunks(file_path, filename: str, columns: Optional[List[str]] = None):
+    import pandas as pd
+    if use_streaming(file_path, filename) and not columnar_path(file_path).exists():
+        return pd.read_csv(file_path, chunksize=STREAMING_CHUNK_ROWS, usecols=columns)
+    return [read_dataset(file_path, filename, columns)]
+
+
+def accumulate_versions(versions: List[Dict[str, Any]]) -> "DatasetAccumulator":
+    """Mergeable statistics of a dataset through the last of `versions`.
+
+    Starts from the newest version with a saved state and reads only the
+    files of the versions after it, saving the state of each one read.
+    """
+    from utils.dataset_state import load_state, save_state
+    from utils.streaming_analyzer import DatasetAccumulator
+
+    accumulator = None
+    start = 0
+    for i in range(len(versions) - 1, -1, -1):
+        accumulator = load_state(versions[i]['file_path'])
+        if accumulator is not None:
+            start = i + 1
+            break
+    if accumulator is None:
+        accumulator = DatasetAccumulator(sample_limit=DUPLICATE_SAMPLE_LIMIT)
+
+    for version in versions[start:]:
+        for chunk in read_chunks(version['file_path'], version['filename']):
+            accumulator.update(chunk)
+        save_state(accumulator, version['file_path'])
+    return accumulator
+
+
+def profile_append(versions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    from utils.streaming_analyzer import StreamingDataQualityAnalyzer
+
+    analyzer = StreamingDataQualityAnalyzer(accumulator=accumulate_versions(versions))
+    return {
+        "rows": analyzer.total_rows,
+        "columns": analyzer.total_cols,
+        "health_score": analyzer.calculate_health_score(),
+    }
+
+
+def profile_upload(file_path: str, filename: str) -> Dict[str, Any]:
+    analyzer = build_analyzer(file_path, filename)
+    return {
+        "rows": analyzer.total_rows,
+        "columns": analyzer.total_cols,
+        "health_score": analyzer.calculate_health_score(),
+        "memory": analyzer.memory_usage,
+    }
+
+
+def analyze_file(file_path: str, filename: str, job_id: Optional[str] = None,
+                 outliers: Optional[Dict[str, Any]] = None, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+    progress = job_progress_reporter(job_id) if job_id else None
+    timings = StageTimings()
+    if progress:
+        progress("parse", "running")
+    with timings.stage("parse"):
+        analyzer = build_analyzer(file_path, filename, outliers, columns)
+    if progress:
+        progress("parse", "done")
+    report = analyzer.generate_full_report(progress=progress, timings=timings)
+    report["timings"] = timings.as_dict()
+    return stringify_keys(report)
+
+
+def analyze_versions(versions: List[Dict[str, Any]], job_id: Optional[str] = None,
+                     outliers: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # Appended datasets: only versions without a saved state are read.
+    from utils.streaming_analyzer import StreamingDataQualityAnalyzer
+
+    progress = job_progress_reporter(job_id) if job_id else None
+    timings = StageTimings()
+    if progress:
+        progress("parse", "running")
+    with timings.stage("parse"):
+        analyzer = StreamingDataQualityAnalyzer(accumulator=accumulate_versions(versions), outlier_settings=outliers)
+    if progress:
+        progress("parse", "done")
+    report = analyzer.generate_full_report(progress=progress, timings=timings)
+    report["timings"] = timings.as_dict()
+    return stringify_keys(report)
+
+
+def analyze_sample(versions: List[Dict[str, Any]], size: int, stratify_by: Optional[str] = None,
+                   seed: int = 0, outliers: Optional[Dict[str, Any]] = None,
+                   columns: Optional[List[str]] = None) -> Dict[str, Any]:
+    from utils.data_analyzer import DataQualityAnalyzer
+    from utils.sampling import annotate_sampled_report, reservoir_sample
+
+    timings = StageTimings()
+    columns = resolve_columns(versions[0]['file_path'], versions[0]['filename'], columns)
+    chunks = (chunk for version in versions
+              for chunk in read_chunks(version['file_path'], version['filename'], columns))
+    with timings.stage("parse"):
+        sample, population = reservoir_sample(chunks, size, seed=seed, stratify_by=stratify_by)
+    report = DataQualityAnalyzer(sample, duplicate_sample_limit=DUPLICATE_SAMPLE_LIMIT, outlier_settings=outliers,
+                                 profile_workers=PROFILE_WORKERS, profile_mode=PROFILE_MODE
+                                 ).generate_full_report(timings=timings)
+    report["timings"] = timings.as_dict()
+    method = "stratified" if stratify_by else "reservoir"
+    return stringify_keys(annotate_sampled_report(report, len(sample), population, method, stratify_by))
+
+
+# Every top-level key a report can have: DataQualityAnalyzer.REPORT_SECTIONS,
+# then the loader's memory usage, the sampling annotations and stage timings.
+REPORT_FIELDS = (
+    "summary", "health_score", "missing_values", "duplicates", "data_types",
+    "categorical_consistency", "date_formats", "class_imbalance", "outliers",
+    "memory", "approximate", "sampling", "timings",
+)
+
+# Top-level report sections read by render_pdf; the rest (and the detached
+# numeric summary and duplicate row samples) never need loading for a PDF.
+PDF_SECTIONS = (
+    "health_score", "score_label", "approximate", "sampling", "summary", "missing_values",
+    "duplicates", "class_imbalance", "data_types", "outliers", "date_formats",
+)
+
+
+def render_pdf(report_data: Dict[str, Any], filename: str) -> bytes:
+    from utils.pdf_generator import generate_pdf_report
+    pdf_buffer = io.BytesIO()
+    generate_pdf_report(report_data, filename, pdf_buffer)
+    return pdf_buffer.getvalue()
+
+
+def render_pdf_timed(report_data: Dict[str, Any], filename: str) -> Tuple[bytes, Dict[str, Any]]:
+    # The PDF is rendered after its report was stored, so its timing is only reported to the metrics.
+    timings = StageTimings()
+    with timings.stage("pdf_render"):
+        pdf = render_pdf(report_data, filename)
+    return pdf, timings.as_dict()
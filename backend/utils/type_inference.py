@@ -0,0 +1,97 @@
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+# Values without a digit or a month name cannot be parsed as dates, so they are
+# rejected with one vectorized regex instead of going through the date parser.
+_DATE_HINT = r'\d|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec'
+
+
+def _numeric_successes(values: pd.Series) -> int:
+    return int(pd.to_numeric(values, errors='coerce').notna().sum())
+
+
+def _datetime_successes(values: pd.Series, prefilter: bool = True) -> int:
+    if prefilter:
+        values = values[values.astype(str).str.contains(_DATE_HINT, case=False, regex=True)]
+    if len(values) == 0:
+        return 0
+    return int(pd.to_datetime(values, errors='coerce').notna().sum())
+
+
+def text_parse_counts(values: pd.Series, sample_size: int = 1000) -> Dict[str, Any]:
+    """Count how many non-null text values parse as numbers and as dates.
+
+    A deterministic sample is parsed first. The full column is only parsed
+    when every sampled value parses, since only then can the whole column be
+    of that type; otherwise the sample rate is scaled to the column and
+    `sampled` is set. Counts are additive, so chunks of a column can be summed.
+    """
+    total = len(values)
+    counts = {"values": total, "numeric": 0, "datetime": 0, "sampled": False}
+    if total == 0:
+        return counts
+    sample = values.sample(sample_size, random_state=0) if total > sample_size else values
+    exact = len(sample) == total
+
+    counts["numeric"] = _numeric_successes(sample)
+    if not exact:
+        if counts["numeric"] == len(sample):
+            counts["numeric"] = _numeric_successes(values)
+        else:
+            counts["numeric"] = int(round(counts["numeric"] / len(sample) * total))
+            counts["sampled"] = True
+    # Dates are only considered once the column is known not to be numeric.
+    if counts["numeric"] == total:
+        return counts
+
+    counts["datetime"] = _datetime_successes(sample)
+    if not exact:
+        if counts["datetime"] == len(sample):
+            counts["datetime"] = _datetime_successes(values, prefilter=False)
+        else:
+            counts["datetime"] = int(round(counts["datetime"] / len(sample) * total))
+            counts["sampled"] = True
+    return counts
+
+
+def merge_parse_counts(left: Optional[Dict[str, Any]], right: Dict[str, Any]) -> Dict[str, Any]:
+    if left is None:
+        return dict(right)
+    return {
+        "values": left["values"] + right["values"],
+        "numeric": left["numeric"] + right["numeric"],
+        "datetime": left["datetime"] + right["datetime"],
+        "sampled": left["sampled"] or right["sampled"],
+    }
+
+
+def resolve_text_type(counts: Dict[str, Any], threshold: float = 0.9) -> Dict[str, Any]:
+    """Turn parse counts into the inferred type of a text column.
+
+    `inferred_type` is set only when every value parses; `mostly_type` when
+    at least `threshold` of them do, which usually points at a few stray
+    entries in an otherwise numeric or date column.
+    """
+    total = counts["values"]
+    # Capped below 1 unless every value parses, so rounding cannot hide a stray entry.
+    ratios = {
+        kind: (1.0 if counts[kind] == total else min(round(counts[kind] / total, 4), 0.9999)) if total else 0.0
+        for kind in ("numeric", "datetime")
+    }
+    inferred_type = None
+    mostly_type = None
+    if total and counts["numeric"] == total:
+        inferred_type = "numeric"
+    elif total and counts["datetime"] == total:
+        inferred_type = "datetime"
+    else:
+        best = max(ratios, key=ratios.get)
+        if ratios[best] >= threshold:
+            mostly_type = best
+    return {
+        "inferred_type": inferred_type,
+        "mostly_type": mostly_type,
+        "parse_success": ratios,
+        "parse_ratio_sampled": counts["sampled"],
+    }
@@ -0,0 +1,125 @@
+import hashlib
+import zipfile
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+
+# Room for the multipart boundary and part headers around an uploaded file.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+async def stream_upload_to_disk(upload, dest: Path, chunk_size: int, max_bytes: int = 0) -> Tuple[int, str]:
+    """Copy an UploadFile to `dest` one chunk at a time.
+
+    Returns the size and the SHA-256 hex digest of the content. Only
+    `chunk_size` bytes are held in memory at once. If `max_bytes` is set and
+    the file is larger, the partial copy is removed and UploadTooLargeError
+    is raised. The form parser has already spooled the whole file by then;
+    RequestBodyLimitMiddleware is what stops oversized bodies being read.
+    """
+    size = 0
+    digest = hashlib.sha256()
+    try:
+        with open(dest, 'wb') as out:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise UploadTooLargeError(f"File exceeds the maximum upload size of {max_bytes} bytes")
+                digest.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extract_zip_member(archive_path: Path, member: str, dest: Path, chunk_size: int,
+                       max_bytes: int = 0) -> Tuple[int, str]:
+    """Extract one member of a zip archive to `dest`, like stream_upload_to_disk.
+
+    The size limit is enforced on the bytes actually decompressed. A member
+    never decompresses past the size the archive declares for it, which
+    archive limits are checked against.
+    """
+    size = 0
+    digest = hashlib.sha256()
+    try:
+        with zipfile.ZipFile(archive_path) as archive, archive.open(member) as source, open(dest, 'wb') as out:
+            declared = archive.getinfo(member).file_size
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > declared:
+                    raise UploadTooLargeError(f"{member} is larger than the archive declares")
+                if max_bytes and size > max_bytes:
+                    raise UploadTooLargeError(f"File exceeds the maximum upload size of {max_bytes} bytes")
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
+
+
+class RequestBodyLimitMiddleware:
+    """Reject request bodies larger than `max_bytes` with 413 before they are read.
+
+    Starlette parses multipart forms, spooling every file to disk, before a
+    route runs, so upload limits are enforced here on the raw body: from
+    Content-Length when the client sends it, otherwise on the bytes as they
+    arrive. `path_limits` sets other limits for exact paths; 0 disables a limit.
+    """
+
+    def __init__(self, app, max_bytes: int, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limit = self.path_limits.get(scope["path"], self.max_bytes)
+        if not limit:
+            await self.app(scope, receive, send)
+            return
+        detail = f"Request body exceeds the limit of {limit} bytes"
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > limit:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside the route's body parsing, which passes
+                    # HTTPExceptions on to the exception handlers.
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,44 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class UserCache:
+    """In-process LRU cache of user records keyed by user id.
+
+    Entries expire `ttl_seconds` after they were stored, which bounds how
+    long another process's change to a user can go unnoticed here; changes
+    made by this process put() the updated record. A ttl of 0 disables the
+    cache.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return dict(user)
+
+    def put(self, user: Dict[str, Any]):
+        if not self.enabled:
+            return
+        self._entries[user['id']] = (time.monotonic() + self.ttl_seconds, dict(user))
+        self._entries.move_to_end(user['id'])
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()